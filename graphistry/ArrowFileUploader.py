@@ -1,4 +1,4 @@
-import pyarrow as pa, requests, sys
+import pyarrow as pa, requests, sys, threading
 from functools import lru_cache
 from typing import Any, Tuple, Optional
 from weakref import WeakKeyDictionary
@@ -8,6 +8,8 @@ logger = setup_logger(__name__)
 
 # WrappedTable -> {'file_id': str, 'output': dict}
 DF_TO_FILE_ID_CACHE : WeakKeyDictionary = WeakKeyDictionary()
+# uploads of edges and nodes run concurrently
+DF_TO_FILE_ID_CACHE_LOCK = threading.Lock()
 """
 NOTE: Will switch to pa.Table -> ... when RAPIDS upgrades from pyarrow, 
      which adds weakref support
@@ -73,7 +75,7 @@ class ArrowFileUploader():
             **file_opts
         }
 
-        res = requests.post(
+        res = self.uploader.session.post(
             self.uploader.server_base_path + '/api/v2/files/',
             verify=self.uploader.certificate_validation,
             headers={'Authorization': f'Bearer {tok}'},
@@ -136,11 +138,12 @@ class ArrowFileUploader():
             #FIXME if pa.Table was hashable, could do direct set/get map
             wrapped_table : WrappedTable
             val : MemoizedFileUpload
-            for wrapped_table, val in DF_TO_FILE_ID_CACHE.items():
-                if wrapped_table.arr is arr:
-                    logger.debug('arrow->file_id memoization hit: %s', val.file_id)
-                    return val.file_id, val.output
-            logger.debug('arrow->file_id memoization miss (of %s)', len(DF_TO_FILE_ID_CACHE))
+            with DF_TO_FILE_ID_CACHE_LOCK:
+                for wrapped_table, val in DF_TO_FILE_ID_CACHE.items():
+                    if wrapped_table.arr is arr:
+                        logger.debug('arrow->file_id memoization hit: %s', val.file_id)
+                        return val.file_id, val.output
+                logger.debug('arrow->file_id memoization miss (of %s)', len(DF_TO_FILE_ID_CACHE))
 
         if file_id is None:
             file_id = self.create_file(file_opts)
@@ -150,8 +153,9 @@ class ArrowFileUploader():
 
         if memoize:
             wrapped = WrappedTable(arr)
-            cache_arr(wrapped)
-            DF_TO_FILE_ID_CACHE[wrapped] = out
+            with DF_TO_FILE_ID_CACHE_LOCK:
+                cache_arr(wrapped)
+                DF_TO_FILE_ID_CACHE[wrapped] = out
             logger.debug('Memoized arrow->file_id %s', file_id)
         
         return out.file_id, out.output
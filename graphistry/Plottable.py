@@ -209,7 +209,20 @@ class Plottable(object):
         edge_match: Optional[dict] = None,
         source_node_match: Optional[dict] = None,
         destination_node_match: Optional[dict] = None,
-        return_as_wave_front: bool = False
+        return_as_wave_front: bool = False,
+        engine: str = 'auto'
+    ) -> 'Plottable':
+        if 1 + 1:
+            raise RuntimeError('should not happen')
+        return self
+
+    def bfs(self,
+        nodes: Optional[pd.DataFrame] = None,
+        hops: Optional[int] = None,
+        direction: str = 'forward',
+        edge_match: Optional[dict] = None,
+        distance_col: str = 'hop_distance',
+        seed_col: str = 'hop_seed'
     ) -> 'Plottable':
         if 1 + 1:
             raise RuntimeError('should not happen')
@@ -20,8 +20,8 @@ from .plugins.cugraph import (
     layout_cugraph as layout_cugraph_base
 )
 from .util import (
-    error, hash_pdf, in_ipython, in_databricks, make_iframe, random_string, warn,
-    cache_coercion, cache_coercion_helper, WeakValueWrapper
+    error, in_ipython, in_databricks, make_iframe, random_string, warn,
+    cache_coercion, cache_coercion_helper, WeakValueWrapper, TableFingerprint, TieredTableCache
 )
 
 from .bolt_util import (
@@ -100,6 +100,7 @@ class PlotterBase(Plottable):
     To streamline reuse and replayable notebooks, Plotter manipulations are immutable. Each chained call returns a new instance that derives from the previous one. The old plotter or the new one can then be used to create different graphs.
 
     When using memoization, for .register(api=3) sessions with .plot(memoize=True), Pandas/cudf arrow coercions are memoized, and file uploads are skipped on same-hash dataframes.
+    Pandas checks are tiered: a sampled fingerprint first, so changed dataframes usually miss cheaply, then a full hash to confirm every hit, or a version tag set via df.attrs['graphistry_memoize_version'] instead of the full hash.
 
     The class supports convenience methods for mixing calls across Pandas, NetworkX, and IGraph.
     """
@@ -108,7 +109,7 @@ class PlotterBase(Plottable):
     _defaultEdgeSourceId = SRC
     _defaultEdgeDestinationId = DST
     
-    _pd_hash_to_arrow : WeakValueDictionary = WeakValueDictionary()
+    _pd_hash_to_arrow : TieredTableCache = TieredTableCache()
     _cudf_hash_to_arrow : WeakValueDictionary = WeakValueDictionary()
     _umap_param_to_g : WeakValueDictionary = WeakValueDictionary()
     _feat_param_to_g : WeakValueDictionary = WeakValueDictionary()
@@ -1824,33 +1825,31 @@ class PlotterBase(Plottable):
             return table
         
         if isinstance(table, pd.DataFrame):
-            hashed = None
+            key = None
             if memoize:
-                
+
                 try:
-                    hashed = hash_pdf(table)
+                    key = TableFingerprint(table)
+                    hit = PlotterBase._pd_hash_to_arrow.get(key)
+                    if hit is not None:
+                        logger.debug('pd->arrow memoization hit: %s', key.cheap)
+                        return hit
+                    else:
+                        logger.debug('pd->arrow memoization miss for id (of %s): %s', len(PlotterBase._pd_hash_to_arrow), key.cheap)
                 except TypeError:
+                    key = None
                     logger.warning('Failed memoization speedup attempt due to Pandas internal hash function failing. Continuing without memoization speedups.'
                                 'This is fine, but for speedups around skipping re-uploads of previously seen tables, '
                                 'try identifying which columns have types that Pandas cannot hash, and convert them '
                                 'to hashable types like strings.')
 
-                try:
-                    if hashed in PlotterBase._pd_hash_to_arrow:
-                        logger.debug('pd->arrow memoization hit: %s', hashed)
-                        return PlotterBase._pd_hash_to_arrow[hashed].v
-                    else:
-                        logger.debug('pd->arrow memoization miss for id (of %s): %s', len(PlotterBase._pd_hash_to_arrow), hashed)
-                except:
-                    logger.debug('Failed to hash pdf', exc_info=True)
-                    1
-
             out = pa.Table.from_pandas(table, preserve_index=False).replace_schema_metadata({})
 
-            if memoize and (hashed is not None):
-                w = WeakValueWrapper(out)
-                cache_coercion(hashed, w)
-                PlotterBase._pd_hash_to_arrow[hashed] = w
+            if memoize and (key is not None):
+                try:
+                    PlotterBase._pd_hash_to_arrow.set(key, out, out.nbytes)
+                except TypeError:
+                    logger.debug('Failed to hash pdf', exc_info=True)
 
             return out
 
@@ -1980,7 +1979,9 @@ class PlotterBase(Plottable):
                 'agentversion': sys.modules['graphistry'].__version__,  # type: ignore
                 **(metadata or {})
             },
-            certificate_validation=PyGraphistry.certificate_validation())
+            certificate_validation=PyGraphistry.certificate_validation(),
+            upload_batch_size=PyGraphistry.upload_batch_size(),
+            compression=PyGraphistry.upload_compression())
 
         au.edge_encodings = au.g_to_edge_encodings(self)
         au.node_encodings = au.g_to_node_encodings(self)
@@ -2227,7 +2228,8 @@ class PlotterBase(Plottable):
         self,
         raw_events, entity_types: Optional[List[str]] = None, opts: dict = {},
         drop_na: bool = True, drop_edge_attrs: bool = False, verbose: bool = True, direct: bool = False,
-        engine: str = 'pandas', npartitions: Optional[int] = None, chunksize: Optional[int] = None
+        engine: str = 'pandas', npartitions: Optional[int] = None, chunksize: Optional[int] = None,
+        n_jobs: int = -1
 
     ):
         """Transform a dataframe into a hypergraph.
@@ -2242,6 +2244,7 @@ class PlotterBase(Plottable):
         :param bool engine: String (pandas, cudf, ...) for engine to use
         :param Optional[int] npartitions: For distributed engines, how many coarse-grained pieces to split events into
         :param Optional[int] chunksize: For distributed engines, split events after chunksize rows
+        :param int n_jobs: For the pandas engine, threads processing entity columns concurrently, -1 (default) for all cores
 
         Create a graph out of the dataframe, and return the graph components as dataframes, 
         and the renderable result Plotter. Hypergraphs reveal relationships between rows and between column values.
@@ -2341,7 +2344,7 @@ class PlotterBase(Plottable):
         from . import hyper
         return hyper.Hypergraph().hypergraph(
             self, raw_events, entity_types, opts, drop_na, drop_edge_attrs, verbose, direct,
-            engine=engine, npartitions=npartitions, chunksize=chunksize)
+            engine=engine, npartitions=npartitions, chunksize=chunksize, n_jobs=n_jobs)
 
 
     def layout_settings(
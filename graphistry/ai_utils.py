@@ -3,7 +3,8 @@ import numpy as np
 
 import graphistry
 
-from .constants import DISTANCE, WEIGHT, BATCH
+from .compute.adjacency import get_adjacency
+from .constants import DISTANCE, WEIGHT, BATCH, QUERY, SEARCH_INDEX_TYPES
 from logging import getLogger
 
 try:
@@ -146,27 +147,111 @@ def get_graphistry_from_milieu_search(
 ##########################################################################################################################
 
 
-class FaissVectorSearch:
+def blocked_sq_distances(A, B, block_size=2 ** 22, B_sq=None):
+    """
+    Yield (first row, squared Euclidean distances) for blocks of A rows against all B rows
+
+    Each block holds about block_size distances, so callers can reduce over len(A) x len(B) in bounded memory
+    """
+    if B_sq is None:
+        B_sq = np.einsum("ij,ij->i", B, B)
+    rows_per_block = max(1, block_size // max(B.shape[0], 1))
+    for start in range(0, A.shape[0], rows_per_block):
+        block = A[start:start + rows_per_block]
+        dist = np.einsum("ij,ij->i", block, block)[:, None] + B_sq[None, :] - 2 * block @ B.T
+        np.maximum(dist, 0, out=dist)
+        yield start, dist
+
+
+class NumpyVectorSearch:
+    """
+    Exact squared-L2 search in NumPy with the faiss index interface, used when faiss is not installed
+    """
     def __init__(self, M):
-        import faiss
-        self.index = faiss.IndexFlatL2(M.shape[1])
-        self.index.add(M.astype('float32'))
+        self.M = M
+        self.M_sq = np.einsum("ij,ij->i", M, M)
+
+    @property
+    def ntotal(self):
+        return self.M.shape[0]
+
+    def search(self, Q, k):
+        k = min(k, self.ntotal)
+        D = np.zeros((Q.shape[0], k), dtype=np.float32)
+        I = np.zeros((Q.shape[0], k), dtype=np.int64)  # noqa: E741
+        for start, dist in blocked_sq_distances(Q, self.M, B_sq=self.M_sq):
+            idx = np.argpartition(dist, k - 1, axis=1)[:, :k] if k < self.ntotal else np.argsort(dist, axis=1)
+            d = np.take_along_axis(dist, idx, axis=1)
+            order = np.argsort(d, axis=1, kind="stable")
+            D[start:start + len(dist)] = np.take_along_axis(d, order, axis=1)
+            I[start:start + len(dist)] = np.take_along_axis(idx, order, axis=1)
+        return D, I
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            np.save(f, np.ascontiguousarray(self.M))
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        return cls(np.load(path, mmap_mode="r" if mmap else None))
+
+
+class FaissVectorSearch:
+    """
+    Vector search index over rows of M, searched one query vector or a batch at a time
+
+    Distances are squared Euclidean. index_type picks the faiss index:
+
+    - 'flat': exact brute force (default)
+    - 'ivf': inverted file over nlist k-means cells, probing nprobe cells per query; more nprobe raises recall
+    - 'hnsw': HNSW graph with hnsw_m links per node, exploring ef_search candidates per query; more ef_search raises recall
+
+    When faiss is not installed, all index types fall back to exact NumPy search
+    """
+    def __init__(self, M=None, index_type='flat', nlist=None, nprobe=8, hnsw_m=32, ef_search=64, index=None):
+        if index is not None:
+            self.index = index
+            return
+        if index_type not in SEARCH_INDEX_TYPES:
+            raise ValueError(f'Unknown index_type "{index_type}", expected one of {SEARCH_INDEX_TYPES}')
+        M = np.ascontiguousarray(M, dtype=np.float32)
+        if faiss is None:
+            if index_type != 'flat':
+                logger.warning(f'faiss not installed, using exact NumPy search instead of "{index_type}"')
+            self.index = NumpyVectorSearch(M)
+            return
+        d = M.shape[1]
+        if index_type == 'ivf':
+            nlist = nlist or int(np.clip(4 * np.sqrt(M.shape[0]), 1, M.shape[0]))
+            quantizer = faiss.IndexFlatL2(d)
+            self.index = faiss.IndexIVFFlat(quantizer, d, nlist)
+            self.index.train(M)
+            self.index.nprobe = nprobe
+            self._quantizer = quantizer  # faiss does not own it
+        elif index_type == 'hnsw':
+            self.index = faiss.IndexHNSWFlat(d, hnsw_m)
+            self.index.hnsw.efSearch = ef_search
+        else:
+            self.index = faiss.IndexFlatL2(d)
+        self.index.add(M)
 
     def search(self, q, k=5):
         """
-        Search for the k nearest neighbors of a query vector q.
+        Search for the k nearest neighbors of a query vector q, or of each row of a query matrix q.
 
         Parameters:
-        - q: the query vector to search for
+        - q: the query vector, or a 2D array of query vectors, to search for
         - k: the number of nearest neighbors to return (default: 5)
 
         Returns:
-        - Index: a numpy array of size (k,) containing the indices of the k nearest neighbors
-        - Distances: a numpy array of size (k,) containing the distances to the k nearest neighbors
+        - Index: a numpy array of size (k,), or (len(q), k), containing the indices of the k nearest neighbors
+        - Distances: a numpy array of size (k,), or (len(q), k), containing the distances to the k nearest neighbors
         """
         q = np.asarray(q, dtype=np.float32)
-        Distances, Index = self.index.search(q.reshape(1, -1), k)
-        return Index[0], Distances[0]
+        Distances, Index = self.index.search(np.atleast_2d(q), k)
+        if q.ndim == 1:
+            return Index[0], Distances[0]
+        return Index, Distances
     
     def search_df(self, q, df, k):
         """ Query by vector using index and append distance to results
@@ -189,6 +274,42 @@ class FaissVectorSearch:
 
         return results
 
+    def search_batch_df(self, Q, df, k):
+        """ Query by a batch of vectors in one index call and append query position and distance to results
+
+        args:
+            Q: dataframe or 2D array of query vectors
+            df: dataframe to query, row-aligned with the index
+            k: number of results per query
+        returns:
+            dataframe of up to k results per query, ordered by query then distance
+        """
+        indices, distances = self.search(np.asarray(Q), k=k)
+        found = indices >= 0  # faiss pads with -1 when fewer than k results are found
+        results = df.iloc[indices[found]].assign(**{
+            QUERY: np.broadcast_to(np.arange(len(indices))[:, None], indices.shape)[found],
+            DISTANCE: distances[found]
+        })
+        return results
+
+    def save(self, path):
+        """ Write the index to path, for FaissVectorSearch.load() """
+        if isinstance(self.index, NumpyVectorSearch):
+            self.index.save(path)
+        else:
+            faiss.write_index(self.index, path)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """ Read an index written by save(), memory-mapping it from disk instead of reading it in when mmap=True """
+        with open(path, "rb") as f:
+            is_numpy = f.read(6) == b"\x93NUMPY"
+        if is_numpy:
+            return cls(index=NumpyVectorSearch.load(path, mmap=mmap))
+        if faiss is None:
+            raise ImportError(f"faiss is required to load the faiss index at {path}")
+        return cls(index=faiss.read_index(path, faiss.IO_FLAG_MMAP if mmap else 0))
+
 
 # #########################################################################################################################
 #
@@ -220,6 +341,95 @@ def hydrate_graph(res, new_nodes, new_edges, node, src, dst, new_emb, new_featur
     return g
     
 
+def nearest_neighbors_within_eps(X_fit, X_new, n_neighbors, eps="auto", exclude_self=False, block_size=2 ** 22):
+    """
+    Batched exact k-nearest neighbors of each X_new row among X_fit rows, by Euclidean distance
+
+    Distances are computed in blocks of X_new rows, with about block_size distances per block, so
+    memory stays O(block_size + len(X_new) * n_neighbors) instead of O(len(X_new) * len(X_fit))
+
+    args:
+        X_fit: previously fit rows, dataframe or array
+        X_new: query rows, dataframe or array
+        n_neighbors: max neighbors per query row
+        eps: 'auto' for min(|mean - std|, mean) of all query-to-fit distances, else max distance to be a neighbor
+        exclude_self: skip X_fit row i for query row i, when X_new is X_fit
+    returns:
+        (query rows, fit rows, distances) arrays of neighbor pairs within eps, nearest first per query row,
+        eps, and mean and std of all query-to-fit distances
+    """
+    if 'cudf.core.dataframe' in str(type(X_fit)):
+        X_fit = X_fit.to_pandas()
+    if 'cudf.core.dataframe' in str(type(X_new)):
+        X_new = X_new.to_pandas()
+    A = np.asarray(X_new, dtype=np.float64)
+    B = np.asarray(X_fit, dtype=np.float64)
+    n_new, n_fit = A.shape[0], B.shape[0]
+    k = min(n_neighbors, n_fit - 1 if exclude_self else n_fit)
+
+    total, total_sq = 0.0, 0.0
+    knn_idx = np.zeros((n_new, max(k, 0)), dtype=np.int64)
+    knn_dist = np.zeros((n_new, max(k, 0)), dtype=np.float64)
+    for start, dist in blocked_sq_distances(A, B, block_size):
+        total_sq += dist.sum()
+        np.sqrt(dist, out=dist)
+        total += dist.sum()
+        if k <= 0:
+            continue
+        if exclude_self:
+            diag = np.arange(start, start + len(dist))
+            dist[diag - start, diag] = np.inf
+        if k < n_fit:
+            idx = np.argpartition(dist, k - 1, axis=1)[:, :k]
+        else:
+            idx = np.broadcast_to(np.arange(n_fit), dist.shape).copy()
+        d = np.take_along_axis(dist, idx, axis=1)
+        order = np.argsort(d, axis=1, kind="stable")
+        knn_idx[start:start + len(dist)] = np.take_along_axis(idx, order, axis=1)
+        knn_dist[start:start + len(dist)] = np.take_along_axis(d, order, axis=1)
+
+    count = max(n_new * n_fit, 1)
+    m = total / count
+    std = np.sqrt(max(total_sq / count - m * m, 0))
+    if eps == "auto":
+        eps = np.min([np.abs(m - std), m])
+
+    hits = knn_dist < eps
+    rows = np.repeat(np.arange(n_new), hits.sum(axis=1))
+    return rows, knn_idx[hits], knn_dist[hits], eps, m, std
+
+
+def edges_of_nodes(edges, src, dst, node_ids, sample):
+    """
+    Sample, with replacement, `sample` edges touching each of node_ids, via a node -> incident edge index
+
+    Node ids without edges contribute nothing. Self-loops are counted once per node.
+    """
+    if 'cudf.core.dataframe' in str(type(edges)):
+        edges = edges.to_pandas()
+    if len(edges) == 0 or len(node_ids) == 0:
+        return edges[:0]
+    adj = get_adjacency(edges, src, dst)
+
+    # incidence CSR: edge positions grouped by either endpoint
+    edge_pos = np.arange(adj.num_edges)
+    other = (adj.dst_codes != adj.src_codes) & (adj.dst_codes >= 0)
+    keys = np.concatenate([adj.src_codes, adj.dst_codes[other]])
+    vals = np.concatenate([edge_pos, edge_pos[other]])
+    valid = keys >= 0
+    keys, vals = keys[valid], vals[valid]
+    order = vals[np.argsort(keys, kind="stable")]
+    offsets = np.zeros(adj.num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=adj.num_nodes), out=offsets[1:])
+
+    codes = adj.encode(node_ids)
+    codes = codes[codes >= 0]
+    picks = np.repeat(codes, sample)
+    counts = offsets[picks + 1] - offsets[picks]
+    r = (np.random.random(len(picks)) * counts).astype(np.int64)
+    return edges.iloc[order[offsets[picks] + r]]
+
+
 def infer_graph(
     res, emb, X, y, df, infer_on_umap_embedding=False, eps="auto", sample=None, n_neighbors=7, verbose=False, 
 ):
@@ -281,66 +491,38 @@ def infer_graph(
     if node not in df.columns:
         df[node] = numeric_indices
 
-    NDF = res._nodes
-    NDF[BATCH] = 0
-    EDF = res._edges
-    EDF[BATCH] = 0
+    NDF = res._nodes.assign(**{BATCH: 0})
+    EDF = res._edges.assign(**{BATCH: 0})
     src = res._source
     dst = res._destination
 
-    #new_nodes = []
-    new_edges = []
-    old_edges = []
-    old_nodes = []
-    mdists = []
-
-    # check if pandas or cudf
-    if 'cudf.core.dataframe' in str(type(X_previously_fit)):
-        #  move it out of memory...
-        X_previously_fit = X_previously_fit.to_pandas()
-
-    for i in range(X_new.shape[0]):
-        diff = X_previously_fit - X_new.iloc[i, :]
-        dist = np.linalg.norm(diff, axis=1)  # Euclidean distance
-        mdists.append(dist)
-
-    m, std = np.mean(mdists), np.std(mdists)
+    rows, cols, dists, eps, m, std = nearest_neighbors_within_eps(
+        X_previously_fit, X_new, n_neighbors, eps
+    )
     logger.info(f"--Mean distance to existing nodes  {m:.2f} +/- {std:.2f}")
     print(f' Mean distance to existing nodes {m:.2f} +/- {std:.2f}') if verbose else None
-    if eps == "auto":
-        eps = np.min([np.abs(m - std), m])
     logger.info(
         f"-epsilon = {eps:.2f} max distance threshold to be considered a neighbor"
     )
     print(f' Max distance threshold; epsilon = {eps:.2f}') if verbose else None
-    
-    print(f' Finding {n_neighbors} nearest neighbors') if verbose else None
-    nn = []
-    for i, dist in enumerate(mdists):
-        record_df = df.iloc[i, :]
-        nearest = np.where(dist < eps)[0]
-        nn.append(len(nearest))
-        for j in nearest[:n_neighbors]:  # add n_neighbors nearest neighbors, if any, super speedup hack
-            this_ndf = NDF.iloc[j, :]
-            if sample:
-                local_edges = EDF[
-                    (EDF[src] == this_ndf[node]) | (EDF[dst] == this_ndf[node])
-                ]
-                if not local_edges.empty:
-                    old_edges.append(local_edges.sample(sample, replace=True))
-                    
-            weight = min(1 / (dist[j] + 1e-3), 1)
-            new_edges.append([this_ndf[node], record_df[node], weight, 1])
-            old_nodes.append(this_ndf)
-            #new_nodes.extend([record_df, this_ndf])
-            
-    print(f' {np.mean(nn):.2f} neighbors per node within epsilon {eps:.2f}') if verbose else None
-    
-    new_edges = pd.DataFrame(new_edges, columns=[src, dst, WEIGHT, BATCH])
+    print(f' Found up to {n_neighbors} nearest neighbors') if verbose else None
+    print(f' {len(rows) / max(X_new.shape[0], 1):.2f} neighbors per node within epsilon {eps:.2f}') if verbose else None
+
+    neighbor_ids = NDF[node].to_numpy()[cols]
+    new_edges = pd.DataFrame({
+        src: neighbor_ids,
+        dst: df[node].to_numpy()[rows],
+        WEIGHT: np.minimum(1 / (dists + 1e-3), 1),
+        BATCH: 1
+    })
+    old_nodes = NDF.iloc[pd.unique(cols)]
+
+    old_edges = []
+    if sample:
+        old_edges = edges_of_nodes(EDF, src, dst, neighbor_ids, sample).assign(_batch=0)
 
     all_nodes = []
     if len(old_edges):
-        old_edges = pd.concat(old_edges, axis=0).assign(_batch=0)
         all_nodes = pd.concat([old_edges[src], old_edges[dst], new_edges[src], new_edges[dst]]).drop_duplicates()
         print('', len(all_nodes), "nodes in new graph") if verbose else None
 
@@ -350,13 +532,9 @@ def infer_graph(
     new_edges = new_edges.drop_duplicates()
     print('', len(new_edges), 'total edges after dropping duplicates') if verbose else None
 
-    if len(old_nodes):
-        old_nodes = pd.DataFrame(old_nodes)
-        old_nodes = pd.concat(
-            [old_nodes, NDF[NDF[node].isin(all_nodes)]], axis=0
-        ).drop_duplicates(subset=[node])
-    else:
-        old_nodes = NDF[NDF[node].isin(all_nodes)]
+    old_nodes = pd.concat(
+        [old_nodes, NDF[NDF[node].isin(all_nodes)]], axis=0
+    ).drop_duplicates(subset=[node])
 
     old_emb = None
     if EMB is not None:
@@ -441,41 +619,25 @@ def infer_self_graph(res,
     src = res._source
     dst = res._destination
     
-    old_nodes = []
-    new_edges = []
-    mdists = []
-
-    for i in range(X_new.shape[0]):
-        diff = X_previously_fit - X_new.iloc[i, :]
-        dist = np.linalg.norm(diff, axis=1)  # Euclidean distance
-        mdists.append(dist)
-
-    m, std = np.mean(mdists), np.std(mdists)
+    rows, cols, dists, eps, m, std = nearest_neighbors_within_eps(
+        X_previously_fit, X_new, n_neighbors, eps, exclude_self=True
+    )
     logger.info(f"--Mean distance to existing nodes  {m:.2f} +/- {std:.2f}")
     print(f' Mean distance to existing nodes {m:.2f} +/- {std:.2f}') if verbose else None
-    if eps == "auto":
-        eps = np.min([np.abs(m - std), m])
     logger.info(
         f" epsilon = {eps:.2f} max distance threshold to be considered a neighbor"
     )
     print(f' Max distance threshold; epsilon = {eps:.2f}') if verbose else None
-    
-    print(f' Finding {n_neighbors} nearest neighbors') if verbose else None
-    nn = []
-    for i, dist in enumerate(mdists):
-        record_df = df.iloc[i, :]
-        nearest = np.where(dist < eps)[0]
-        nn.append(len(nearest))
-        for j in nearest[:n_neighbors]:  # add n_neighbors nearest neighbors, if any, super speedup hack
-            if i != j:
-                this_ndf = df.iloc[j, :]
-                weight = min(1 / (dist[j] + 1e-3), 1)
-                new_edges.append([this_ndf[node], record_df[node], weight, 1])
-                old_nodes.append(this_ndf)
-            
-    print(f' {np.mean(nn):.2f} neighbors per node within epsilon {eps:.2f}') if verbose else None
-    
-    new_edges = pd.DataFrame(new_edges, columns=[src, dst, WEIGHT, BATCH])
+    print(f' Found up to {n_neighbors} nearest neighbors') if verbose else None
+    print(f' {len(rows) / max(X_new.shape[0], 1):.2f} neighbors per node within epsilon {eps:.2f}') if verbose else None
+
+    node_ids = df[node].to_numpy()
+    new_edges = pd.DataFrame({
+        src: node_ids[cols],
+        dst: node_ids[rows],
+        WEIGHT: np.minimum(1 / (dists + 1e-3), 1),
+        BATCH: 1
+    })
     new_edges = new_edges.drop_duplicates()
     print('', len(new_edges), 'total edges after dropping duplicates') if verbose else None
     print(" ** Final graph has", len(df), "nodes") if verbose else None
@@ -1,14 +1,143 @@
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 
-import io, pyarrow as pa, requests, sys
+import io, pyarrow as pa, requests, sys, threading
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from graphistry.privacy import Mode, Privacy
 
 from .ArrowFileUploader import ArrowFileUploader
+from .constants import (
+    UPLOAD_BATCH_BYTES, UPLOAD_POOL_SIZE, UPLOAD_RETRIES, UPLOAD_BACKOFF,
+    UPLOAD_COMPRESSION_SAMPLE_ROWS, UPLOAD_COMPRESSION_MIN_SAVINGS
+)
 from .util import setup_logger
 logger = setup_logger(__name__)
 
+
+_sessions: Dict[Tuple[int, int, float], requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def pooled_session(
+    pool_size: int = UPLOAD_POOL_SIZE, retries: int = UPLOAD_RETRIES, backoff: float = UPLOAD_BACKOFF
+) -> requests.Session:
+    """
+    Process-wide keep-alive session for uploads, shared by uploaders with the same settings
+
+    Failed connection attempts are retried with exponential backoff. Requests that reached the
+    server are not retried, as uploads are not idempotent
+
+    :param pool_size: max kept-alive connections per host
+    :param retries: max connection retries
+    :param backoff: backoff factor in seconds between retries
+    """
+    key = (pool_size, retries, backoff)
+    with _sessions_lock:
+        if key not in _sessions:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=pool_size,
+                pool_maxsize=pool_size,
+                max_retries=Retry(total=retries, connect=retries, read=0, status=0, backoff_factor=backoff)
+            )
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _sessions[key] = session
+        return _sessions[key]
+
+
+UPLOAD_COMPRESSIONS = ['none', 'lz4', 'zstd', 'auto']
+
+
+def choose_compression(table: pa.Table, sample_rows: int = UPLOAD_COMPRESSION_SAMPLE_ROWS) -> Optional[str]:
+    """
+    Pick an IPC buffer codec by compressing each column's buffers over evenly spaced sample rows
+
+    Returns None unless a codec saves UPLOAD_COMPRESSION_MIN_SAVINGS of the bytes, and prefers the faster lz4
+    unless zstd is at least 10% smaller
+    """
+    if table.num_rows == 0:
+        return None
+    step = max(1, table.num_rows // sample_rows)
+    sample = table.take(pa.array(range(0, table.num_rows, step)[:sample_rows]))
+
+    codecs = {name: pa.Codec(name) for name in ['lz4', 'zstd'] if pa.Codec.is_available(name)}
+    raw = 0
+    compressed = {name: 0 for name in codecs}
+    for column in sample.columns:
+        for chunk in column.chunks:
+            for buf in chunk.buffers():
+                if buf is None or buf.size == 0:
+                    continue
+                raw += buf.size
+                for name, codec in codecs.items():
+                    compressed[name] += codec.compress(buf, asbytes=False).size
+    if raw == 0 or len(compressed) == 0:
+        return None
+
+    best = min(compressed, key=lambda name: compressed[name])
+    if compressed[best] > (1 - UPLOAD_COMPRESSION_MIN_SAVINGS) * raw:
+        return None
+    if 'lz4' in compressed and compressed['lz4'] <= 1.1 * compressed[best]:
+        return 'lz4'
+    return best
+
+
+def _rejected(resp: requests.Response) -> bool:
+    """
+    Whether the server rejected an upload for its compression codec, as opposed to failing for any other reason
+    """
+    if resp.status_code == requests.codes.unsupported_media_type:
+        return True
+    text = resp.text.lower()
+    mentions_codec = any(word in text for word in ['compress', 'codec', 'lz4', 'zstd'])
+    if resp.status_code in [requests.codes.bad_request, requests.codes.unprocessable_entity]:
+        return mentions_codec
+    if resp.status_code == requests.codes.ok and mentions_codec:
+        try:
+            out = resp.json()
+        except ValueError:
+            return False
+        return isinstance(out, dict) and (out.get('is_valid') is False or out.get('success') is False)
+    return False
+
+
+class _ChunkSink:
+    """
+    Write-only file that hands back whatever was written since the last drain()
+    """
+
+    def __init__(self) -> None:
+        self.chunks: List[bytes] = []
+        self.pos = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.pos
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        out = b''.join(self.chunks)
+        self.chunks = []
+        return out
+
+
 class ArrowUploader:
+
+    # servers that rejected a compressed upload; later uploads to them are sent uncompressed
+    _compression_rejected: set = set()
     
     @property
     def token(self) -> str:
@@ -161,7 +290,10 @@ class ArrowUploader:
             token = None, dataset_id = None,
             metadata = None,
             certificate_validation = True, 
-            org_name: Optional[str] = None):
+            org_name: Optional[str] = None,
+            upload_batch_size: Optional[int] = None,
+            session: Optional[requests.Session] = None,
+            compression: Optional[str] = None):
 
         self.__name = name
         self.__description = description
@@ -176,6 +308,9 @@ class ArrowUploader:
         self.__metadata = metadata
         self.__certificate_validation = certificate_validation
         self.__org_name = org_name if org_name else None
+        self.upload_batch_size = upload_batch_size
+        self.session = session if session is not None else pooled_session()
+        self.compression = compression
 
         if org_name:
             self.__org_name = org_name
@@ -383,7 +518,7 @@ class ArrowUploader:
         if self.org_name: 
             json['org_name'] = self.org_name
         logger.debug("@ArrowUploder create_dataset json: {}".format(json))
-        res = requests.post(
+        res = self.session.post(
             self.server_base_path + '/api/v2/upload/datasets/',
             verify=self.certificate_validation,
             headers={'Authorization': f'Bearer {tok}'},
@@ -410,6 +545,56 @@ class ArrowUploader:
         writer.close()
         return b.getvalue()
 
+    def arrow_to_chunks(
+        self, table: pa.Table, batch_size: Optional[int] = None, compression: Optional[str] = None
+    ) -> Iterator[bytes]:
+        """
+        Lazily serialize table in the same Arrow IPC file format as arrow_to_buffer(), one record batch at a time
+
+        Peak extra memory is about one serialized batch
+
+        :param table: arrow table
+        :param batch_size: max rows per record batch, defaults to self.upload_batch_size, else about UPLOAD_BATCH_BYTES per batch
+        :param compression: IPC buffer codec, 'lz4' or 'zstd', default None for uncompressed
+        """
+        if batch_size is None:
+            batch_size = self.upload_batch_size
+        if batch_size is None:
+            row_bytes = table.nbytes / table.num_rows if table.num_rows > 0 else 1
+            batch_size = max(1, int(UPLOAD_BATCH_BYTES / max(row_bytes, 1)))
+
+        sink = _ChunkSink()
+        writer = pa.RecordBatchFileWriter(
+            pa.PythonFile(sink, mode='w'), table.schema,
+            options=pa.ipc.IpcWriteOptions(compression=compression)
+        )
+        for batch in table.to_batches(max_chunksize=batch_size):
+            writer.write_batch(batch)
+            yield sink.drain()
+        writer.close()
+        yield sink.drain()
+
+    def resolve_compression(self, table: pa.Table, compression: Optional[str] = None) -> Optional[str]:
+        """
+        Codec for uploading table: compression, else self.compression, where 'auto' measures the table
+
+        :returns: 'lz4', 'zstd', or None for uncompressed
+        """
+        if compression is None:
+            compression = self.compression
+        if compression is None or compression == 'none':
+            return None
+        if compression not in UPLOAD_COMPRESSIONS:
+            raise ValueError(f'Unknown upload compression "{compression}", expected one of: {UPLOAD_COMPRESSIONS}')
+        if self.server_base_path in ArrowUploader._compression_rejected:
+            return None
+        if compression == 'auto':
+            return choose_compression(table)
+        if not pa.Codec.is_available(compression):
+            logger.warning('pyarrow codec %s unavailable, uploading uncompressed', compression)
+            return None
+        return compression
+
 
     def maybe_bindings(self, g, bindings, base = {}):
         out = { **base }
@@ -498,10 +683,14 @@ class ArrowUploader:
             if self.org_name:
                 file_opts['org_name'] = self.org_name
 
-            e_file_id, _ = file_uploader.create_and_post_file(self.edges, file_opts=file_opts)
-
-            if not (self.nodes is None):
-                n_file_id, _ = file_uploader.create_and_post_file(self.nodes, file_opts=file_opts)
+            # serialize and upload edges and nodes concurrently
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                e_future = pool.submit(file_uploader.create_and_post_file, self.edges, file_opts=file_opts)
+                if not (self.nodes is None):
+                    n_future = pool.submit(file_uploader.create_and_post_file, self.nodes, file_opts=file_opts)
+                e_file_id, _ = e_future.result()
+                if not (self.nodes is None):
+                    n_file_id, _ = n_future.result()
 
             self.create_dataset({
                 "node_encodings": self.node_encodings,
@@ -523,10 +712,12 @@ class ArrowUploader:
                 "description": self.description
             })
             
-            self.post_edges_arrow()
-            
-            if not (self.nodes is None):
-                self.post_nodes_arrow()
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                futures = [pool.submit(self.post_edges_arrow)]
+                if not (self.nodes is None):
+                    futures.append(pool.submit(self.post_nodes_arrow))
+                for future in futures:
+                    future.result()
         
         return self
 
@@ -594,7 +785,7 @@ class ArrowUploader:
 
         path = self.server_base_path + '/api/v2/share/link/'
         tok = self.token
-        res = requests.post(
+        res = self.session.post(
             path,
             verify=self.certificate_validation,
             headers={'Authorization': f'Bearer {tok}'},
@@ -664,20 +855,37 @@ class ArrowUploader:
             logger.error('Failed to post arrow to %s', sub_path, exc_info=True)
             raise e
 
-    def post_arrow_generic(self, sub_path: str, tok: str, arr: pa.Table, opts='') -> requests.Response:
-        buf = self.arrow_to_buffer(arr)
+    def post_arrow_generic(
+        self, sub_path: str, tok: str, arr: pa.Table, opts='', batch_size: Optional[int] = None, compression: Optional[str] = None
+    ) -> requests.Response:
+        """
+        Stream arr as a chunked request body, serializing record batches as they are sent
+
+        See arrow_to_chunks() for batch_size and resolve_compression() for compression. When the server
+        rejects a compressed upload's codec (415, or a 400/422/unsuccessful reply naming compression), retries
+        uncompressed and stops compressing for that server. Other errors are raised without retrying
+        """
+        codec = self.resolve_compression(arr, compression)
 
         base_path = self.server_base_path
 
         url = f'{base_path}/{sub_path}'
         if len(opts) > 0:
             url = f'{url}?{opts}'
-        resp = requests.post(
-            url,
-            verify=self.certificate_validation,
-            headers={'Authorization': f'Bearer {tok}'},
-            data=buf)
-                    
+
+        def post(codec: Optional[str]) -> requests.Response:
+            return self.session.post(
+                url,
+                verify=self.certificate_validation,
+                headers={'Authorization': f'Bearer {tok}'},
+                data=self.arrow_to_chunks(arr, batch_size, codec))
+
+        resp = post(codec)
+        if codec is not None and _rejected(resp):
+            logger.warning('Server rejected %s-compressed arrow upload (code %s), retrying uncompressed', codec, resp.status_code)
+            ArrowUploader._compression_rejected.add(base_path)
+            resp = post(None)
+
         if resp.status_code != requests.codes.ok:
             resp.raise_for_status()
 
@@ -734,7 +942,7 @@ class ArrowUploader:
         base_path = self.server_base_path
         
         with open(file_path, 'rb') as file:        
-            out = requests.post(
+            out = self.session.post(
                 f'{base_path}/api/v2/upload/datasets/{dataset_id}/{graph_type}/{file_type}',
                 verify=self.certificate_validation,
                 headers={'Authorization': f'Bearer {tok}'},
@@ -0,0 +1,189 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import uuid
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import constants as config
+from .constants import MEMOIZE_STORE_BYTES
+from .util import setup_logger
+
+logger = setup_logger(name=__name__, verbose=config.VERBOSE)
+
+MANIFEST = "manifest.json"
+
+
+def _sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _is_arrow_frame(v: Any) -> bool:
+    """DataFrames that round-trip through Arrow unchanged: unique string column names, no pandas sparse columns"""
+    if not isinstance(v, pd.DataFrame) or not v.columns.is_unique:
+        return False
+    return all(isinstance(c, str) for c in v.columns) and not any(isinstance(dt, pd.SparseDtype) for dt in v.dtypes)
+
+
+def _write(value: Any, base: str) -> Tuple[str, str]:
+    """Write one artifact next to base, returning (file name, format)"""
+    if _is_arrow_frame(value):
+        import pyarrow as pa
+        try:
+            table = pa.Table.from_pandas(value, preserve_index=True)
+            with pa.OSFile(base + ".arrow", "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            return os.path.basename(base) + ".arrow", "arrow"
+        except (pa.ArrowException, TypeError, ValueError):  # e.g. mixed-type object columns
+            logger.debug("Arrow conversion failed, pickling instead", exc_info=True)
+    if isinstance(value, np.ndarray) and value.dtype != object:
+        np.save(base + ".npy", value)
+        return os.path.basename(base) + ".npy", "npy"
+    with open(base + ".pkl", "wb") as f:
+        pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return os.path.basename(base) + ".pkl", "pickle"
+
+
+def _read(path: str, fmt: str, mmap: bool) -> Any:
+    if fmt == "arrow":
+        import pyarrow as pa
+        source = pa.memory_map(path) if mmap else pa.OSFile(path)
+        return pa.ipc.open_file(source).read_all().to_pandas()
+    if fmt == "npy":
+        return np.load(path, mmap_mode="r" if mmap else None)
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+class ArtifactStore:
+    """
+    On-disk store of named artifact bundles keyed by a content hash, shared across processes and sessions
+
+    Each entry is a directory of files: DataFrames as Arrow IPC files and arrays as .npy, both memory-mapped
+    on read, and anything else (fitted models) pickled, plus a manifest of each file's sha256 and size.
+    Entries are published by an atomic rename, checked against the manifest on read, and dropped when corrupt.
+    Entries are evicted least-recently-used first, by manifest modification time, once all exceed max_bytes
+    """
+
+    def __init__(self, path: str, max_bytes: int = MEMOIZE_STORE_BYTES, verify: bool = True):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.verify = verify
+
+    def _entry_dir(self, key: str) -> str:
+        # hash keys so any string maps to a portable directory name
+        return os.path.join(self.path, hashlib.sha256(key.encode("utf-8")).hexdigest())
+
+    def _drop(self, entry: str) -> None:
+        shutil.rmtree(entry, ignore_errors=True)
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(os.path.join(self._entry_dir(key), MANIFEST))
+
+    def get(self, key: str, mmap: bool = True) -> Optional[Dict[str, Any]]:
+        """Artifacts stored under key, or None when missing or failing integrity checks"""
+        entry = self._entry_dir(key)
+        manifest_path = os.path.join(entry, MANIFEST)
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            out = {}
+            for name, meta in manifest["artifacts"].items():
+                file_path = os.path.join(entry, meta["file"])
+                if os.path.getsize(file_path) != meta["bytes"] or (
+                    self.verify and _sha256(file_path) != meta["sha256"]
+                ):
+                    raise ValueError(f"checksum mismatch for {file_path}")
+                out[name] = _read(file_path, meta["format"], mmap)
+            os.utime(manifest_path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Dropping corrupt memoization store entry {entry}: {e}")
+            self._drop(entry)
+            return None
+        logger.debug(f"Memoization store hit: {key}")
+        return out
+
+    def put(self, key: str, artifacts: Dict[str, Any]) -> None:
+        """Store artifacts under key unless present, then evict beyond max_bytes"""
+        entry = self._entry_dir(key)
+        if key in self:
+            return
+        os.makedirs(self.path, exist_ok=True)
+        tmp = f"{entry}.{uuid.uuid4().hex}.tmp"
+        os.makedirs(tmp)
+        try:
+            manifest: Dict[str, Any] = {"key": key, "artifacts": {}}
+            for i, (name, value) in enumerate(artifacts.items()):
+                file_name, fmt = _write(value, os.path.join(tmp, str(i)))
+                file_path = os.path.join(tmp, file_name)
+                manifest["artifacts"][name] = {
+                    "file": file_name,
+                    "format": fmt,
+                    "bytes": os.path.getsize(file_path),
+                    "sha256": _sha256(file_path),
+                }
+            with open(os.path.join(tmp, MANIFEST), "w") as f:
+                json.dump(manifest, f)
+            os.rename(tmp, entry)
+        except OSError:
+            # another process published the same key first
+            self._drop(tmp)
+            if key not in self:
+                raise
+        except Exception:
+            self._drop(tmp)
+            raise
+        logger.debug(f"Memoization store put: {key}")
+        self.evict()
+
+    def evict(self) -> None:
+        """Delete least-recently-used entries until the store holds at most max_bytes"""
+        if not os.path.isdir(self.path):
+            return
+        entries = []
+        total = 0
+        for name in os.listdir(self.path):
+            entry = os.path.join(self.path, name)
+            try:
+                used = os.stat(os.path.join(entry, MANIFEST)).st_mtime
+                size = sum(e.stat().st_size for e in os.scandir(entry))
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            entries.append((used, entry, size))
+            total += size
+        for _, entry, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._drop(entry)
+            total -= size
+            logger.debug(f"Evicted memoization store entry {entry}")
+
+
+_stores: Dict[Tuple[str, int], ArtifactStore] = {}
+
+
+def get_artifact_store(path: Optional[str], max_bytes: int = MEMOIZE_STORE_BYTES) -> Optional[ArtifactStore]:
+    """Process-wide ArtifactStore for path, or None when path is None"""
+    if path is None:
+        return None
+    key = (os.path.abspath(path), max_bytes)
+    if key not in _stores:
+        _stores[key] = ArtifactStore(key[0], max_bytes)
+    return _stores[key]
+
+
+def configured_artifact_store() -> Optional[ArtifactStore]:
+    """ArtifactStore set via PyGraphistry.memoize_store_dir(), or None when disabled"""
+    from .pygraphistry import PyGraphistry
+    return get_artifact_store(PyGraphistry.memoize_store_dir(), PyGraphistry.memoize_store_bytes())
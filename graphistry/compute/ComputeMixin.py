@@ -4,8 +4,10 @@ from typing_extensions import Literal
 
 from graphistry.Engine import Engine
 from graphistry.Plottable import Plottable
+from .adjacency import maybe_adjacency, topological_levels
+from .bfs import bfs as bfs_base
 from .chain import chain as chain_base
-from .collapse import collapse_by
+from .collapse import collapse_by_components
 from .hop import hop as hop_base
 from .filter_by_dict import (
     filter_edges_by_dict as filter_edges_by_dict_base,
@@ -103,6 +105,13 @@ class ComputeMixin(MIXIN_BASE):
         """See get_degrees"""
         g = self
         g_nodes = g.materialize_nodes()
+        adj = maybe_adjacency(g._edges, g._source, g._destination)
+        if adj is not None:
+            degrees = adj.node_values(g_nodes._nodes[g_nodes._node], adj.in_degrees()).astype("int32")
+            nodes_df = g_nodes._nodes[
+                [c for c in g_nodes._nodes.columns if c != col]
+            ].reset_index(drop=True).assign(**{col: degrees})
+            return g.nodes(nodes_df, g_nodes._node)
         in_degree_df = (
             g._edges[[g._source, g._destination]]
             .groupby(g._destination)
@@ -120,6 +129,15 @@ class ComputeMixin(MIXIN_BASE):
     def get_outdegrees(self, col: str = "degree_out"):
         """See get_degrees"""
         g = self
+        adj = maybe_adjacency(g._edges, g._source, g._destination)
+        if adj is not None:
+            # materialize in reversed orientation, matching the edge-swapping path below
+            g_nodes = g.bind(source=g._destination, destination=g._source).materialize_nodes()
+            degrees = adj.node_values(g_nodes._nodes[g_nodes._node], adj.out_degrees()).astype("int32")
+            nodes_df = g_nodes._nodes[
+                [c for c in g_nodes._nodes.columns if c != col]
+            ].reset_index(drop=True).assign(**{col: degrees})
+            return g.nodes(nodes_df, g_nodes._node)
         g2 = g.edges(
             g._edges.rename(
                 columns={g._source: g._destination, g._destination: g._source}
@@ -228,6 +246,10 @@ class ComputeMixin(MIXIN_BASE):
         new_node_ids = new_nodes[g._node].to_numpy()
         #print('new_node_ids', new_node_ids)
         #print('new node_ids', type(new_node_ids), len(g._nodes), '->', len(new_node_ids))
+        adj = maybe_adjacency(g._edges, g._source, g._destination)
+        if adj is not None:
+            new_edges = g._edges[adj.edges_within(adj.mask(new_node_ids))]
+            return g.nodes(new_nodes).edges(new_edges)
         new_edges_hits_df = (
             g._edges[[g._source, g._destination]]
             .isin({
@@ -252,7 +274,7 @@ class ComputeMixin(MIXIN_BASE):
     ) -> Plottable:
         """
         Label nodes on column level_col based on topological sort depth
-        Supports pandas + cudf, using parallelism within each level computation
+        Supports pandas + cudf: pandas peels levels with Kahn's algorithm over a CSR index, cudf uses parallelism within each level computation
         Options:
         * allow_cycles: if False and detects a cycle, throw ValueException, else break cycle by picking a lowest-in-degree node
         * warn_cycles: if True and detects a cycle, proceed with a warning
@@ -278,6 +300,20 @@ class ComputeMixin(MIXIN_BASE):
             non_self_loops = g2._edges[g2._source] != g2._edges[g2._destination]
             g2 = g2.edges(g2._edges[non_self_loops])
 
+        adj = maybe_adjacency(g2._edges, g2._source, g2._destination)
+        if adj is not None:
+            levels = topological_levels(
+                adj, adj.encode(g2._nodes[g2._node]), allow_cycles=allow_cycles, warn_cycles=warn_cycles
+            )
+            nodes_df = (
+                g2._nodes.assign(**{level_col: levels})
+                .iloc[np.argsort(levels, kind="stable")]
+                .reset_index(drop=True)
+            )
+            if self._nodes is None:
+                return self.nodes(nodes_df)
+            return self.nodes(self._with_levels(g2_base, nodes_df, level_col))
+
         nodes_with_levels: List[Any] = []
         while True:
             if len(g2._nodes) == 0:
@@ -320,11 +356,12 @@ class ComputeMixin(MIXIN_BASE):
         if self._nodes is None:
             return self.nodes(nodes_df)
         else:
-            # use orig cols, esp. in case collisions like degree
-            out_df = g2_base._nodes.merge(
-                nodes_df[[g2_base._node, level_col]], on=g2_base._node, how="left"
-            )
-            return self.nodes(out_df)
+            return self.nodes(self._with_levels(g2_base, nodes_df, level_col))
+
+    def _with_levels(self, g2_base: Plottable, nodes_df: Any, level_col: str) -> Any:
+        # use orig cols, esp. in case collisions like degree, and map by id so repeated node ids keep their rows
+        levels = nodes_df.drop_duplicates(g2_base._node).set_index(g2_base._node)[level_col]
+        return g2_base._nodes.assign(**{level_col: g2_base._nodes[g2_base._node].map(levels)})
 
     def prune_self_edges(self):
         return self.edges(self._edges[ self._edges[self._source] != self._edges[self._destination] ])
@@ -341,8 +378,10 @@ class ComputeMixin(MIXIN_BASE):
         """
         Topology-aware collapse by given column attribute starting at `node`
 
-        Traverses directed graph from start node `node` and collapses clusters of nodes that share
-        the same property so that topology is preserved.
+        Finds nodes reachable from start node `node`, and collapses each connected cluster of nodes that share
+        the same property into a super node so that topology is preserved. Nodes with no neighbor sharing the property are left as-is.
+
+        Clusters are found with a vectorized union-find over edges whose endpoints both have the property
 
         :param node: start `node` to begin traversal
         :param attribute: the given `attribute` to collapse over within `column`
@@ -355,13 +394,11 @@ class ComputeMixin(MIXIN_BASE):
         :rtype: Plottable
         """
         # TODO FIXME CHECK SELF LOOPS?
-        return collapse_by(
+        return collapse_by_components(
             self,
             start_node=node,
-            parent=node,
             attribute=attribute,
             column=column,
-            seen={},
             self_edges=self_edges,
             unwrap=unwrap,
             verbose=verbose
@@ -372,6 +409,10 @@ class ComputeMixin(MIXIN_BASE):
         return hop_base(self, *args, **kwargs)
     hop.__doc__ = hop_base.__doc__
 
+    def bfs(self, *args, **kwargs):
+        return bfs_base(self, *args, **kwargs)
+    bfs.__doc__ = bfs_base.__doc__
+
     def filter_nodes_by_dict(self, *args, **kwargs):
         return filter_nodes_by_dict_base(self, *args, **kwargs)
     filter_nodes_by_dict.__doc__ = filter_nodes_by_dict_base.__doc__
@@ -0,0 +1,280 @@
+from typing import Dict, Optional, Tuple
+import hashlib
+import weakref
+import numpy as np
+import pandas as pd
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+###############################################################################
+#
+#  Edge tables are treated as immutable (every .edges() call creates a new Plottable),
+#  so an index built for a table can be reused by every hop/chain/degree/keep_nodes
+#  call that sees the same dataframe object
+#
+#  The cache holds a weak reference to the dataframe, so entries disappear with it,
+#  and before reuse it checks the length and endpoint column buffers, to catch
+#  reassigned columns, and a hash of the endpoint values, to catch in-place edits
+#  such as edges.loc[i, dst] = x that keep the same buffers
+#
+###############################################################################
+
+
+def _buffer(values) -> np.ndarray:
+    """
+    Backing numpy buffer of a Series/Index without copying, when pandas exposes one:
+    codes of categoricals, values of masked/string/datetime extension arrays
+    """
+    arr = values.array
+    if isinstance(arr, pd.Categorical):
+        return arr.codes
+    for attr in ['_ndarray', '_data']:
+        buf = getattr(arr, attr, None)
+        if isinstance(buf, np.ndarray):
+            return buf
+    return values.to_numpy()
+
+
+def _content_digest(edges: pd.DataFrame, source: str, destination: str) -> bytes:
+    """
+    Hash of the endpoint values in row order: a vectorized pass over two columns,
+    far cheaper than rebuilding the index or merging
+    """
+    rows = pd.util.hash_pandas_object(edges[[source, destination]], index=False)
+    return hashlib.blake2b(rows.to_numpy().tobytes(), digest_size=16).digest()
+
+
+def _column_token(s: pd.Series) -> Tuple:
+    arr = _buffer(s)
+    token: Tuple = (arr.__array_interface__['data'][0], arr.dtype.str, str(s.dtype))
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        categories = _buffer(s.cat.categories)
+        token += (categories.__array_interface__['data'][0],)
+    return token
+
+
+class AdjacencyIndex(object):
+    """
+    Internal, not intended for use outside of this module.
+
+    Integer-factorized adjacency over an edge table:
+
+    * ids: pd.Index of node ids, position is the node code
+    * src_codes, dst_codes: per-edge endpoint codes, -1 when the endpoint is null
+    * fwd_offsets, fwd_edges: CSR, edge positions grouped by source code
+    * rev_offsets, rev_edges: CSC, edge positions grouped by destination code
+
+    Edges with a null endpoint are not reachable through the offsets.
+    """
+
+    def __init__(self, edges: pd.DataFrame, source: str, destination: str):
+        self.source = source
+        self.destination = destination
+        self.num_edges = len(edges)
+        self._tokens = (_column_token(edges[source]), _column_token(edges[destination]))
+        self._digest = _content_digest(edges, source, destination)
+
+        codes, ids = pd.factorize(
+            pd.concat([edges[source], edges[destination]], ignore_index=True),
+            sort=False
+        )
+        self.ids: pd.Index = pd.Index(ids)
+        self.num_nodes = len(self.ids)
+        self.src_codes: np.ndarray = codes[:self.num_edges]
+        self.dst_codes: np.ndarray = codes[self.num_edges:]
+
+        valid_edges = np.flatnonzero((self.src_codes >= 0) & (self.dst_codes >= 0))
+        self.fwd_offsets, self.fwd_edges = self._group(self.src_codes, valid_edges)
+        self.rev_offsets, self.rev_edges = self._group(self.dst_codes, valid_edges)
+
+    def _group(self, codes: np.ndarray, valid_edges: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        keys = codes[valid_edges]
+        order = valid_edges[np.argsort(keys, kind='stable')]
+        offsets = np.zeros(self.num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(keys, minlength=self.num_nodes), out=offsets[1:])
+        return offsets, order
+
+    def matches(self, edges: pd.DataFrame) -> bool:
+        """
+        Staleness check: same length and endpoint column buffers, then same endpoint values
+        """
+        if len(edges) != self.num_edges:
+            return False
+        if (_column_token(edges[self.source]), _column_token(edges[self.destination])) != self._tokens:
+            return False
+        return _content_digest(edges, self.source, self.destination) == self._digest
+
+    def encode(self, values) -> np.ndarray:
+        """
+        Map node ids to codes, with -1 for ids not incident to any edge
+        """
+        return self.ids.get_indexer(pd.Index(values))
+
+    def mask(self, values) -> np.ndarray:
+        """
+        Boolean mask over node codes that is True for the given node ids
+        """
+        out = np.zeros(self.num_nodes, dtype=bool)
+        codes = self.encode(values)
+        out[codes[codes >= 0]] = True
+        return out
+
+    def edges_within(self, node_mask: np.ndarray) -> np.ndarray:
+        """
+        Boolean mask over edges whose source and destination are both in node_mask
+        """
+        padded = np.append(node_mask, False)  # code -1 (null endpoint) reads the padding
+        return padded[self.src_codes] & padded[self.dst_codes]
+
+    def node_values(self, node_ids, per_code: np.ndarray, fill=0) -> np.ndarray:
+        """
+        Align a per-code array to a sequence of node ids, using fill for ids not incident to any edge
+        """
+        padded = np.append(per_code, np.array([fill], dtype=per_code.dtype))
+        return padded[self.encode(node_ids)]
+
+    def gather(self, frontier: np.ndarray, direction: str = 'forward') -> np.ndarray:
+        """
+        Edge positions leaving (forward) or entering (reverse) the frontier node codes
+
+        Cost is proportional to the frontier's degree, not the edge table size
+        """
+        if direction == 'forward':
+            offsets, order = self.fwd_offsets, self.fwd_edges
+        elif direction == 'reverse':
+            offsets, order = self.rev_offsets, self.rev_edges
+        else:
+            raise ValueError(f'Invalid direction: "{direction}", must be one of: "forward", "reverse"')
+
+        starts = offsets[frontier]
+        counts = offsets[frontier + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            return order[:0]
+        shifts = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+        return order[shifts + np.arange(total)]
+
+    def in_degrees(self) -> np.ndarray:
+        return np.diff(self.rev_offsets)
+
+    def out_degrees(self) -> np.ndarray:
+        return np.diff(self.fwd_offsets)
+
+
+def topological_levels(
+    adj: AdjacencyIndex,
+    node_codes: np.ndarray,
+    allow_cycles: bool = True,
+    warn_cycles: bool = True
+) -> np.ndarray:
+    """
+    Kahn's algorithm: level per node row, where node_codes are the rows' codes (-1 for nodes without edges)
+
+    In-degrees are computed once and decremented as each level is peeled off, so the cost is O(|V| + |E|) plus
+    O(|V|) per broken cycle. Cycles are broken like the dataframe implementation: when no node has in-degree 0,
+    the first node row with the highest remaining in+out degree starts the next level.
+    """
+    in_deg = adj.in_degrees().copy()
+    out_deg = adj.out_degrees().copy()
+
+    indexed = node_codes >= 0
+    alive = np.zeros(adj.num_nodes, dtype=bool)
+    alive[node_codes[indexed]] = True
+    code_levels = np.full(adj.num_nodes, -1, dtype=np.int64)
+
+    unleveled = int(alive.sum())
+    roots = np.flatnonzero(alive & (in_deg == 0))
+    level = 0
+    if len(roots) == 0 and not indexed.all():
+        # nodes without edges are the roots of level 0
+        level = 1
+    while unleveled > 0:
+        if len(roots) == 0:
+            if not allow_cycles:
+                raise ValueError(
+                    "Cyclic graph in get_topological_levels(); remove cycles or set allow_cycles=True"
+                )
+            row_degrees = np.full(len(node_codes), -1, dtype=np.int64)
+            row_alive = indexed.copy()
+            row_alive[indexed] = alive[node_codes[indexed]]
+            row_degrees[row_alive] = (in_deg + out_deg)[node_codes[row_alive]]
+            roots = node_codes[[int(np.argmax(row_degrees))]]
+            if warn_cycles:
+                logger.warning("Cycle on computing level %s", level)
+
+        code_levels[roots] = level
+        alive[roots] = False
+        unleveled -= len(roots)
+
+        dsts, dst_counts = np.unique(adj.dst_codes[adj.gather(roots, 'forward')], return_counts=True)
+        in_deg[dsts] -= dst_counts
+        srcs, src_counts = np.unique(adj.src_codes[adj.gather(roots, 'reverse')], return_counts=True)
+        out_deg[srcs] -= src_counts
+
+        roots = dsts[alive[dsts] & (in_deg[dsts] == 0)]
+        level = level + 1
+
+    levels = np.zeros(len(node_codes), dtype=np.int64)
+    levels[indexed] = code_levels[node_codes[indexed]]
+    return levels
+
+
+_adjacency_cache: Dict[Tuple[int, str, str], Tuple[weakref.ref, AdjacencyIndex]] = {}
+
+
+def _evict(key: Tuple[int, str, str]):
+    def cb(_ref):
+        _adjacency_cache.pop(key, None)
+    return cb
+
+
+def get_adjacency(edges: pd.DataFrame, source: str, destination: str) -> AdjacencyIndex:
+    """
+    Return the adjacency index for an edge table, building and caching it on first use
+    """
+    key = (id(edges), source, destination)
+    hit = _adjacency_cache.get(key)
+    if hit is not None:
+        ref, adj = hit
+        if ref() is edges and adj.matches(edges):
+            return adj
+        logger.debug('adjacency cache stale for %s', key)
+
+    adj = AdjacencyIndex(edges, source, destination)
+    try:
+        _adjacency_cache[key] = (weakref.ref(edges, _evict(key)), adj)
+    except TypeError:
+        logger.debug('edges not weak-referenceable, skipping adjacency cache')
+    return adj
+
+
+def clear_adjacency_cache() -> None:
+    _adjacency_cache.clear()
+
+
+def use_adjacency(edges, engine: str = 'auto') -> bool:
+    """
+    Resolve hop engine: 'csr' for the cached adjacency index, 'merge' for dataframe joins
+
+    'auto' picks 'csr' for non-empty pandas edges, else 'merge' (e.g., cudf)
+    """
+    if engine == 'csr':
+        if not isinstance(edges, pd.DataFrame):
+            raise ValueError(f'engine="csr" requires pandas edges, received: {type(edges)}')
+        return True
+    if engine == 'merge':
+        return False
+    if engine == 'auto':
+        return isinstance(edges, pd.DataFrame) and len(edges) > 0
+    raise ValueError(f'Invalid engine: "{engine}", must be one of: "auto" (default), "csr", "merge"')
+
+
+def maybe_adjacency(edges, source: Optional[str], destination: Optional[str]) -> Optional[AdjacencyIndex]:
+    """
+    Cached adjacency when the auto engine would use it, else None
+    """
+    if source is None or destination is None or not use_adjacency(edges):
+        return None
+    return get_adjacency(edges, source, destination)
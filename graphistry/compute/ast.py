@@ -143,7 +143,8 @@ class ASTEdge(ASTObject):
             hops=self._hops,
             to_fixed_point=self._to_fixed_point,
             source_node_match=self._destination_node_match,
-            destination_node_match=self._source_node_match
+            destination_node_match=self._source_node_match,
+            name=self._name
         )
 e = ASTEdge  # noqa: E305
 
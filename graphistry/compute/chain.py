@@ -1,8 +1,11 @@
-from typing import cast, List, Optional, Tuple, Union
+from typing import cast, List, Optional, Tuple, Union, overload
+from typing_extensions import Literal
+import numpy as np
 import pandas as pd
 
 from graphistry.Plottable import Plottable
 from .ast import ASTObject, ASTNode, ASTEdge
+from .chain_plan import ChainPlan, EXPLAIN_COLUMNS, is_single_hop
 from .filter_by_dict import filter_by_dict
 
 import logging
@@ -16,6 +19,8 @@ logger.setLevel(logging.DEBUG)
 def combine_steps(g: Plottable, kind: str, steps: List[Tuple[ASTObject,Plottable]]) -> pd.DataFrame:
     """
     Collect nodes and edges, taking care to deduplicate and tag any names
+
+    Rows follow the order of g's node/edge table, independent of the order steps ran in
     """
 
     id = getattr(g, '_node' if kind == 'nodes' else '_edge')
@@ -26,15 +31,6 @@ def combine_steps(g: Plottable, kind: str, steps: List[Tuple[ASTObject,Plottable
         raise ValueError(f'Cannot combine steps with empty id for kind {kind}')
 
     logger.debug('combine_steps ops pre: %s', [op for (op, _) in steps])
-    if kind == 'edges':
-        logger.debug('EDGES << recompute forwards given reduced set')
-        steps = [
-            (
-                op,
-                op(g=g.edges(g_step._edges), prev_node_wavefront=g_step._nodes)
-            )
-            for (op, g_step) in steps
-        ]
 
     # df[[id]]
     out_df = pd.concat([
@@ -55,6 +51,10 @@ def combine_steps(g: Plottable, kind: str, steps: List[Tuple[ASTObject,Plottable
             out_df[op._name] = out_df[op._name].fillna(False).astype(bool)
     out_df = out_df.merge(getattr(g, df_fld), on=id, how='left')
 
+    ids = pd.Index(getattr(g, df_fld)[id])
+    if ids.is_unique:
+        out_df = out_df.iloc[np.argsort(ids.get_indexer(out_df[id]), kind='stable')].reset_index(drop=True)
+
     logger.debug('COMBINED[%s] >> %s', kind, out_df)
 
     return out_df
@@ -64,11 +64,15 @@ def combine_steps(g: Plottable, kind: str, steps: List[Tuple[ASTObject,Plottable
 #
 #  Implementation: The algorithm performs three phases -
 #
+#     0. Plan (see chain_plan.py)
+#
+#     Pick which end to start from, and push node filters into preceding single-hop edge steps
+#
 #     1. Forward wavefront (slowed)
 #
 #     Each step is processed, yielding the nodes it matches based on the nodes reached by the previous step
 #
-#     Full node/edge table merges are happening, so any pre-filtering would help
+#     Full node/edge table merges are happening, so the plan's pre-filtering helps
 #
 #     2. Reverse pruning pass  (fastish)
 #
@@ -82,13 +86,24 @@ def combine_steps(g: Plottable, kind: str, steps: List[Tuple[ASTObject,Plottable
 #    
 #     - No 'bad' deadend nodes will be included
 #
-#     3. Forward output pass
+#     3. Forward output pass (fused into Step 2)
+#
+#     Collect and label outputs as each reverse step completes
 #
-#     This pass is likely fusable into Step 2: collect and label outputs
+#     Single-hop edge steps are exact after pruning, while multi-hop steps rerun forwards
+#     over their pruned edges to drop edges outside the hop bound
 #
 ###############################################################################
 
-def chain(self: Plottable, ops: List[ASTObject]) -> Plottable:
+@overload
+def chain(self: Plottable, ops: List[ASTObject], explain: Literal[False] = False) -> Plottable:
+    ...
+
+@overload
+def chain(self: Plottable, ops: List[ASTObject], explain: Literal[True]) -> pd.DataFrame:
+    ...
+
+def chain(self: Plottable, ops: List[ASTObject], explain: bool = False) -> Union[Plottable, pd.DataFrame]:
     """
     Experimental: Chain a list of operations
 
@@ -96,8 +111,9 @@ def chain(self: Plottable, ops: List[ASTObject]) -> Plottable:
     If any matchers are named, add a correspondingly named boolean-valued column to the output
 
     :param ops: List[ASTObject] Various node and edge matchers
+    :param explain: Run the chain and return its plan instead of the subgraph: one row per step, with the predicates pushed down, estimated rows, and actual forward-pass and output rows
 
-    :returns: Plotter
+    :returns: Plotter, or pd.DataFrame when explain=True
     :rtype: Plotter
 
     **Example: Find nodes of some type**
@@ -141,9 +157,19 @@ def chain(self: Plottable, ops: List[ASTObject]) -> Plottable:
             ])
             print('# hits:', len(g_risky._nodes[ g_risky._nodes.hit ]))
 
+    **Example: Inspect the plan and row counts of each step**
+
+    ::
+
+            from graphistry.ast import n, e_forward
+
+            print(g.chain([ n({"type": "person"}), e_forward(), n({"risk": True}) ], explain=True))
+
     """
 
     if len(ops) == 0:
+        if explain:
+            return pd.DataFrame([], columns=EXPLAIN_COLUMNS)
         return self
 
     logger.debug('orig chain >> %s', ops)
@@ -170,11 +196,13 @@ def chain(self: Plottable, ops: List[ASTObject]) -> Plottable:
         added_edge_index = False
     
 
+    plan = ChainPlan(g, ops)
+
     logger.debug('============ FORWARDS ============')
 
     #forwards
     g_stack : List[Plottable] = []
-    for op in ops:
+    for op in plan.forward_ops:
         g_step = (
             op(
                 g=g,
@@ -192,9 +220,12 @@ def chain(self: Plottable, ops: List[ASTObject]) -> Plottable:
 
     logger.debug('============ BACKWARDS ============')
 
-    #backwards
+    #backwards, collecting outputs
     g_stack_reverse : List[Plottable] = [g_stack[-1]]
-    for (op, g_step) in zip(reversed(ops), reversed(g_stack)):
+    node_steps : List[Tuple[ASTObject, Plottable]] = []
+    edge_steps : List[Tuple[ASTObject, Plottable]] = []
+    g_step_outputs : List[Plottable] = []
+    for (op, g_step) in zip(reversed(plan.ops), reversed(g_stack)):
         g_step_reverse = (
             (op.reverse())(
 
@@ -207,12 +238,35 @@ def chain(self: Plottable, ops: List[ASTObject]) -> Plottable:
             )
         )
         g_stack_reverse.append(g_step_reverse)
+        node_steps.append((op, g_step_reverse))
+        if isinstance(op, ASTEdge):
+            if is_single_hop(op):
+                g_step_out = g_step_reverse
+            else:
+                logger.debug('EDGES << recompute forwards given reduced set')
+                g_step_out = op(g=g.edges(g_step_reverse._edges), prev_node_wavefront=g_step_reverse._nodes)
+            edge_steps.append((op, g_step_out))
+        else:
+            g_step_out = g_step_reverse
+        g_step_outputs.append(g_step_out.nodes(g_step_reverse._nodes))
+
+    if explain:
+        return plan.explain(ops, g_stack, list(reversed(g_step_outputs)))
+
+    if plan.reversed:
+        # tag columns in the same order as when running forwards
+        node_steps.reverse()
+        edge_steps.reverse()
 
     logger.debug('============ COMBINE NODES ============')
-    final_nodes_df = combine_steps(g, 'nodes', list(zip(reversed(ops), g_stack_reverse[1:])))
+    final_nodes_df = combine_steps(g, 'nodes', node_steps)
 
     logger.debug('============ COMBINE EDGES ============')
-    final_edges_df = combine_steps(g, 'edges', list(zip(reversed(ops), g_stack_reverse[1:])))
+    final_edges_df = (
+        combine_steps(g, 'edges', edge_steps)
+        if len(edge_steps) > 0
+        else g._edges[:0]
+    )
     if added_edge_index:
         final_edges_df = final_edges_df.drop(columns=['index'])
 
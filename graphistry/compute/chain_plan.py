@@ -0,0 +1,150 @@
+from typing import cast, List, Optional
+import pandas as pd
+
+from graphistry.Plottable import Plottable
+from .ast import ASTObject, ASTNode, ASTEdge
+from .filter_by_dict import filter_by_dict_hits
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+###############################################################################
+#
+#  Planning is cheap and only uses exact filter counts over the node/edge tables:
+#
+#     1. Direction: chains of directed single-hop steps describe the same paths when
+#        read backwards, so start the forward wavefront from whichever end node matcher
+#        keeps fewer nodes
+#
+#     2. Predicate pushdown: a directed single-hop edge step followed by a node filter
+#        only needs to reach nodes passing that filter, so the forward wavefront pass
+#        merges the filter into the step's destination_node_match
+#
+#     3. Fused output: single-hop edge steps are already exact after the reverse
+#        pruning pass, so only multi-hop steps rerun forwards to collect outputs
+#
+#  Undirected steps are left as-is: the reverse pass cannot tell which way an undirected
+#  edge was traversed, so rewriting them can change which edges survive pruning
+#
+###############################################################################
+
+
+def is_single_hop(op: ASTObject) -> bool:
+    return isinstance(op, ASTEdge) and op._hops == 1 and not op._to_fixed_point
+
+
+def is_directed_single_hop(op: ASTObject) -> bool:
+    return is_single_hop(op) and cast(ASTEdge, op)._direction != 'undirected'
+
+
+def estimate_rows(g: Plottable, op: ASTObject) -> int:
+    """
+    Upper bound on rows a step can match: nodes for node steps, edges for edge steps
+    """
+    if isinstance(op, ASTNode):
+        hits = filter_by_dict_hits(g._nodes, op._filter_dict)
+        return len(g._nodes) if hits is None else int(hits.sum())
+    if isinstance(op, ASTEdge):
+        hits = filter_by_dict_hits(g._edges, op._edge_match)
+        return len(g._edges) if hits is None else int(hits.sum())
+    raise ValueError(f'Unexpected chain op: {op}')
+
+
+def push_down(op: ASTObject, next_op: Optional[ASTObject]) -> Optional[dict]:
+    """
+    Node filter that can be merged into a single-hop edge step's destination_node_match, if any
+    """
+    if not is_directed_single_hop(op) or not isinstance(next_op, ASTNode) or next_op._filter_dict is None:
+        return None
+    edge_op = cast(ASTEdge, op)
+    existing = edge_op._destination_node_match or {}
+    for k, v in next_op._filter_dict.items():
+        if k in existing and existing[k] != v:
+            return None
+    pushed = {k: v for k, v in next_op._filter_dict.items() if k not in existing}
+    return pushed if len(pushed) > 0 else None
+
+
+EXPLAIN_COLUMNS = [
+    'step', 'op', 'execution_order', 'pushed_down', 'estimated_rows',
+    'forward_nodes', 'forward_edges', 'output_nodes', 'output_edges'
+]
+
+
+class ChainPlan(object):
+    """
+    Internal, not intended for use outside of this module.
+
+    * ops: steps in execution order, reversed and flipped when reversed=True
+    * forward_ops: ops with pushed-down predicates, only used for the forward wavefront pass
+    * steps: for each position of ops, the index of the corresponding user-provided step
+    """
+
+    def __init__(self, g: Plottable, ops: List[ASTObject], reorder: bool = True):
+
+        self.estimates = [estimate_rows(g, op) for op in ops]
+
+        # only compare node counts: chain() pads both ends with node steps
+        self.reversed = (
+            reorder
+            and len(ops) > 1  # noqa: W503
+            and isinstance(ops[0], ASTNode) and isinstance(ops[-1], ASTNode)  # noqa: W503
+            and all([is_directed_single_hop(op) for op in ops if isinstance(op, ASTEdge)])  # noqa: W503
+            and self.estimates[-1] < self.estimates[0]  # noqa: W503
+        )
+
+        if self.reversed:
+            self.ops = [op.reverse() for op in reversed(ops)]
+            self.steps = list(reversed(range(len(ops))))
+        else:
+            self.ops = list(ops)
+            self.steps = list(range(len(ops)))
+
+        self.pushed: List[Optional[dict]] = [
+            push_down(op, self.ops[i + 1] if i + 1 < len(self.ops) else None)
+            for i, op in enumerate(self.ops)
+        ]
+
+        self.forward_ops: List[ASTObject] = []
+        for op, pushed in zip(self.ops, self.pushed):
+            if pushed:
+                edge_op = cast(ASTEdge, op)
+                op = ASTEdge(
+                    direction=edge_op._direction,
+                    edge_match=edge_op._edge_match,
+                    hops=edge_op._hops,
+                    to_fixed_point=edge_op._to_fixed_point,
+                    source_node_match=edge_op._source_node_match,
+                    destination_node_match={**(edge_op._destination_node_match or {}), **pushed},
+                    name=edge_op._name
+                )
+            self.forward_ops.append(op)
+
+        logger.debug('chain plan: reversed=%s, ops=%s, pushed=%s', self.reversed, self.ops, self.pushed)
+
+    def explain(
+        self,
+        user_ops: List[ASTObject],
+        forward: List[Plottable],
+        output: List[Plottable]
+    ) -> pd.DataFrame:
+        """
+        One row per user-provided step with the plan and actual row counts
+
+        forward and output are in execution order
+        """
+        rows = []
+        for i, step in enumerate(self.steps):
+            rows.append({
+                'step': step,
+                'op': repr(user_ops[step]),
+                'execution_order': i,
+                'pushed_down': self.pushed[i],
+                'estimated_rows': self.estimates[step],
+                'forward_nodes': len(forward[i]._nodes),
+                'forward_edges': len(forward[i]._edges),
+                'output_nodes': len(output[i]._nodes),
+                'output_edges': len(output[i]._edges)
+            })
+        return pd.DataFrame(rows, columns=EXPLAIN_COLUMNS).sort_values('step').reset_index(drop=True)
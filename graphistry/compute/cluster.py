@@ -9,7 +9,7 @@ from collections import Counter
 from graphistry.Plottable import Plottable
 from graphistry.constants import CUML, UMAP_LEARN, DBSCAN  # noqa type: ignore
 from graphistry.features import ModelDict
-from graphistry.feature_utils import get_matrix_by_column_parts
+from graphistry.feature_utils import get_matrix_by_column_parts, to_model_input
 
 logger = logging.getLogger("compute.cluster")
 
@@ -144,7 +144,7 @@ def dbscan_fit(g: Any, dbscan: Any, kind: str = "nodes", cols: Optional[Union[Li
     if X.empty:
         raise ValueError("No features found for clustering")
 
-    dbscan.fit(X)
+    dbscan.fit(to_model_input(X))
     # this is a future feature one cuml supports it
     if g.engine_dbscan == 'cuml':
         labels = dbscan.labels_.to_numpy()
@@ -177,25 +177,34 @@ def dbscan_fit(g: Any, dbscan: Any, kind: str = "nodes", cols: Optional[Union[Li
     return g
 
 
+def dbscan_core_index(model: Any):
+    """Nearest-neighbor index over the core samples of a fitted DBSCAN, built on first use and cached on the model"""
+    index = getattr(model, "_graphistry_core_index", None)
+    if index is None:
+        from sklearn.neighbors import NearestNeighbors
+        index = NearestNeighbors(n_neighbors=1).fit(model.components_)
+        model._graphistry_core_index = index
+    return index
+
+
 def dbscan_predict(X: pd.DataFrame, model: Any):
     """
     DBSCAN has no predict per se, so we reverse engineer one here
     from https://stackoverflow.com/questions/27822752/scikit-learn-predicting-new-points-with-dbscan
-    
+
+    Each row takes the label of its nearest core sample when closer than eps, else -1 (noise),
+    found for the whole batch at once via a KD-tree/ball-tree over the core samples
     """
     n_samples = X.shape[0]
 
     y_new = np.ones(shape=n_samples, dtype=int) * -1
+    if n_samples == 0 or len(model.core_sample_indices_) == 0:
+        return y_new
 
-    for i in range(n_samples):
-        diff = model.components_ - X.iloc[i, :].values  # NumPy broadcasting
-
-        dist = np.linalg.norm(diff, axis=1)  # Euclidean distance
-
-        shortest_dist_idx = np.argmin(dist)
-
-        if dist[shortest_dist_idx] < model.eps:
-            y_new[i] = model.labels_[model.core_sample_indices_[shortest_dist_idx]]
+    dist, idx = dbscan_core_index(model).kneighbors(to_model_input(X))
+    dist, idx = dist[:, 0], idx[:, 0]
+    hit = dist < model.eps
+    y_new[hit] = model.labels_[model.core_sample_indices_[idx[hit]]]
 
     return y_new
 
@@ -4,19 +4,29 @@ import pandas as pd
 from graphistry.Plottable import Plottable
 
 
-def filter_by_dict(df, filter_dict: Optional[dict] = None) -> pd.DataFrame:
+def filter_by_dict_hits(df, filter_dict: Optional[dict] = None) -> Optional[pd.Series]:
     """
-    return df where rows match all values in filter_dict
+    return boolean series of rows in df matching all values in filter_dict, or None when there is no filter
     """
 
     if filter_dict is None or filter_dict == {}:
-        return df
+        return None
 
     for col in filter_dict.keys():
         if col not in df.columns:
             raise ValueError(f'Key "{col}" not in columns of df, available columns are: {df.columns}')
 
-    hits = (df[list(filter_dict)] == pd.Series(filter_dict)).all(axis=1)
+    return (df[list(filter_dict)] == pd.Series(filter_dict)).all(axis=1)
+
+
+def filter_by_dict(df, filter_dict: Optional[dict] = None) -> pd.DataFrame:
+    """
+    return df where rows match all values in filter_dict
+    """
+
+    hits = filter_by_dict_hits(df, filter_dict)
+    if hits is None:
+        return df
     return df[hits]
 
 
@@ -1,8 +1,14 @@
-from typing import List, Optional
+from typing import cast, List, Optional
+from typing_extensions import Literal
+import numpy as np
 import pandas as pd
 
 from graphistry.Plottable import Plottable
-from .filter_by_dict import filter_by_dict
+from .adjacency import get_adjacency, use_adjacency
+from .filter_by_dict import filter_by_dict, filter_by_dict_hits
+
+
+HopEngine = Literal['auto', 'csr', 'merge']
 
 
 def hop(self: Plottable,
@@ -13,7 +19,8 @@ def hop(self: Plottable,
     edge_match: Optional[dict] = None,
     source_node_match: Optional[dict] = None,
     destination_node_match: Optional[dict] = None,
-    return_as_wave_front = False
+    return_as_wave_front = False,
+    engine: HopEngine = 'auto'
 ) -> Plottable:
     """
     Given a graph and some source nodes, return subgraph of all paths within k-hops from the sources
@@ -27,6 +34,7 @@ def hop(self: Plottable,
     source_node_match: dict of kv-pairs to match nodes before hopping
     destination_node_match: dict of kv-pairs to match nodes after hopping (including intermediate)
     return_as_wave_front: Only return the nodes/edges reached, ignoring past ones (primarily for internal use)
+    engine: 'csr' walks a cached integer adjacency index (pandas only), 'merge' joins the frontier against the edge table each hop, 'auto' (default) picks 'csr' for pandas
     """
 
     if not to_fixed_point and not isinstance(hops, int):
@@ -43,14 +51,8 @@ def hop(self: Plottable,
     if nodes is None:
         nodes = g2._nodes
 
-    if g2._edge is None:
-        if 'index' in g2._edges.columns:
-            raise ValueError('Edges cannot have column "index", please remove or set as g._edge via bind() or edges()')
-        edges_indexed = g2.filter_edges_by_dict(edge_match)._edges.reset_index()
-        EDGE_ID = 'index'
-    else:
-        edges_indexed = g2.filter_edges_by_dict(edge_match)._edges
-        EDGE_ID = g2._edge
+    if g2._edge is None and 'index' in g2._edges.columns:
+        raise ValueError('Edges cannot have column "index", please remove or set as g._edge via bind() or edges()')
 
     if g2._node is None:
         raise ValueError('Node binding cannot be None, please set g._node via bind() or nodes()')
@@ -58,6 +60,18 @@ def hop(self: Plottable,
     if g2._source is None or g2._destination is None:
         raise ValueError('Source and destination binding cannot be None, please set g._source and g._destination via bind() or edges()')
 
+    if use_adjacency(g2._edges, engine):
+        return hop_csr(
+            self, g2, nodes, hops, to_fixed_point, direction,
+            edge_match, source_node_match, destination_node_match, return_as_wave_front)
+
+    if g2._edge is None:
+        edges_indexed = g2.filter_edges_by_dict(edge_match)._edges.reset_index()
+        EDGE_ID = 'index'
+    else:
+        edges_indexed = g2.filter_edges_by_dict(edge_match)._edges
+        EDGE_ID = g2._edge
+
     hops_remaining = hops
     wave_front = filter_by_dict(nodes[[ g2._node ]], source_node_match)
     matches_nodes = None
@@ -168,3 +182,108 @@ def hop(self: Plottable,
         g_out = g_out.nodes(final_nodes)
 
     return g_out
+
+
+
+def hop_csr(
+    self: Plottable,
+    g2: Plottable,
+    nodes: pd.DataFrame,
+    hops: Optional[int],
+    to_fixed_point: bool,
+    direction: str,
+    edge_match: Optional[dict],
+    source_node_match: Optional[dict],
+    destination_node_match: Optional[dict],
+    return_as_wave_front: bool
+) -> Plottable:
+    """
+    hop() over the cached adjacency index of g2._edges
+
+    Same steps as the merge implementation, except each hop gathers the frontier's edges by offset
+    instead of joining against the full edge table, and node/edge sets are integer codes
+    """
+
+    adj = get_adjacency(g2._edges, cast(str, g2._source), cast(str, g2._destination))
+
+    edge_hits = filter_by_dict_hits(g2._edges, edge_match)
+    edge_ok = None if edge_hits is None else edge_hits.to_numpy()
+
+    dest_ok = None
+    if destination_node_match is not None:
+        dest_ok = adj.mask(filter_by_dict(g2._nodes, destination_node_match)[g2._node])
+
+    # (direction, gather edges by, far endpoint, near endpoint)
+    steps = (
+        ([('forward', adj.dst_codes, adj.src_codes)] if direction in ['forward', 'undirected'] else [])
+        + ([('reverse', adj.src_codes, adj.dst_codes)] if direction in ['reverse', 'undirected'] else [])  # noqa: W503
+    )
+
+    # Node sets are boolean masks over node codes:
+    #   matches_nodes: nodes to output
+    #   visited: nodes whose edges were already gathered; gathering them again cannot add edges or nodes,
+    #            so each step only expands newly reached nodes and costs O(new frontier degree)
+    hops_remaining = hops
+    wave_front = adj.encode(filter_by_dict(nodes[[ g2._node ]], source_node_match)[g2._node])
+    wave_front = np.unique(wave_front[wave_front >= 0])
+    matches_nodes = np.zeros(adj.num_nodes, dtype=bool)
+    visited = np.zeros(adj.num_nodes, dtype=bool)
+    matches_edges = np.zeros(adj.num_edges, dtype=bool)
+    first_hop = True
+
+    while True:
+        if not to_fixed_point and hops_remaining is not None:
+            if hops_remaining < 1:
+                break
+            hops_remaining = hops_remaining - 1
+
+        visited[wave_front] = True
+
+        new_node_ids_parts = []
+        src_node_ids_parts = []
+        for (gather_direction, far_codes, near_codes) in steps:
+            hop_edges = adj.gather(wave_front, gather_direction)
+            if edge_ok is not None:
+                hop_edges = hop_edges[edge_ok[hop_edges]]
+            far = far_codes[hop_edges]
+            if dest_ok is not None:
+                hits = dest_ok[far]
+                hop_edges = hop_edges[hits]
+                far = far[hits]
+            matches_edges[hop_edges] = True
+            new_node_ids_parts.append(far)
+            src_node_ids_parts.append(near_codes[hop_edges])
+
+        new_node_ids = np.concatenate(new_node_ids_parts)
+
+        # Finally add initial nodes as confirmed also match edge + post-node predicates, not just pre-node predicates
+        if first_hop:
+            first_hop = False
+            if not return_as_wave_front:
+                matches_nodes[np.concatenate(src_node_ids_parts)] = True
+
+        unmatched_node_ids = new_node_ids[~matches_nodes[new_node_ids]]
+        if len(unmatched_node_ids) == 0:
+            #fixedpoint, exit early: future will come to same spot!
+            break
+        matches_nodes[unmatched_node_ids] = True
+
+        wave_front = np.unique(new_node_ids[~visited[new_node_ids]])
+
+    #hydrate edges
+    if g2._edge is None:
+        edge_keep = matches_edges
+    else:
+        # match the merge implementation's join on edge id, which also picks up duplicate ids
+        edge_ids = g2._edges[g2._edge]
+        edge_keep = edge_ids.isin(edge_ids.to_numpy()[matches_edges]).to_numpy()
+        if edge_ok is not None:
+            edge_keep = edge_keep & edge_ok
+    g_out = g2.edges(g2._edges[edge_keep].reset_index(drop=True))
+
+    #hydrate nodes
+    if self._nodes is not None:
+        final_nodes = self._nodes[self._nodes[self._node].isin(adj.ids[matches_nodes])].reset_index(drop=True)
+        g_out = g_out.nodes(final_nodes)
+
+    return g_out
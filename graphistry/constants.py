@@ -16,6 +16,8 @@ IMPLICIT_NODE_ID = (
 )
 # for text search db column
 DISTANCE = '_distance'
+QUERY = '_query'  # position of the query in a batch search
+SEARCH_INDEX_TYPES = ['flat', 'ivf', 'hnsw']
 # Scalers
 SCALERS = ['quantile', 'standard', 'kbins', 'robust', 'minmax']
 
@@ -33,6 +35,10 @@ LABEL = "label"
 LABEL_NODES = "node_label"
 LABEL_EDGES = "edge_label"
 
+# umap(sample_size=...): default rows fit, and rows projected per transform batch
+UMAP_FIT_ROWS = 100000
+UMAP_TRANSFORM_ROWS = 100000
+
 # ENGINES
 CUML = 'cuml'
 UMAP_LEARN = 'umap_learn'
@@ -46,8 +52,13 @@ TEST_MASK = "test_mask"
 #   for dirty_cat params
 DIRTY_CAT = "dirty_cat"
 N_TOPICS_DEFAULT = 42
+# featurize(chunk_size=...): rows sampled to fit encoders before transforming all rows in chunks
+FEATURIZE_FIT_ROWS = 100000
 N_TOPICS_TARGET_DEFAULT = 7
 N_HASHERS_DEFAULT = 100
+# featurize(kind='edges') src/dst encoders, and output width of the 'hash' one
+EDGE_ENCODERS = ['onehot', 'hash']
+N_EDGE_HASH_FEATURES_DEFAULT = 256
 
 # scikit-learn params
 SKLEARN = "sklearn"
@@ -55,6 +66,29 @@ SKLEARN = "sklearn"
 # #############################################################
 # Caching and other internals
 CACHE_COERCION_SIZE = 100
+# pandas->arrow memoization: total arrow bytes held, rows hashed for the cheap fingerprint
+CACHE_COERCION_BYTES = 256 << 20
+CACHE_FINGERPRINT_ROWS = 1024
+# optional df.attrs key: when set, trusted instead of a full content hash
+MEMOIZE_VERSION_ATTR = "graphistry_memoize_version"
+# arrow uploads stream record batches of about this many bytes
+UPLOAD_BATCH_BYTES = 16 * 1024 * 1024
+# pooled upload session: keep-alive connections per host, connection retries and backoff seconds
+UPLOAD_POOL_SIZE = 10
+UPLOAD_RETRIES = 3
+UPLOAD_BACKOFF = 0.5
+# upload_compression='auto': rows sampled, and min fraction of bytes a codec must save to be used
+UPLOAD_COMPRESSION_SAMPLE_ROWS = 10000
+UPLOAD_COMPRESSION_MIN_SAVINGS = 0.2
+# sentence-transformer text embeddings: on-disk cache bytes kept, shards per model before compacting,
+# and texts per model.encode() batch
+EMBEDDING_CACHE_BYTES = 4 << 30
+EMBEDDING_CACHE_SHARDS = 32
+EMBEDDING_BATCH_SIZE = 32
+# process-wide registry of loaded text models and fitted encoders: estimated bytes kept
+MODEL_REGISTRY_BYTES = 4 << 30
+# on-disk store of memoized featurize/umap results: bytes kept
+MEMOIZE_STORE_BYTES = 16 << 30
 
 # #############################################################
 # Annoy defaults
@@ -1,5 +1,4 @@
 # classes for converting a dataframe or Graphistry Plottable into a DGL
-from collections import Counter
 from typing import Dict, Optional, TYPE_CHECKING, Tuple
 
 import numpy as np
@@ -16,7 +15,7 @@ from .feature_utils import (
     resolve_y,
 )
 
-from .util import setup_logger
+from .util import factorize_keep_na, setup_logger
 
 
 if TYPE_CHECKING:
@@ -111,7 +110,7 @@ def get_available_devices():
     return device, gpu_ids
 
 
-def reindex_edgelist(df, src, dst):
+def reindex_edgelist(df, src, dst, order_by_count: bool = True):
     """Since DGL needs integer contiguous node labels, this relabels as pre-processing step
 
     :eg
@@ -120,19 +119,33 @@ def reindex_edgelist(df, src, dst):
     :param df: edge dataFrame
     :param src: source column of dataframe
     :param dst: destination column of dataframe
+    :param order_by_count: number nodes from most to least common endpoint, ties by first appearance,
+        else by first appearance only
 
     :returns
-        df, pandas DataFrame with new edges.
+        df, pandas DataFrame with new int64 edges.
         ordered_nodes_dict, dict ordered from most common src and dst nodes.
     """
-    srclist = df[src]
-    dstlist = df[dst]
-    cnt = Counter(
-        pd.concat([srclist, dstlist], axis=0)
-    )  # can also use pd.Factorize but doesn't order by count, which is satisfying
-    ordered_nodes_dict = {k: i for i, (k, c) in enumerate(cnt.most_common())}
-    df[config.SRC] = df[src].apply(lambda x: ordered_nodes_dict[x])
-    df[config.DST] = df[dst].apply(lambda x: ordered_nodes_dict[x])
+    n_edges = len(df)
+    endpoints = pd.concat([df[src], df[dst]], axis=0, ignore_index=True)
+    # missing endpoints are one more node, not a -1 code
+    codes, uniques = factorize_keep_na(endpoints)
+    if order_by_count:
+        # stable sort keeps first-appearance order among equal counts, like Counter.most_common()
+        order = np.argsort(-np.bincount(codes, minlength=len(uniques)), kind="stable")
+        rank = np.empty(len(uniques), dtype=np.int64)
+        rank[order] = np.arange(len(uniques), dtype=np.int64)
+        codes = rank[codes]
+        uniques = uniques.take(order)
+    codes = codes.astype(np.int64, copy=False)
+    nodes = uniques.tolist()
+    missing = np.flatnonzero(endpoints.isna().to_numpy())
+    if len(missing):
+        # factorize reports NaN for the missing node, key it by the value in the data, e.g. None
+        nodes[codes[missing[0]]] = endpoints.iloc[missing[0]]
+    ordered_nodes_dict = dict(zip(nodes, range(len(nodes))))
+    df[config.SRC] = codes[:n_edges]
+    df[config.DST] = codes[n_edges:]
     return df, ordered_nodes_dict
 
 
@@ -152,13 +165,14 @@ def pandas_to_sparse_adjacency(df, src, dst, weight_col):
     # have to reindex to align edge list with range(n_nodes) with new SRC and DST columns
     df, ordered_nodes_dict = reindex_edgelist(df, src, dst)
     
-    eweight = np.array([1] * len(df))
     if weight_col is not None:
         eweight = df[weight_col].values
+    else:
+        eweight = np.ones(len(df), dtype=np.int64)
     
     shape = len(ordered_nodes_dict)
     sp_mat = coo_matrix(
-        (eweight, (df[config.SRC], df[config.DST])), shape=(shape, shape)
+        (eweight, (df[config.SRC].values, df[config.DST].values)), shape=(shape, shape)
     )
     return sp_mat, ordered_nodes_dict
 
@@ -182,8 +196,14 @@ def pandas_to_dgl_graph(
         ordered_nodes_dict: dict ordered from most common src and dst nodes
     """
     _, _, dgl = lazy_dgl_import_has_dependency()  # noqa: F811
+    _, _, torch = lazy_torch_import_has_dependency()  # noqa: F811
     sp_mat, ordered_nodes_dict = pandas_to_sparse_adjacency(df, src, dst, weight_col)
-    g = dgl.from_scipy(sp_mat, device=device)  # there are other ways too
+    # share the reindexed int64 columns with torch instead of converting sp_mat via dgl.from_scipy
+    g = dgl.graph(
+        (torch.from_numpy(df[config.SRC].values), torch.from_numpy(df[config.DST].values)),
+        num_nodes=len(ordered_nodes_dict),
+        device=device,
+    )
     logger.info(f"Graph Type: {type(g)}") 
 
     return g, sp_mat, ordered_nodes_dict
@@ -66,6 +66,62 @@ class EmbedDistScore:
         return -(h * r - t).norm(p=1, dim=1)  # type: ignore
 
 
+def _contains_sorted(sorted_keys: np.ndarray, keys: np.ndarray) -> np.ndarray:
+    pos = np.minimum(np.searchsorted(sorted_keys, keys), max(len(sorted_keys) - 1, 0))
+    return (sorted_keys[pos] == keys) if len(sorted_keys) else np.zeros(len(keys), dtype=bool)
+
+
+def link_candidate_blocks(triplets: np.ndarray, num_nodes: int, block_size: int = 2 ** 20):
+    """
+    Yield int64 (head, relation, tail) arrays of the unseen links predict_links_all() scores, in blocks of about
+    block_size rows, without materializing all of them
+
+    For each (node, relation) seen as the head of an existing triplet, candidates are every higher-id tail
+    not yet linked from it. For each (node, relation) seen as a tail, candidates are every higher-id node
+    not yet linked to it, scored in the (node, relation, higher-id node) direction.
+    """
+    triplets = np.asarray(triplets, dtype=np.int64).reshape(-1, 3)
+    if len(triplets) == 0 or num_nodes < 2:
+        return
+    h, r, t = triplets[:, 0], triplets[:, 1], triplets[:, 2]
+    n_rel = int(r.max()) + 1
+
+    def link_keys(a, rel, b):
+        return (a * n_rel + rel) * num_nodes + b
+
+    existing = np.unique(link_keys(h, r, t))
+    head_pairs, tail_pairs = np.unique(h * n_rel + r), np.unique(t * n_rel + r)
+    anchors = np.union1d(head_pairs, tail_pairs)
+    anchor_nodes, anchor_rels = anchors // n_rel, anchors % n_rel
+    is_head, is_tail = np.isin(anchors, head_pairs), np.isin(anchors, tail_pairs)
+
+    per_block = max(1, block_size // num_nodes)
+    for start in range(0, len(anchors), per_block):
+        a, rel = anchor_nodes[start:start + per_block], anchor_rels[start:start + per_block]
+        counts = num_nodes - 1 - a
+        rows = np.repeat(np.arange(len(a)), counts)
+        if len(rows) == 0:
+            continue
+        # candidate tails a+1 .. num_nodes-1 of each anchor
+        b = a[rows] + 1 + np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+        heads, rels = a[rows], rel[rows]
+        unseen = (is_head[start:start + per_block][rows] & ~_contains_sorted(existing, link_keys(heads, rels, b))) | (
+            is_tail[start:start + per_block][rows] & ~_contains_sorted(existing, link_keys(b, rels, heads))
+        )
+        if unseen.any():
+            yield np.stack([heads[unseen], rels[unseen], b[unseen]], axis=1)
+
+
+def top_k_per_head(triplets: np.ndarray, scores: np.ndarray, k: int, lowest: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """Keep the k highest (or lowest) scoring triplets of each head"""
+    order = np.lexsort((scores if lowest else -scores, triplets[:, 0]))
+    heads = triplets[order, 0]
+    first = np.r_[True, heads[1:] != heads[:-1]]
+    starts = np.maximum.accumulate(np.where(first, np.arange(len(heads)), 0))
+    keep = order[np.arange(len(heads)) - starts < k]
+    return triplets[keep], scores[keep]
+
+
 class HeterographEmbedModuleMixin(MIXIN_BASE):
     def __init__(self):
         super().__init__()
@@ -168,11 +224,13 @@ class HeterographEmbedModuleMixin(MIXIN_BASE):
         return res
 
 
-    def _init_model(self, res, batch_size:int, sample_size:int, num_steps:int, device):
+    def _init_model(self, res, batch_size:int, sample_size:int, num_steps:int, device, num_workers:int = 0):
         _, _, _, _, GraphDataLoader, HeteroEmbed, _, _ = lazy_embed_import_dep()
-        g_iter = SubgraphIterator(res._kg_dgl, sample_size, num_steps)
+        # training uses one subgraph per batch of batch_size steps, so only sample those
+        g_iter = SubgraphIterator(res._kg_dgl, sample_size, -(-num_steps // batch_size))
         g_dataloader = GraphDataLoader(
-            g_iter, batch_size=batch_size, collate_fn=lambda x: x[0]
+            g_iter, batch_size=1, collate_fn=_first,
+            num_workers=num_workers, persistent_workers=num_workers > 0
         )
 
         # init model
@@ -187,10 +245,10 @@ class HeterographEmbedModuleMixin(MIXIN_BASE):
 
         return model, g_dataloader
 
-    def _train_embedding(self, res, epochs:int, batch_size:int, lr:float, sample_size:int, num_steps:int, device) -> Plottable:
+    def _train_embedding(self, res, epochs:int, batch_size:int, lr:float, sample_size:int, num_steps:int, device, num_workers:int = 0) -> Plottable:
         _, torch, nn, _, _, _, _, trange = lazy_embed_import_dep()
         log('Training embedding')
-        model, g_dataloader = res._init_model(res, batch_size, sample_size, num_steps, device)
+        model, g_dataloader = res._init_model(res, batch_size, sample_size, num_steps, device, num_workers)
         if hasattr(res, "_embed_model") and not res._build_new_embedding_model:
             model = res._embed_model
             log("--Reusing previous model")
@@ -254,6 +312,7 @@ class HeterographEmbedModuleMixin(MIXIN_BASE):
         inplace: Optional[bool] = False,
         device: Optional['str'] = "cpu",
         evaluate: bool = True,
+        num_workers: int = 0,
         *args,
         **kwargs,
     ) -> Plottable:
@@ -294,6 +353,8 @@ class HeterographEmbedModuleMixin(MIXIN_BASE):
             accelarator. Defaults to "cpu"
         evaluate : bool
             Whether to evaluate. Defaults to False.
+        num_workers : int
+            background worker processes sampling the next training subgraphs. Defaults to 0 (in-process).
 
         Returns
         -------
@@ -342,7 +403,7 @@ class HeterographEmbedModuleMixin(MIXIN_BASE):
             res = res._preprocess_embedding_data(res, train_split=train_split)  # type: ignore
             res = res._build_graph(res)  # type: ignore
 
-        return res._train_embedding(res, epochs, batch_size, lr=lr, sample_size=sample_size, num_steps=num_steps, device=device)  # type: ignore
+        return res._train_embedding(res, epochs, batch_size, lr=lr, sample_size=sample_size, num_steps=num_steps, device=device, num_workers=num_workers)  # type: ignore
 
 
     def _score_triplets(self, triplets, threshold, anomalous, retain_old_edges, return_dataframe):
@@ -364,12 +425,18 @@ class HeterographEmbedModuleMixin(MIXIN_BASE):
             predicted_links = triplets
             this_score = scores
             
+        return self._links_result(
+            predicted_links, this_score.detach().numpy(), threshold, retain_old_edges, return_dataframe
+        )
+
+    def _links_result(self, predicted_links, this_score, threshold, retain_old_edges, return_dataframe):
+        """Map scored id triplets back to node and relation names, as a dataframe or graph"""
         predicted_links = pd.DataFrame(predicted_links, columns=[self._source, self._relation, self._destination])
         predicted_links[self._source] = predicted_links[self._source].map(self._id2node)
         predicted_links[self._relation] = predicted_links[self._relation].map(self._id2relation)
         predicted_links[self._destination] = predicted_links[self._destination].map(self._id2node)
 
-        predicted_links['score'] = this_score.detach().numpy()
+        predicted_links['score'] = this_score
         predicted_links.sort_values(by='score', ascending=False, inplace=True)
         
         log(f"-- {predicted_links.shape[0]} triplets scored at threshold {threshold:.2f}")
@@ -490,10 +557,15 @@ class HeterographEmbedModuleMixin(MIXIN_BASE):
         threshold: Optional[float] = 0.5,
         anomalous: Optional[bool] = False,
         retain_old_edges: Optional[bool] = False,
-        return_dataframe: Optional[bool] = False
+        return_dataframe: Optional[bool] = False,
+        top_k: Optional[int] = None,
+        block_size: int = 2 ** 20
     ) -> Plottable:  # type: ignore
         """predict_links over entire graph given a threshold
 
+        Candidate links are generated and scored block_size at a time, keeping only hits,
+        so memory is bounded by the block size and the number of hits instead of all candidates
+
         Parameters
         ----------
         threshold : Optional[float]
@@ -504,6 +576,10 @@ class HeterographEmbedModuleMixin(MIXIN_BASE):
             will include old edges in predicted graph. Defaults to False.
         return_dataframe: Optional[bool]
             will return a dataframe instead of a graphistry instance. Defaults to False.
+        top_k: Optional[int]
+            will keep only the k highest scoring links per source node (lowest if anomalous). Defaults to None (all).
+        block_size: int
+            candidate links scored per batch. Defaults to 2 ** 20
 
         Returns
         -------
@@ -511,40 +587,30 @@ class HeterographEmbedModuleMixin(MIXIN_BASE):
             graphistry graph instance containing all predicted/anomalous links or dataframe
 
         """
-        h_r = pd.DataFrame(self._triplets.numpy())  # type: ignore
-        t_r = h_r.copy()
-        t_r[[0,1,2]] = t_r[[2,1,0]]
-
-        all_nodes = set(self._node2id.values())
-
-        def fetch_triplets_for_inference(x_r):
-            existing_collapsed = pd.DataFrame(
-                x_r.groupby(by=[0, 1])[2].apply(set)
-            ).reset_index()
-
-            non_existing_collapsed = existing_collapsed[2].map(lambda x: set(all_nodes).difference(x))
-            triplets_for_inference = pd.concat(
-                [
-                    existing_collapsed[[0, 1]], 
-                    non_existing_collapsed
-                ], axis=1
-            ).explode(2)
-
-            return triplets_for_inference
-
-        triplets = pd.concat([fetch_triplets_for_inference(h_r), fetch_triplets_for_inference(t_r)], axis=0)
-        triplets = triplets[triplets[0] < triplets[2]]
-        triplets = triplets.drop_duplicates().to_numpy().astype(np.int64)
-
-        return self._score_triplets(triplets, threshold, anomalous, retain_old_edges, return_dataframe)
+        hit_triplets = [np.zeros((0, 3), dtype=np.int64)]
+        hit_scores = [np.zeros(0, dtype=np.float32)]
+        num_candidates = 0
+        for block in link_candidate_blocks(self._triplets.numpy(), len(self._node2id), block_size):  # type: ignore
+            num_candidates += len(block)
+            scores = self._score(block).numpy()  # type: ignore
+            hit = scores < threshold if anomalous else scores > threshold
+            hit_triplets.append(block[hit])
+            hit_scores.append(scores[hit])
+            if top_k is not None:
+                kept = top_k_per_head(np.concatenate(hit_triplets), np.concatenate(hit_scores), top_k, bool(anomalous))
+                hit_triplets, hit_scores = [kept[0]], [kept[1]]
+        log(f"{num_candidates} triplets for inference")
+
+        predicted_links, this_score = np.concatenate(hit_triplets), np.concatenate(hit_scores)
+        return self._links_result(predicted_links, this_score, threshold, retain_old_edges, return_dataframe)
         
 
     def _score(self, triplets: Union[np.ndarray, TT]) -> TT:  # type: ignore
         _, torch, _, _, _, _, _, _ = lazy_embed_import_dep()
-        emb = self._kg_embeddings.clone().detach()
         if not isinstance(triplets, torch.Tensor):
             triplets = torch.tensor(triplets)
-        score = self._embed_model.score(emb, triplets)
+        # _kg_embeddings is already detached and score() only gathers rows from it, so no per-call copy
+        score = self._embed_model.score(self._kg_embeddings, triplets)
         prob = torch.sigmoid(score)
         return prob.detach()
 
@@ -559,53 +625,81 @@ class HeterographEmbedModuleMixin(MIXIN_BASE):
             log("WARNING: train_split must be < 1 for _eval()")
 
 
+def _first(batch):
+    return batch[0]
+
+
 class SubgraphIterator:
-    def __init__(self, g, sample_size:int = 3000, num_steps:int = 1000):
+    """
+    Training subgraphs for embed(): each step draws sample_size edges, without replacement within
+    shuffled passes over all edges, plus one corrupted head or tail negative per edge
+
+    Edge ids and negatives are drawn buffer_steps steps at a time in batched tensor ops over edge triplets
+    gathered once, so each step is a slice and one dgl.graph build. Buffers are drawn lazily with torch's
+    RNG, so DataLoader workers each sample their own steps.
+    """
+    def __init__(self, g, sample_size:int = 3000, num_steps:int = 1000, buffer_steps:int = 64):
+        _, torch, _, dgl, _, _, _, _ = lazy_embed_import_dep()
         self.num_steps = num_steps
         self.sample_size = sample_size
-        self.eids = np.arange(g.num_edges())
+        self.buffer_steps = max(1, min(buffer_steps, num_steps))
         self.g = g
         self.num_nodes = g.num_nodes()
+        self.num_edges = g.num_edges()
+        src, dst = g.edges()
+        self._triplets = torch.stack((src.long(), g.edata[dgl.ETYPE].long(), dst.long()), dim=1)
+        self._perm: Any = None  # edge ids left in the current shuffled pass
+        self._buffer: Any = None
+        self._cursor = 0
 
     def __len__(self) -> int:
         return self.num_steps
 
-    def __getitem__(self, i:int):
-        _, torch, nn, dgl, GraphDataLoader, _, F, _ = lazy_embed_import_dep()
-        eids = torch.from_numpy(np.random.choice(self.eids, self.sample_size))
-
-        src, dst = self.g.find_edges(eids)
-        rel = self.g.edata[dgl.ETYPE][eids].numpy()
+    def _next_eids(self, n:int):
+        _, torch, _, _, _, _, _, _ = lazy_embed_import_dep()
+        parts = []
+        while n > 0:
+            if self._perm is None or len(self._perm) == 0:
+                self._perm = torch.randperm(self.num_edges)
+            parts.append(self._perm[:n])
+            self._perm = self._perm[n:]
+            n -= len(parts[-1])
+        return torch.cat(parts)
+
+    def _refill(self):
+        eids = self._next_eids(self.buffer_steps * self.sample_size).view(self.buffer_steps, self.sample_size)
+        positives = self._triplets[eids]
+        self._buffer = (positives, SubgraphIterator._corrupt(positives, self.num_nodes))
+        self._cursor = 0
 
-        triplets = np.stack((src, rel, dst)).T
-        samples, labels = SubgraphIterator._sample_neg(
-            triplets,
-            self.num_nodes,
-        )
+    def __getitem__(self, i:int):
+        _, torch, _, dgl, _, _, _, _ = lazy_embed_import_dep()
+        if self._buffer is None or self._cursor == self.buffer_steps:
+            self._refill()
+        positives, negatives = self._buffer[0][self._cursor], self._buffer[1][self._cursor]
+        self._cursor += 1
 
-        src, rel, dst = samples.T  # type: ignore
+        samples = torch.cat((positives, negatives), dim=0)
+        labels = torch.zeros(len(samples))
+        labels[: len(positives)] = 1
+        src, rel, dst = samples.unbind(1)
 
         sub_g = dgl.graph((src, dst), num_nodes=self.num_nodes)
         sub_g.edata[dgl.ETYPE] = rel
-        sub_g.edata["norm"] = dgl.norm_by_dst(sub_g).unsqueeze(-1)
+        # same as dgl.norm_by_dst: 1 / in-degree of each edge's destination
+        in_degrees = torch.bincount(dst, minlength=self.num_nodes).float()
+        sub_g.edata["norm"] = (1.0 / in_degrees[dst]).unsqueeze(-1)
 
         return sub_g, samples, labels
 
     @staticmethod
-    def _sample_neg(triplets:np.ndarray, num_nodes:int) -> Tuple[TT, TT]:  # type: ignore
+    def _corrupt(triplets:TT, num_nodes:int) -> TT:  # type: ignore
+        """Replace the head or the tail, picked at random, of each (..., 3) triplet by a random node"""
         _, torch, _, _, _, _, _, _ = lazy_embed_import_dep()
-        triplets = torch.tensor(triplets)
-        h, r, t = triplets.T
+        h, r, t = triplets.unbind(-1)  # type: ignore
         h_o_t = torch.randint(high=2, size=h.size())
+        random_nodes = torch.randint(high=num_nodes, size=h.size())
 
-        random_h = torch.randint(high=num_nodes, size=h.size())
-        random_t = torch.randint(high=num_nodes, size=h.size())
-
-        neg_h = torch.where(h_o_t == 0, random_h, h)
-        neg_t = torch.where(h_o_t == 1, random_t, t)
-        neg_triplets = torch.stack((neg_h, r, neg_t), dim=1)
-
-        all_triplets = torch.cat((triplets, neg_triplets), dim=0)
-        labels = torch.zeros((all_triplets.size()[0]))
-        labels[: triplets.shape[0]] = 1
-        return all_triplets, labels
+        neg_h = torch.where(h_o_t == 0, random_nodes, h)
+        neg_t = torch.where(h_o_t == 1, random_nodes, t)
+        return torch.stack((neg_h, r, neg_t), dim=-1)
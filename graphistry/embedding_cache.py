@@ -0,0 +1,294 @@
+import hashlib
+import os
+import threading
+import uuid
+from typing import Any, Dict, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import constants as config
+from .constants import EMBEDDING_BATCH_SIZE, EMBEDDING_CACHE_BYTES, EMBEDDING_CACHE_SHARDS
+from .util import setup_logger
+
+logger = setup_logger(name=__name__, verbose=config.VERBOSE)
+
+
+def text_digests(model_name: str, texts) -> np.ndarray:
+    """Content address of each text for a model: sha1 of model name and text, as 20-byte strings"""
+    prefix = model_name.encode("utf-8") + b"\0"
+    return np.array(
+        [hashlib.sha1(prefix + str(t).encode("utf-8")).digest() for t in texts],
+        dtype="S20"
+    )
+
+
+def _shard_bytes(base: str) -> int:
+    try:
+        return os.path.getsize(base + ".npy") + os.path.getsize(base + ".keys.npy")
+    except FileNotFoundError:
+        return 0
+
+
+class EmbeddingCache:
+    """
+    Content-addressed on-disk cache of text embeddings, shared across processes and sessions
+
+    Each model.encode() miss batch is written as a shard under path/<model>/: an .npy float32 matrix,
+    memory-mapped on read, and its row digests. Shards are indexed in memory as they are written or first seen
+    on disk, and once a model has more than max_shards shards, the smaller half are merged into one.
+    Shards are evicted least-recently-used first, by file access time, once all shards exceed max_bytes.
+    Total bytes are tracked as shards are written, so the directory is only walked when over max_bytes
+    """
+
+    def __init__(self, path: str, max_bytes: int = EMBEDDING_CACHE_BYTES, max_shards: int = EMBEDDING_CACHE_SHARDS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_shards = max_shards
+        self._lock = threading.Lock()
+        # model dir -> digest -> (shard name, row)
+        self._index: Dict[str, Dict[bytes, Tuple[str, int]]] = {}
+        # model dir -> shard name -> rows, for shards already in _index
+        self._shards: Dict[str, Dict[str, int]] = {}
+        # bytes of all shards on disk as of the last walk plus shards written since, None before the first walk
+        self._bytes: Optional[int] = None
+
+    def _model_dir(self, model_name: str) -> str:
+        return os.path.join(self.path, hashlib.sha1(model_name.encode("utf-8")).hexdigest())
+
+    def _forget(self, model_dir: str) -> None:
+        self._index.pop(model_dir, None)
+        self._shards.pop(model_dir, None)
+
+    def _drop_shards(self, model_dir: str, shards: Set[str]) -> None:
+        """Remove deleted shards from the index of model_dir, keeping the rest"""
+        known = self._shards.get(model_dir)
+        if known is not None:
+            for shard in shards:
+                known.pop(shard, None)
+        index = self._index.get(model_dir)
+        if index is not None:
+            self._index[model_dir] = {d: loc for d, loc in index.items() if loc[0] not in shards}
+
+    def _track(self, nbytes: int) -> None:
+        if self._bytes is not None:
+            self._bytes += nbytes
+
+    def _add_shard(self, model_dir: str, shard: str, digests: np.ndarray) -> None:
+        index = self._index.setdefault(model_dir, {})
+        for row, digest in enumerate(digests):
+            index[bytes(digest)] = (shard, row)
+        self._shards.setdefault(model_dir, {})[shard] = len(digests)
+
+    def _scan(self, model_dir: str) -> None:
+        """Index shards written to disk by other processes or sessions since the last scan"""
+        if not os.path.isdir(model_dir):
+            return
+        known = self._shards.setdefault(model_dir, {})
+        self._index.setdefault(model_dir, {})
+        for name in sorted(os.listdir(model_dir)):
+            if not name.endswith(".keys.npy"):
+                continue
+            shard = name[:-len(".keys.npy")]
+            if shard in known or not os.path.exists(os.path.join(model_dir, shard + ".npy")):
+                continue
+            try:
+                digests = np.load(os.path.join(model_dir, name))
+            except FileNotFoundError:  # compacted or evicted meanwhile
+                continue
+            self._add_shard(model_dir, shard, digests)
+
+    def _refresh(self, model_dir: str, digests: np.ndarray) -> Dict[bytes, Tuple[str, int]]:
+        """Index for model_dir, indexing new shards on disk when another process may have added the missing digests"""
+        index = self._index.get(model_dir)
+        if index is None or any(bytes(d) not in index for d in digests):
+            self._scan(model_dir)
+            index = self._index.setdefault(model_dir, {})
+        return index
+
+    def get(self, model_name: str, digests: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Look up embeddings by digest
+
+        :returns: (found mask, embeddings of found digests in order, or None when nothing is found)
+        """
+        model_dir = self._model_dir(model_name)
+        with self._lock:
+            index = self._refresh(model_dir, digests)
+            locs = [index.get(bytes(d)) for d in digests]
+        found = np.array([loc is not None for loc in locs], dtype=bool)
+        if not found.any():
+            return found, None
+
+        shards = pd.Series([loc[0] for loc in locs if loc is not None])
+        rows = np.array([loc[1] for loc in locs if loc is not None], dtype=np.int64)
+        out: Optional[np.ndarray] = None
+        for shard, positions in shards.groupby(shards).indices.items():
+            shard_path = os.path.join(model_dir, f"{shard}.npy")
+            try:
+                values = np.load(shard_path, mmap_mode="r")
+                os.utime(shard_path)
+            except FileNotFoundError:  # compacted or evicted by another process: treat all as misses
+                with self._lock:
+                    self._forget(model_dir)
+                return np.zeros(len(digests), dtype=bool), None
+            if out is None:
+                out = np.empty((len(rows), values.shape[1]), dtype=np.float32)
+            out[positions] = values[rows[positions]]
+        return found, out
+
+    def _write_shard(self, model_dir: str, digests: np.ndarray, embeddings: np.ndarray) -> str:
+        shard = uuid.uuid4().hex
+        # write values before keys so readers never index a shard without values
+        for suffix, arr in [(".npy", np.asarray(embeddings, dtype=np.float32)), (".keys.npy", digests)]:
+            tmp = os.path.join(model_dir, f".{shard}{suffix}.tmp")
+            with open(tmp, "wb") as f:
+                np.save(f, np.ascontiguousarray(arr))
+            os.replace(tmp, os.path.join(model_dir, shard + suffix))
+        return shard
+
+    def _remove_shard(self, base: str) -> int:
+        """Delete a shard, returning the bytes freed"""
+        freed = 0
+        # keys first so readers never index a shard without values
+        for p in [base + ".keys.npy", base + ".npy"]:
+            try:
+                size = os.path.getsize(p)
+                os.remove(p)
+                freed += size
+            except FileNotFoundError:
+                pass
+        return freed
+
+    def set(self, model_name: str, digests: np.ndarray, embeddings: np.ndarray) -> None:
+        """Store embeddings, one row per digest, as a new shard, then compact and evict beyond limits"""
+        if len(digests) == 0:
+            return
+        model_dir = self._model_dir(model_name)
+        os.makedirs(model_dir, exist_ok=True)
+        shard = self._write_shard(model_dir, digests, embeddings)
+        with self._lock:
+            self._add_shard(model_dir, shard, digests)
+            self._track(_shard_bytes(os.path.join(model_dir, shard)))
+            if len(self._shards[model_dir]) > self.max_shards:
+                self.compact(model_dir)
+        self.evict()
+
+    def compact(self, model_dir: str) -> None:
+        """Merge the smaller half of a model's indexed shards into one shard; call with the lock held"""
+        known = self._shards.get(model_dir, {})
+        small = sorted(known, key=lambda shard: known[shard])[:max(2, len(known) // 2)]
+        if len(small) < 2:
+            return
+        keys, values = [], []
+        for shard in small:
+            base = os.path.join(model_dir, shard)
+            try:
+                shard_keys, shard_values = np.load(base + ".keys.npy"), np.load(base + ".npy")
+            except FileNotFoundError:  # compacted or evicted by another process
+                continue
+            keys.append(shard_keys)
+            values.append(shard_values)
+        if len(keys) < len(small):
+            # index entries of the missing shards are stale: rebuild from disk on the next miss
+            self._forget(model_dir)
+        if not keys:
+            return
+        merged = self._write_shard(model_dir, np.concatenate(keys), np.concatenate(values))
+        self._track(_shard_bytes(os.path.join(model_dir, merged)))
+        for shard in small:
+            self._track(-self._remove_shard(os.path.join(model_dir, shard)))
+            self._shards.get(model_dir, {}).pop(shard, None)
+        if model_dir in self._index:
+            self._add_shard(model_dir, merged, np.concatenate(keys))
+        logger.debug(f"Compacted {len(keys)} embedding cache shards into {merged}")
+
+    def evict(self) -> None:
+        """Delete least-recently-used shards, across all models, until the cache holds at most max_bytes"""
+        with self._lock:
+            if self._bytes is not None and self._bytes <= self.max_bytes:
+                return
+        shards = []
+        total = 0
+        for root, _, files in os.walk(self.path):
+            for name in files:
+                if not name.endswith(".keys.npy"):
+                    continue
+                base = os.path.join(root, name[:-len(".keys.npy")])
+                try:
+                    stat = os.stat(base + ".npy")
+                    size = stat.st_size + os.path.getsize(base + ".keys.npy")
+                except FileNotFoundError:
+                    continue
+                shards.append((max(stat.st_atime, stat.st_mtime), base, size))
+                total += size
+        evicted: Dict[str, Set[str]] = {}
+        for _, base, size in sorted(shards):
+            if total <= self.max_bytes:
+                break
+            self._remove_shard(base)
+            total -= size
+            evicted.setdefault(os.path.dirname(base), set()).add(os.path.basename(base))
+            logger.debug(f"Evicted embedding cache shard {base}")
+        with self._lock:
+            self._bytes = total
+            for model_dir, names in evicted.items():
+                self._drop_shards(model_dir, names)
+
+
+_caches: Dict[Tuple[str, int], EmbeddingCache] = {}
+
+
+def get_embedding_cache(path: Optional[str], max_bytes: int = EMBEDDING_CACHE_BYTES) -> Optional[EmbeddingCache]:
+    """Process-wide EmbeddingCache for path, or None when path is None"""
+    if path is None:
+        return None
+    key = (os.path.abspath(path), max_bytes)
+    if key not in _caches:
+        _caches[key] = EmbeddingCache(key[0], max_bytes)
+    return _caches[key]
+
+
+def encode_texts(
+    model: Any,
+    texts,
+    model_name: Optional[str] = None,
+    batch_size: int = EMBEDDING_BATCH_SIZE,
+    cache: Optional[EmbeddingCache] = None
+) -> np.ndarray:
+    """
+    Sentence-transformer embeddings of texts, encoding each distinct text once
+
+    Duplicate texts are encoded once per call. With a cache and model_name, texts embedded by earlier calls,
+    including in other sessions, are read from disk and only the rest are encoded
+
+    :param model: object with encode(texts, batch_size=...) -> 2D array, like SentenceTransformer
+    :param texts: array-like of strings
+    :param model_name: cache namespace, required for cache use
+    :param batch_size: texts per model.encode() batch
+    :param cache: EmbeddingCache, or None for no disk cache
+    """
+    codes, uniques = pd.factorize(pd.Series(np.asarray(texts, dtype=object)).astype(str), sort=False)
+    uniques = np.asarray(uniques, dtype=object)
+
+    if cache is None or model_name is None or len(uniques) == 0:
+        embeddings = np.asarray(model.encode(list(uniques), batch_size=batch_size))
+        return embeddings[codes]
+
+    digests = text_digests(model_name, uniques)
+    found, cached = cache.get(model_name, digests)
+    missing = np.flatnonzero(~found)
+    logger.debug(f"Embedding cache: {found.sum()} hits, {len(missing)} misses of {len(uniques)} distinct texts")
+
+    fresh = None
+    if len(missing):
+        fresh = np.asarray(model.encode(list(uniques[missing]), batch_size=batch_size), dtype=np.float32)
+        cache.set(model_name, digests[missing], fresh)
+
+    dim = (cached if cached is not None else fresh).shape[1]  # type: ignore
+    embeddings = np.empty((len(uniques), dim), dtype=np.float32)
+    if cached is not None:
+        embeddings[found] = cached
+    if fresh is not None:
+        embeddings[missing] = fresh
+    return embeddings[codes]
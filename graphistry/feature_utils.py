@@ -2,6 +2,8 @@ import copy
 import numpy as np
 import os
 import pandas as pd
+import tempfile
+import weakref
 from time import time
 from inspect import getmodule
 import warnings
@@ -23,8 +25,9 @@ from typing_extensions import Literal  # Literal native to py3.8+
 from graphistry.compute.ComputeMixin import ComputeMixin
 from . import constants as config
 from .PlotterBase import WeakValueDictionary, Plottable
-from .util import setup_logger, check_set_memoize
+from .util import setup_logger, check_set_memoize, memoize_hash
 from .ai_utils import infer_graph, infer_self_graph
+from .model_registry import MODEL_REGISTRY, fit_fingerprint
 
 # add this inside classes and have a method that can set log level
 logger = setup_logger(name=__name__, verbose=config.VERBOSE)
@@ -626,13 +629,60 @@ def fit_pipeline(
     columns = X.columns
     index = X.index
 
-    X = transformer.fit_transform(X)
+    if isinstance(transformer, SparseColumnScaler):
+        X = transformer.fit_transform(X)
+        if keep_n_decimals and transformer.dense_columns:
+            X[transformer.dense_columns] = X[transformer.dense_columns].round(keep_n_decimals)
+        return X
+
+    X = transformer.fit_transform(densify(X))
     if keep_n_decimals:
         X = np.round(X, decimals=keep_n_decimals)  #  type: ignore  # noqa
 
     return pd.DataFrame(X, columns=columns, index=index)
 
 
+class SparseColumnScaler:
+    """Scales dense columns with a preprocessing pipeline and pandas sparse columns, such as one-hot
+    and ngram blocks, with a MaxAbsScaler, which keeps zeros at zero, so they stay sparse"""
+
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+        self.sparse_scaler = None
+        self.dense_columns: List = []
+        self.sparse_columns: List = []
+
+    def fit(self, X: pd.DataFrame, y=None) -> "SparseColumnScaler":
+        from sklearn.preprocessing import MaxAbsScaler
+        is_sparse = np.array([isinstance(dt, pd.SparseDtype) for dt in X.dtypes], dtype=bool)
+        self.dense_columns = list(X.columns[~is_sparse])
+        self.sparse_columns = list(X.columns[is_sparse])
+        if self.dense_columns:
+            self.pipeline.fit(X[self.dense_columns])
+        if self.sparse_columns:
+            self.sparse_scaler = MaxAbsScaler().fit(self._sparse_input(X))
+        return self
+
+    def _sparse_input(self, X: pd.DataFrame):
+        import scipy.sparse
+        S = to_model_input(X[self.sparse_columns])
+        return S if scipy.sparse.issparse(S) else scipy.sparse.csr_matrix(S.to_numpy(dtype=np.float64))
+
+    def transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        parts = []
+        if self.dense_columns:
+            dense = densify(X[self.dense_columns])
+            parts.append(pd.DataFrame(self.pipeline.transform(dense), columns=self.dense_columns, index=X.index))
+        if self.sparse_columns:
+            assert self.sparse_scaler is not None
+            S = self.sparse_scaler.transform(self._sparse_input(X))
+            parts.append(make_sparse_frame(S, self.sparse_columns, X.index))
+        return pd.concat(parts, axis=1)[list(X.columns)]
+
+    def fit_transform(self, X: pd.DataFrame, y=None) -> pd.DataFrame:
+        return self.fit(X).transform(X)
+
+
 def impute_and_scale_df(
     df: pd.DataFrame,
     use_scaler: str = "robust",
@@ -656,6 +706,8 @@ def impute_and_scale_df(
         encode=encode,
         strategy=strategy,
     )
+    if has_sparse_columns(df):
+        transformer = SparseColumnScaler(transformer)
     res = fit_pipeline(df, transformer, keep_n_decimals=keep_n_decimals)
 
     return res, transformer
@@ -694,6 +746,23 @@ def _get_sentence_transformer_headers(emb, text_cols):
     return [f"{'_'.join(text_cols)}_{k}" for k in range(emb.shape[1])]
 
 
+def _encode_sentences(model, texts) -> np.ndarray:
+    """Encode texts once per distinct text, in batches, through the configured on-disk embedding cache"""
+    from .embedding_cache import encode_texts, get_embedding_cache
+    from .pygraphistry import PyGraphistry
+
+    cache = get_embedding_cache(
+        PyGraphistry.embedding_cache_dir(), PyGraphistry.embedding_cache_bytes()
+    )
+    return encode_texts(
+        model,
+        texts,
+        model_name=getattr(model, "graphistry_model_name", None),
+        batch_size=PyGraphistry.embedding_batch_size(),
+        cache=cache,
+    )
+
+
 def encode_textual(
     df: pd.DataFrame,
     min_words: float = 2.5,
@@ -709,11 +778,12 @@ def encode_textual(
     text_cols = get_textual_columns(
         df, min_words=min_words
     )
-    embeddings = (
+    embeddings: Any = (
         []
     )  # np.zeros((len(df), 1)) just a placeholder so we can use np.c_
     transformed_columns = []
     model = None
+    sparse_res = None  # ngram tf-idf features, kept sparse
     if text_cols:
         res = concat_text(df, text_cols)
         if use_ngrams:
@@ -722,12 +792,17 @@ def encode_textual(
                 f"-Calculating Tfidf Vectorizer with"
                 f" {ngram_range}-ngrams for column(s) `{text_cols}`"
             )
-            embeddings = make_array(model.fit_transform(res))
-            transformed_columns = list(model[0].vocabulary_.keys())
+            sparse_res = make_sparse_frame(
+                model.fit_transform(res), list(model[0].get_feature_names_out()), df.index
+            )
         else:
-            model_name = os.path.split(model_name)[-1]
-            model = SentenceTransformer(f"{model_name}")
-            embeddings = model.encode(res.values)
+            # registry and embedding cache are keyed by the full name, so local models sharing a basename stay apart
+            model = MODEL_REGISTRY.get_or_load(
+                ("sentence-transformer", model_name),
+                partial(SentenceTransformer, f"{os.path.split(model_name)[-1]}")
+            )
+            model.graphistry_model_name = model_name  # embedding cache namespace for transform_text
+            embeddings = _encode_sentences(model, res.values)
             transformed_columns = _get_sentence_transformer_headers(
                 embeddings, text_cols
             )
@@ -735,6 +810,9 @@ def encode_textual(
             f"Encoded Textual Data using {model} at "
             f"{len(df) / ((time() - t) / 60):.2f} rows per minute"
         )
+    if sparse_res is not None:
+        return sparse_res, text_cols, model
+
     res = pd.DataFrame(embeddings,
                        columns=transformed_columns,
                        index=df.index)
@@ -804,6 +882,52 @@ def make_array(X):
     return X
 
 
+def make_sparse_frame(X, columns, index) -> pd.DataFrame:
+    """Wrap a scipy.sparse matrix as a DataFrame of pandas sparse columns, without densifying"""
+    import scipy.sparse
+    return pd.DataFrame.sparse.from_spmatrix(  # type: ignore
+        scipy.sparse.csc_matrix(X, dtype=np.float64), index=index, columns=columns
+    )
+
+
+def has_sparse_columns(X) -> bool:
+    return isinstance(X, pd.DataFrame) and any(isinstance(dt, pd.SparseDtype) for dt in X.dtypes)
+
+
+def _sparse_runs(X: pd.DataFrame):
+    """(start, end, is_sparse) for runs of consecutive sparse or dense columns, in column order"""
+    is_sparse = np.array([isinstance(dt, pd.SparseDtype) for dt in X.dtypes])
+    starts = np.flatnonzero(np.r_[True, is_sparse[1:] != is_sparse[:-1]])
+    ends = np.r_[starts[1:], len(is_sparse)]
+    return [(start, end, is_sparse[start]) for start, end in zip(starts, ends)]
+
+
+def densify(X):
+    """Dense copy of a DataFrame with pandas sparse columns, else X as-is"""
+    if not has_sparse_columns(X):
+        return X
+    logger.debug("Turning sparse columns into dense")
+    parts = [
+        X.iloc[:, start:end].sparse.to_dense() if is_sparse else X.iloc[:, start:end]
+        for start, end, is_sparse in _sparse_runs(X)
+    ]
+    return pd.concat(parts, axis=1)
+
+
+def to_model_input(X):
+    """scipy CSR matrix for a DataFrame with pandas sparse columns, so umap-learn and
+    scikit-learn consume sparse features without densifying them, else X as-is"""
+    if not has_sparse_columns(X):
+        return X
+    import scipy.sparse
+    parts = [
+        X.iloc[:, start:end].sparse.to_coo() if is_sparse
+        else scipy.sparse.coo_matrix(X.iloc[:, start:end].to_numpy(dtype=np.float64))
+        for start, end, is_sparse in _sparse_runs(X)
+    ]
+    return scipy.sparse.hstack(parts, format="csr", dtype=np.float64)
+
+
 def passthrough_df_cols(
     df, columns
 ):  # if lambdas, won't pickle in FunctionTransformer
@@ -855,6 +979,7 @@ def process_dirty_dataframes(
     similarity: Optional[str] = None,  # "ngram",
     categories: Optional[str] = "auto",
     multilabel: bool = False,
+    n_jobs: Optional[int] = None,
 ) -> Tuple[
     pd.DataFrame,
     Optional[pd.DataFrame],
@@ -877,6 +1002,8 @@ def process_dirty_dataframes(
     :param similarity: one of 'ngram', 'levenshtein-ratio', 'jaro',
             or'jaro-winkler'}) – The type of pairwise string similarity
             to use. If None or False, uses a SuperVectorizer
+    :param n_jobs: worker processes fitting SuperVectorizer column groups
+            concurrently, -1 for all cores, default None for serial
     :return: Encoded data matrix and target (if not None),
             the data encoder, and the label encoder.
     """
@@ -893,6 +1020,7 @@ def process_dirty_dataframes(
             #  since -- AttributeError: Transformer numeric
             #  (type StandardScaler)
             #  does not provide get_feature_names.
+            n_jobs=n_jobs,
         )
 
         logger.info(":: Encoding DataFrame might take a few minutes ------")
@@ -947,6 +1075,7 @@ def process_dirty_dataframes(
             else SimilarityEncoder(
                 similarity=similarity, categories=categories, n_prototypes=2
             ),  # Similarity
+            n_jobs=n_jobs,
         )
 
         y_enc = label_encoder.fit_transform(y)
@@ -1011,7 +1140,8 @@ def process_nodes_dataframes(
     encode: str = "ordinal",
     strategy: str = "uniform",
     keep_n_decimals: int = 5,
-    feature_engine: FeatureEngineConcrete = "pandas"
+    feature_engine: FeatureEngineConcrete = "pandas",
+    n_jobs: Optional[int] = None,
     # test_size: Optional[bool] = None,
 ) -> Tuple[
     pd.DataFrame,
@@ -1044,6 +1174,9 @@ def process_nodes_dataframes(
     :param model_name: SentenceTransformer model name. See available list at
             https://www.sbert.net/docs/pretrained_models.
             html#sentence-embedding-models
+    :param n_jobs: worker processes for column encoders, -1 for all cores.
+            Above 1, text columns are embedded concurrently with the other columns.
+            Default None reads PyGraphistry.featurize_n_jobs()
 
     :return: X_enc, y_enc, data_encoder, label_encoder,
         scaling_pipeline,
@@ -1093,12 +1226,32 @@ def process_nodes_dataframes(
     if len(df) == 0 or df.empty:
         logger.warning("DataFrame **seems** to be Empty")
 
+    if n_jobs is None:
+        from .pygraphistry import PyGraphistry
+        n_jobs = PyGraphistry.featurize_n_jobs()
+
+    def encode_other_columns(text_cols):
+        other_df = df.drop(columns=text_cols, errors="ignore")  # type: ignore
+        return process_dirty_dataframes(
+            other_df,
+            y,
+            cardinality_threshold=cardinality_threshold,
+            cardinality_threshold_target=cardinality_threshold_target,
+            n_topics=n_topics,
+            n_topics_target=n_topics_target,
+            similarity=similarity,
+            categories=categories,
+            multilabel=multilabel,
+            n_jobs=n_jobs,
+        )
+
     text_cols: List[str] = []
     text_model: Any = None
     text_enc = pd.DataFrame([])
     has_deps_text, import_text_exn, _ = lazy_import_has_dependancy_text()
     if has_deps_text and (feature_engine in ["torch", "auto"]):
-        text_enc, text_cols, text_model = encode_textual(
+        encode_text = partial(
+            encode_textual,
             df,
             min_words=min_words,
             model_name=model_name,
@@ -1107,25 +1260,24 @@ def process_nodes_dataframes(
             max_df=max_df,
             min_df=min_df,
         )
+        if n_jobs == 1:
+            text_enc, text_cols, text_model = encode_text()
+            X_enc, y_enc, data_encoder, label_encoder = encode_other_columns(text_cols)
+        else:
+            # text and other column groups are independent: embed text while the column encoders fit
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                text_future = pool.submit(encode_text)
+                X_enc, y_enc, data_encoder, label_encoder = encode_other_columns(
+                    get_textual_columns(df, min_words=min_words)
+                )
+                text_enc, text_cols, text_model = text_future.result()
     else:
         logger.debug(
             "! Skipping encoding any textual features"
             f"since dependency {import_text_exn} is not met"
         )
-
-    other_df = df.drop(columns=text_cols, errors="ignore")  # type: ignore
-
-    X_enc, y_enc, data_encoder, label_encoder = process_dirty_dataframes(
-        other_df,
-        y,
-        cardinality_threshold=cardinality_threshold,
-        cardinality_threshold_target=cardinality_threshold_target,
-        n_topics=n_topics,
-        n_topics_target=n_topics_target,
-        similarity=similarity,
-        categories=categories,
-        multilabel=multilabel
-    )
+        X_enc, y_enc, data_encoder, label_encoder = encode_other_columns(text_cols)
 
     if embedding:
         data_encoder = Embedding(df)
@@ -1228,34 +1380,94 @@ def encode_multi_target(ydf, mlb = None):
  
     return T, label_encoder
 
+class EdgeHashEncoder:
+    """Fixed-width edge encoder: hashes source and destination ids into n_features signed buckets.
+
+    Unlike the MultiLabelBinarizer one-hot encoding, the width does not grow with the number of
+    nodes, and unseen nodes at transform time still get a feature instead of being dropped.
+    Like it, a node adds the same feature whether it is the source or the destination.
+    """
+
+    def __init__(self, n_features: int = config.N_EDGE_HASH_FEATURES_DEFAULT):
+        if n_features < 1:
+            raise ValueError(f"n_features must be positive, got {n_features}")
+        self.n_features = n_features
+        self.columns_: List[str] = []
+
+    def _hash(self, ids: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+        # stringify so ids hash the same whether read as ints or strings
+        h = pd.util.hash_array(ids.astype(str).to_numpy(dtype=object), categorize=True)
+        buckets = (h % np.uint64(self.n_features)).astype(np.int64)
+        signs = np.where(h >> np.uint64(63), -1.0, 1.0)  # alternate signs so collisions cancel on average
+        return buckets, signs
+
+    def fit(self, source: pd.Series, destination: pd.Series) -> "EdgeHashEncoder":
+        return self
+
+    def transform(self, source: pd.Series, destination: pd.Series):
+        import scipy.sparse
+        n = len(source)
+        src_buckets, src_signs = self._hash(source)
+        dst_buckets, dst_signs = self._hash(destination)
+        dst_signs[source.to_numpy() == destination.to_numpy()] = 0.0  # self-loops count their node once
+        rows = np.arange(n)
+        return scipy.sparse.csr_matrix(
+            (np.r_[src_signs, dst_signs], (np.r_[rows, rows], np.r_[src_buckets, dst_buckets])),
+            shape=(n, self.n_features)
+        )
+
+    def fit_transform(self, source: pd.Series, destination: pd.Series):
+        return self.fit(source, destination).transform(source, destination)
+
+    def get_feature_names_out(self) -> List[str]:
+        return [f"edge_hash_{i}" for i in range(self.n_features)]
+
+    def __repr__(self):
+        return f"EdgeHashEncoder(n_features={self.n_features})"
+
+
+def get_edge_encoder(edge_encoder: str = "onehot", n_edge_features: int = config.N_EDGE_HASH_FEATURES_DEFAULT):
+    """Unfitted src/dst pair encoder for encode_edges, one of `config.EDGE_ENCODERS`"""
+    if edge_encoder == "onehot":
+        from sklearn.preprocessing import MultiLabelBinarizer
+        return MultiLabelBinarizer(sparse_output=True)
+    if edge_encoder == "hash":
+        return EdgeHashEncoder(n_features=n_edge_features)
+    raise ValueError(f"edge_encoder must be one of {config.EDGE_ENCODERS}, got {edge_encoder}")
+
+
 def encode_edges(edf, src, dst, mlb, fit=False):
-    """edge encoder -- creates multilabelBinarizer on edge pairs.
+    """edge encoder -- creates multilabelBinarizer or EdgeHashEncoder features on edge pairs.
 
     Args:
         edf (pd.DataFrame): edge dataframe
         src (string): source column
         dst (string): destination column
-        mlb (sklearn): multilabelBinarizer
+        mlb (sklearn): multilabelBinarizer or EdgeHashEncoder
         fit (bool, optional): If true, fits multilabelBinarizer. Defaults to False.
 
-    :Returns: tuple: pd.DataFrame, multilabelBinarizer
+    :Returns: tuple: pd.DataFrame, multilabelBinarizer or EdgeHashEncoder
     """
     # uses mlb with fit=T/F so we can use it in transform mode
     # to recreate edge feature concat definition
     source = edf[src]
     destination = edf[dst]
-    logger.debug("Encoding Edges using MultiLabelBinarizer")
-    if fit:
-        T = mlb.fit_transform(zip(source, destination))
+    if isinstance(mlb, EdgeHashEncoder):
+        logger.debug("Encoding Edges using EdgeHashEncoder")
+        T = mlb.fit_transform(source, destination) if fit else mlb.transform(source, destination)
+        columns = mlb.get_feature_names_out()
     else:
-        T = mlb.transform(zip(source, destination))
-    T = 1.0 * T  # coerce to float
-    columns = [
-        str(k) for k in mlb.classes_
-    ]  # stringify the column names or scikits.base throws error
-    mlb.get_feature_names_out = callThrough(columns)
+        logger.debug("Encoding Edges using MultiLabelBinarizer")
+        if fit:
+            T = mlb.fit_transform(zip(source, destination))
+        else:
+            T = mlb.transform(zip(source, destination))
+        columns = [
+            str(k) for k in mlb.classes_
+        ]  # stringify the column names or scikits.base throws error
+        mlb.get_feature_names_out = callThrough(columns)
     mlb.columns_ = [src, dst]
-    T = pd.DataFrame(T, columns=columns, index=edf.index)
+    T = make_sparse_frame(T, columns, edf.index)  # one column per node, so stays sparse
     logger.info(f"Shape of Edge Encoding: {T.shape}")
     return T, mlb
 
@@ -1289,6 +1501,8 @@ def process_edge_dataframes(
     strategy: str = "uniform",
     keep_n_decimals: int = 5,
     feature_engine: FeatureEngineConcrete = "pandas",
+    edge_encoder: str = "onehot",
+    n_edge_features: int = config.N_EDGE_HASH_FEATURES_DEFAULT,
 ) -> Tuple[
     pd.DataFrame,
     pd.DataFrame,
@@ -1302,7 +1516,7 @@ def process_edge_dataframes(
     List[str],
 ]:
     """
-        Custom Edge-record encoder. Uses a MultiLabelBinarizer
+        Custom Edge-record encoder. Uses a MultiLabelBinarizer (or EdgeHashEncoder)
         to generate a src/dst vector
         and then process_textual_or_other_dataframes that encodes any
         other data present in edf,
@@ -1314,18 +1528,18 @@ def process_edge_dataframes(
     :param dst: destination column to select in edf
     :param use_scaler: None or string in
         ['minmax', 'standard', 'robust', 'quantile']
+    :param edge_encoder: src/dst encoder, 'onehot' for one column per node,
+        or 'hash' for n_edge_features hashed columns
+    :param n_edge_features: number of columns of the 'hash' edge_encoder
 
     :return: Encoded data matrix and target (if not None), the data encoders, and the label encoder.
     """
     lazy_import_has_min_dependancy()
-    from sklearn.preprocessing import (
-        MultiLabelBinarizer,
-    )
     logger.info("process_edges_dataframes[%s]", feature_engine)
 
     t = time()
-    mlb_pairwise_edge_encoder = (
-        MultiLabelBinarizer()
+    mlb_pairwise_edge_encoder = get_edge_encoder(
+        edge_encoder, n_edge_features
     )  # create new one so we can use encode_edges later in
     # transform with fit=False
     T, mlb_pairwise_edge_encoder = encode_edges(
@@ -1472,19 +1686,17 @@ def transform_text(
     logger.debug("Transforming text using:")
     if isinstance(text_model, Pipeline):
         logger.debug(f"--Ngram tfidf {text_model}")
-        tX = text_model.transform(df)
-        tX = make_array(tX)
-        tX = pd.DataFrame(
-            tX,
-            columns=list(text_model[0].vocabulary_.keys()),
-            index=df.index
-            )
+        tX = make_sparse_frame(
+            text_model.transform(df),
+            list(text_model[0].get_feature_names_out()),
+            df.index
+        )
     elif isinstance(text_model, SentenceTransformer):
         logger.debug(f"--HuggingFace Transformer {text_model}")
-        tX = text_model.encode(df.values)
+        embeddings = _encode_sentences(text_model, df.values)
         tX = pd.DataFrame(
-            tX,
-            columns=_get_sentence_transformer_headers(tX, text_cols),
+            embeddings,
+            columns=_get_sentence_transformer_headers(embeddings, text_cols),
             index=df.index,
         )
     else:
@@ -1720,8 +1932,14 @@ class FastEncoder:
     def _transform_scaled(self, df, ydf, scaling_pipeline, scaling_pipeline_target):
         """Transform with scaling fit durning fit."""
         X, y = transform(df, ydf, self.res, self.kind, self.src, self.dst)
+        return self._scale_transformed(X, y, scaling_pipeline, scaling_pipeline_target)
+
+    def _scale_transformed(self, X, y, scaling_pipeline, scaling_pipeline_target):
         if scaling_pipeline is not None and not X.empty:
-            X = pd.DataFrame(scaling_pipeline.transform(X), columns=X.columns, index=X.index)
+            if isinstance(scaling_pipeline, SparseColumnScaler):
+                X = scaling_pipeline.transform(X)
+            else:
+                X = pd.DataFrame(scaling_pipeline.transform(densify(X)), columns=X.columns, index=X.index)
         if scaling_pipeline_target is not None and y is not None and not y.empty:
             y = pd.DataFrame(scaling_pipeline_target.transform(y), columns=y.columns, index=y.index)
         return X, y
@@ -1832,7 +2050,7 @@ def prune_weighted_edges_df_and_relabel_nodes(
 
 
 def reuse_featurization(
-    g: Plottable, memoize: bool, metadata: Any
+    g: Plottable, memoize: bool, metadata: Any, hashed: Optional[str] = None
 ):  # noqa: C901
     return check_set_memoize(
         g,
@@ -1840,8 +2058,153 @@ def reuse_featurization(
         attribute="_feat_param_to_g",
         name="featurize",
         memoize=memoize,
+        hashed=hashed,
     )
 
+def encoder_slim(encoder: "FastEncoder") -> "FastEncoder":
+    """Copy of a fitted FastEncoder holding only its fitted encoders and pipelines, without input data or features"""
+    slim = copy.copy(encoder)
+    slim._df = encoder._df.iloc[:0]
+    slim._y = encoder._y.iloc[:0]
+    slim.X = slim.y = slim.X_orignal = slim.y_orignal = None
+    slim.res = [None] * 4 + list(encoder.res[4:])
+    return slim
+
+
+def encoder_with_features(slim: "FastEncoder", X: pd.DataFrame, y: Optional[pd.DataFrame]) -> "FastEncoder":
+    """Copy of a slim fitted FastEncoder with the features of X, y, computed by transform instead of refitting"""
+    encoder = copy.copy(slim)
+    encoder._df = X
+    encoder._y = pd.DataFrame([], index=X.index) if y is None else y
+    has_y = len(encoder._y.columns) > 0
+    X_raw, y_raw = encoder.transform(X, encoder._y if has_y else None)
+    X_enc, y_enc = encoder._scale_transformed(
+        X_raw, y_raw, encoder.scaling_pipeline, encoder.scaling_pipeline_target
+    )
+    encoder.X_orignal, encoder.y_orignal, encoder.X, encoder.y = X_raw, y_raw, X_enc, y_enc
+    encoder.res = [X_raw, y_raw, X_enc, y_enc] + list(slim.res[4:])
+    return encoder
+
+
+def encoder_to_artifacts(encoder: "FastEncoder") -> Dict[str, Any]:
+    """Split a fitted FastEncoder into its feature frames, stored as Arrow, and the pickled fitted encoders"""
+    return {
+        "encoder": encoder_slim(encoder),
+        "X": encoder.X,
+        "y": encoder.y,
+        "X_raw": encoder.X_orignal,
+        "y_raw": encoder.y_orignal,
+    }
+
+
+def encoder_from_artifacts(artifacts: Dict[str, Any]) -> "FastEncoder":
+    encoder = artifacts["encoder"]
+    encoder.X, encoder.y = artifacts["X"], artifacts["y"]
+    encoder.X_orignal, encoder.y_orignal = artifacts["X_raw"], artifacts["y_raw"]
+    encoder.res = [encoder.X_orignal, encoder.y_orignal, encoder.X, encoder.y] + list(encoder.res[4:])
+    return encoder
+
+
+def fit_encoder(
+    X: pd.DataFrame, y: pd.DataFrame, kind: str, key: Optional[str], **kwargs
+) -> "FastEncoder":
+    """Fit a FastEncoder, or reuse one fit under the same key, a fit_fingerprint() of the featurize metadata,
+    from the process-wide MODEL_REGISTRY, else from the on-disk PyGraphistry.memoize_store_dir() store.
+    A None key disables reuse
+
+    The registry keeps only the fitted encoders (encoder_slim()), so a registry hit recomputes features by transform"""
+    from .artifact_store import configured_artifact_store
+
+    slim = MODEL_REGISTRY.get(key) if key is not None else None
+    if slim is not None:
+        logger.info(f"--- [[ RE-USING REGISTERED {kind.upper()} ENCODER ]]")
+        return encoder_with_features(slim, X, y)
+    store = configured_artifact_store() if key is not None else None
+    artifacts = store.get(key) if store is not None else None  # type: ignore
+    if artifacts is not None:
+        logger.info(f"--- [[ RE-USING STORED {kind.upper()} ENCODER ]]")
+        encoder = encoder_from_artifacts(artifacts)
+    else:
+        encoder = FastEncoder(X, y, kind=kind)
+        encoder.fit(**kwargs)
+        if store is not None:
+            try:
+                store.put(key, encoder_to_artifacts(encoder))  # type: ignore
+            except Exception as e:  # e.g. disk full or an unpicklable model: memoization is best-effort
+                logger.warning(f"Could not store fitted {kind} encoder: {e}")
+    if key is not None:
+        MODEL_REGISTRY.put(key, encoder_slim(encoder))
+    return encoder
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def fit_transform_chunked(
+    X: pd.DataFrame,
+    y: pd.DataFrame,
+    kind: str,
+    chunk_size: int,
+    fit_sample_size: int = config.FEATURIZE_FIT_ROWS,
+    features_path: Optional[str] = None,
+    src=None,
+    dst=None,
+    **kwargs
+) -> Tuple["FastEncoder", pd.DataFrame, pd.DataFrame]:
+    """Fit a FastEncoder on sampled rows, then transform and scale all rows chunk_size at a time
+
+    Chunks are written into a column-major .npy file at features_path, so peak memory is about one chunk
+    of encoded rows. The returned features are a dataframe over a copy-on-write memory map of that file,
+    paged in from disk on use. Targets are kept in memory. When features_path is None, a temporary file
+    is used and removed once the features are garbage collected.
+
+    :returns: (encoder, features, targets)
+    """
+    n = len(X)
+    rows = np.sort(np.random.default_rng(0).choice(n, size=min(fit_sample_size, n), replace=False))
+    encoder = FastEncoder(X.iloc[rows], y.iloc[rows], kind=kind)
+    encoder.fit(src=src, dst=dst, **kwargs)
+
+    columns = encoder.X.columns
+    dtype = np.result_type(*[getattr(dt, 'subtype', dt) for dt in encoder.X.dtypes]) if len(columns) else np.float64
+    is_temp = features_path is None
+    if features_path is None:
+        fd, features_path = tempfile.mkstemp(prefix="graphistry_features_", suffix=".npy")
+        os.close(fd)
+    try:
+        out = np.lib.format.open_memmap(
+            features_path, mode="w+", dtype=dtype, shape=(n, len(columns)), fortran_order=True
+        )
+        has_y = y is not None and len(y.columns) > 0
+        y_parts = []
+        for start in range(0, n, chunk_size):
+            X_chunk, y_chunk = encoder.transform_scaled(
+                X.iloc[start:start + chunk_size], y.iloc[start:start + chunk_size] if has_y else None
+            )
+            out[start:start + len(X_chunk)] = X_chunk[columns].to_numpy(dtype=dtype)
+            if has_y:
+                y_parts.append(y_chunk)
+            logger.info(f"-Featurized rows {start:,} to {start + len(X_chunk):,} of {n:,}")
+        out.flush()
+        del out
+    except Exception:
+        if is_temp:
+            _remove_file(features_path)
+        raise
+
+    features = np.load(features_path, mmap_mode="c")
+    if is_temp:
+        # temp file lives as long as the memory map; views such as X_enc keep it alive
+        weakref.finalize(features, _remove_file, features_path)
+    X_enc = pd.DataFrame(features, columns=columns, index=X.index, copy=False)
+    y_enc = pd.concat(y_parts) if has_y else y
+    return encoder, X_enc, y_enc
+
+
 def get_matrix_by_column_part(X: pd.DataFrame, column_part: str) -> pd.DataFrame:
     """Get the feature matrix by column part existing in column names."""
     transformed_columns = X.columns[X.columns.map(lambda x: True if column_part in x else False)]  # type: ignore
@@ -1929,6 +2292,9 @@ class FeatureMixin(MIXIN_BASE):
         keep_n_decimals: int = 5,
         remove_node_column: bool = True,
         feature_engine: FeatureEngineConcrete = "pandas",
+        chunk_size: Optional[int] = None,
+        fit_sample_size: int = config.FEATURIZE_FIT_ROWS,
+        features_path: Optional[str] = None,
         memoize: bool = True,
         verbose: bool = False,
     ):
@@ -1999,7 +2365,10 @@ class FeatureMixin(MIXIN_BASE):
             "nodes": fkwargs,
         }
 
-        old_res = reuse_featurization(res, memoize, fkwargs)
+        memoize = memoize and chunk_size is None
+        # hash the input frames once, for in-memory reuse and the fitted encoder key
+        hashed = memoize_hash(fkwargs) if memoize else None
+        old_res = reuse_featurization(res, memoize, fkwargs, hashed)
         if old_res:
             print("--- [[ RE-USING NODE FEATURIZATION ]]") if verbose else None
             logger.info("--- [[ RE-USING NODE FEATURIZATION ]]")
@@ -2022,15 +2391,21 @@ class FeatureMixin(MIXIN_BASE):
         print('-' * 80) if verbose else None
         print("** Featuring nodes") if verbose else None
         # ############################################################
-        encoder = FastEncoder(X_resolved, y_resolved, kind="nodes")
-        encoder.fit(**nfkwargs)
+        if chunk_size is not None:
+            encoder, X_enc, y_enc = fit_transform_chunked(
+                X_resolved, y_resolved, "nodes", chunk_size, fit_sample_size, features_path, **nfkwargs
+            )
+        else:
+            fit_key = fit_fingerprint("featurize-nodes", hashed=hashed) if hashed is not None else None
+            encoder = fit_encoder(X_resolved, y_resolved, "nodes", fit_key, **nfkwargs)
+            X_enc, y_enc = encoder.X, encoder.y
         # ###########################################################
 
         # if changing, also update fresh_res
-        res._node_features = encoder.X
-        res._node_features_raw = encoder.X_orignal  # .copy()
-        res._node_target = encoder.y
-        res._node_target_raw = encoder.y_orignal  # .copy()
+        res._node_features = X_enc
+        res._node_features_raw = encoder.X_orignal if chunk_size is None else None  # .copy()
+        res._node_target = y_enc
+        res._node_target_raw = encoder.y_orignal if chunk_size is None else None  # .copy()
         res._node_encoder = encoder  # now this does
         # all the work `._node_encoder.transform(df, y)` etc
 
@@ -2064,6 +2439,11 @@ class FeatureMixin(MIXIN_BASE):
         strategy: str = "uniform",
         keep_n_decimals: int = 5,
         feature_engine: FeatureEngineConcrete = "pandas",
+        edge_encoder: str = "onehot",
+        n_edge_features: int = config.N_EDGE_HASH_FEATURES_DEFAULT,
+        chunk_size: Optional[int] = None,
+        fit_sample_size: int = config.FEATURIZE_FIT_ROWS,
+        features_path: Optional[str] = None,
         memoize: bool = True,
         verbose: bool = False,
     ):
@@ -2112,6 +2492,8 @@ class FeatureMixin(MIXIN_BASE):
             strategy=strategy,
             keep_n_decimals=keep_n_decimals,
             feature_engine=feature_engine,
+            edge_encoder=edge_encoder,
+            n_edge_features=n_edge_features,
         )
 
         res._feature_params = {
@@ -2119,7 +2501,10 @@ class FeatureMixin(MIXIN_BASE):
             "edges": fkwargs,
         }
 
-        old_res = reuse_featurization(res, memoize, fkwargs)
+        memoize = memoize and chunk_size is None
+        # hash the input frames once, for in-memory reuse and the fitted encoder key
+        hashed = memoize_hash(fkwargs) if memoize else None
+        old_res = reuse_featurization(res, memoize, fkwargs, hashed)
         if old_res:
             logger.info("--- [[ RE-USING EDGE FEATURIZATION ]]")
             fresh_res = copy.copy(res)
@@ -2141,15 +2526,24 @@ class FeatureMixin(MIXIN_BASE):
 
         print("** Featuring edges") if verbose else None
         ###############################################################
-        encoder = FastEncoder(X_resolved, y_resolved, kind="edges")
-        encoder.fit(src=res._source, dst=res._destination, **nfkwargs)
+        if chunk_size is not None:
+            encoder, X_enc, y_enc = fit_transform_chunked(
+                X_resolved, y_resolved, "edges", chunk_size, fit_sample_size, features_path,
+                src=res._source, dst=res._destination, **nfkwargs
+            )
+        else:
+            fit_key = fit_fingerprint("featurize-edges", hashed=hashed) if hashed is not None else None
+            encoder = fit_encoder(
+                X_resolved, y_resolved, "edges", fit_key, src=res._source, dst=res._destination, **nfkwargs
+            )
+            X_enc, y_enc = encoder.X, encoder.y
         ##############################################################
 
         # if editing, should also update fresh_res
-        res._edge_features = encoder.X
-        res._edge_features_raw = encoder.X_orignal  # .copy()
-        res._edge_target = encoder.y
-        res._edge_target_raw = encoder.y_orignal  # .copy()
+        res._edge_features = X_enc
+        res._edge_features_raw = encoder.X_orignal if chunk_size is None else None  # .copy()
+        res._edge_target = y_enc
+        res._edge_target_raw = encoder.y_orignal if chunk_size is None else None  # .copy()
         res._edge_encoder = encoder
 
         return res
@@ -2391,6 +2785,11 @@ class FeatureMixin(MIXIN_BASE):
         dbscan: bool = False,
         min_dist: float = 0.5,  # DBSCAN eps
         min_samples: int = 1,  # DBSCAN min_samples
+        edge_encoder: str = "onehot",
+        n_edge_features: int = config.N_EDGE_HASH_FEATURES_DEFAULT,
+        chunk_size: Optional[int] = None,
+        fit_sample_size: int = config.FEATURIZE_FIT_ROWS,
+        features_path: Optional[str] = None,
         memoize: bool = True,
         verbose: bool = False,
     ):
@@ -2398,7 +2797,8 @@ class FeatureMixin(MIXIN_BASE):
         
         :param kind: specify whether to featurize `nodes` or `edges`.
                 Edge featurization includes a pairwise
-                src-to-dst feature block using a MultiLabelBinarizer,
+                src-to-dst feature block using a MultiLabelBinarizer
+                (or feature hashing, see `edge_encoder`),
                 with any other columns being treated the
                 same way as with `nodes` featurization.
         :param X: Optional input, default None. If symbolic, evaluated
@@ -2491,6 +2891,16 @@ class FeatureMixin(MIXIN_BASE):
                 not featurized, default True.
         :param inplace: whether to not return new graphistry instance or
                 not, default False.
+        :param edge_encoder: for kind='edges', 'onehot' (default) encodes src/dst as one sparse column per node,
+                while 'hash' hashes them into n_edge_features columns, bounding memory regardless of graph size
+                and giving unseen nodes features at transform time, at the cost of hash collisions.
+        :param n_edge_features: number of src/dst columns when edge_encoder='hash', default 256.
+        :param chunk_size: for tables larger than memory, fit encoders on fit_sample_size sampled rows and then
+                transform all rows chunk_size at a time into a memory-mapped feature matrix, default None
+                to fit and transform all rows at once. Disables memoization.
+        :param fit_sample_size: rows sampled to fit encoders when chunk_size is set, default 100000.
+        :param features_path: .npy file for the chunked feature matrix, default a temporary file removed
+                once the features are garbage collected.
         :param memoize: whether to store and reuse results across runs,
                 default True.
         :return: graphistry instance with new attributes set by the featurization process.
@@ -2533,6 +2943,9 @@ class FeatureMixin(MIXIN_BASE):
                 keep_n_decimals=keep_n_decimals,
                 remove_node_column=remove_node_column,
                 feature_engine=feature_engine,
+                chunk_size=chunk_size,
+                fit_sample_size=fit_sample_size,
+                features_path=features_path,
                 memoize=memoize,
                 verbose=verbose
             )
@@ -2564,6 +2977,11 @@ class FeatureMixin(MIXIN_BASE):
                 strategy=strategy,
                 keep_n_decimals=keep_n_decimals,
                 feature_engine=feature_engine,
+                edge_encoder=edge_encoder,
+                n_edge_features=n_edge_features,
+                chunk_size=chunk_size,
+                fit_sample_size=fit_sample_size,
+                features_path=features_path,
                 memoize=memoize,
                 verbose=verbose
             )
@@ -2762,7 +3180,7 @@ class FeatureMixin(MIXIN_BASE):
         )
 
     
-    def get_matrix(self, columns: Optional[Union[List, str]] = None, kind: str = 'nodes', target: bool = False) -> pd.DataFrame:
+    def get_matrix(self, columns: Optional[Union[List, str]] = None, kind: str = 'nodes', target: bool = False, dense: bool = False) -> pd.DataFrame:
         """Returns feature matrix, and if columns are specified, returns matrix with only the columns that contain the string `column_part` in their name.`X = g.get_matrix(['feature1', 'feature2'])` will retrieve a feature matrix with only the columns that contain the string `feature1` or `feature2` in their name. Most useful for topic modeling, where the column names are of the form `topic_0: descriptor`, `topic_1: descriptor`, etc. Can retrieve unique columns in original dataframe, or actual topic features like [ip_part, shoes, preference_x, etc]. Powerful way to retrieve features from a featurized graph by column or (top) features of interest.
             
             **Example:**
@@ -2790,6 +3208,7 @@ class FeatureMixin(MIXIN_BASE):
             :columns (Union[List, str]): list of column names or a single column name that may exist in columns of the feature matrix. If None, returns original feature matrix
             :kind (str, optional): Node or Edge features. Defaults to 'nodes'.
             :target (bool, optional): If True, returns the target matrix. Defaults to False.
+            :dense (bool, optional): If True, converts sparse ngram and edge one-hot columns to dense. Defaults to False.
 
         Returns:
             pd.DataFrame: feature matrix with only the columns that contain the string `column_part` in their name.
@@ -2800,4 +3219,5 @@ class FeatureMixin(MIXIN_BASE):
         else:
             X = self._get_feature(kind)
 
-        return get_matrix_by_column_parts(X, columns)
+        X = get_matrix_by_column_parts(X, columns)
+        return densify(X) if dense else X
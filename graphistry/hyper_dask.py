@@ -2,9 +2,10 @@
 # Like hypergraph(); adds engine = 'pandas' | 'cudf' | 'dask' | 'dask-cudf'
 #
 
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
 from .Engine import Engine, DataframeLike, DataframeLocalLike
-import numpy as np, pandas as pd, pyarrow as pa, sys
+import numpy as np, os, pandas as pd, pyarrow as pa, sys
 from .util import setup_logger
 logger = setup_logger(__name__)
 
@@ -75,6 +76,31 @@ def make_reverse_lookup(categories):
             lookup[col] = str(category)
     return lookup
 
+def map_columns(fn: Callable[[str], Any], cols: List[str], engine: Engine, n_jobs: int = 1) -> List[Any]:
+    """
+    [fn(col) for col in cols], run on a thread pool of n_jobs threads (-1 for all cores) for the pandas engine
+    """
+    workers = min(len(cols), (os.cpu_count() or 1) if n_jobs == -1 else n_jobs)
+    if engine != Engine.PANDAS or workers <= 1:
+        return [fn(col) for col in cols]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(fn, cols))
+
+def entity_ids(s: pd.Series, prefix: str) -> np.ndarray:
+    """
+    Object array of `prefix + str(v)` for each v in s, stringifying each distinct value once via its factorized code
+    """
+    if s.dtype.name == 'object' and pd.api.types.infer_dtype(s, skipna=True) != 'string':
+        # mixed objects like 1 and 1.0 factorize together but print differently
+        return (prefix + s.astype(str)).to_numpy(dtype=object)
+    codes, uniques = pd.factorize(s, sort=False)
+    ids = (prefix + pd.Series(uniques).astype(str)).to_numpy(dtype=object)
+    out = ids.take(codes) if len(ids) else np.empty(len(codes), dtype=object)
+    nulls = codes < 0
+    if nulls.any():
+        out[nulls] = (prefix + s[nulls].astype(str)).to_numpy(dtype=object)
+    return out
+
 def coerce_col_safe(s, to_dtype):
     if s.dtype.name == to_dtype.name:
         return s
@@ -333,7 +359,8 @@ def format_entities(
     engine: Engine,
     npartitions: Optional[int],
     chunksize: Optional[int],
-    debug: bool = False) -> DataframeLike:
+    debug: bool = False,
+    n_jobs: int = 1) -> DataframeLike:
 
     logger.debug('@format_entities :: %s', entity_types)
     logger.debug('dtypes: %s', events.dtypes)
@@ -344,13 +371,12 @@ def format_entities(
     mt_df = mt_nodes(defs, events, entity_types, direct, engine)
     logger.debug('mt_df :: %s', mt_df.dtypes)
 
-    entity_dfs = [
-        format_entities_from_col(
+    entity_dfs = map_columns(
+        lambda col_name: format_entities_from_col(
             defs, cat_lookup, drop_na, engine,
-            col_name, events[[col_name]], mt_df,
-            debug)
-        for col_name in entity_types
-    ]
+            col_name, events, mt_df,
+            debug),
+        entity_types, engine, n_jobs)
     if debug and (engine in [Engine.DASK, Engine.DASK_CUDF]):
         entity_dfs = [ df.persist() for df in entity_dfs ]
         for df in entity_dfs:
@@ -381,11 +407,14 @@ def format_entities(
 #ex output: DataFrame([{'edgeType': 'state', 'attribID': 'state::CA', 'eventID': 'eventID::0'}])
 def format_hyperedges(
     engine: Engine, events: DataframeLike, entity_types: List[str], defs: HyperBindings,
-    drop_na: bool, drop_edge_attrs: bool, debug: bool = False
+    drop_na: bool, drop_edge_attrs: bool, debug: bool = False, n_jobs: int = 1
 ) -> DataframeLike:
     is_using_categories = len(defs.categories.keys()) > 0
     cat_lookup = make_reverse_lookup(defs.categories)
 
+    if engine == Engine.PANDAS:
+        return format_hyperedges_pandas(events, entity_types, defs, drop_na, drop_edge_attrs, n_jobs)
+
     # mt_pdf = pd.DataFrame({
     #     **{
     #         **({defs.category: pd.Series([], dtype='object')} if is_using_categories else {}),
@@ -452,6 +481,52 @@ def format_hyperedges(
         return mt_series(engine)
 
 
+def format_hyperedges_pandas(
+    events: pd.DataFrame, entity_types: List[str], defs: HyperBindings,
+    drop_na: bool, drop_edge_attrs: bool, n_jobs: int = 1
+) -> DataframeLike:
+    """
+    format_hyperedges() for pandas: entity columns are processed concurrently into row positions and attrib ids,
+    then the shared events frame is gathered once and only the new columns are appended
+    """
+    is_using_categories = len(defs.categories.keys()) > 0
+    cat_lookup = make_reverse_lookup(defs.categories)
+
+    def col_edges(col: str) -> Optional[Tuple[str, np.ndarray, np.ndarray]]:
+        s = events[col]
+        rows = np.flatnonzero(s.notna().to_numpy()) if drop_na else np.arange(len(s))
+        try:
+            ids = entity_ids(s.take(rows) if drop_na else s, col2cat(cat_lookup, col) + defs.delim)
+        except NotImplementedError:
+            logger.warning('Did not create hyperedges for column %s as does not support astype(str)', col)
+            return None
+        return col, rows, ids
+
+    parts = [part for part in map_columns(col_edges, sorted(entity_types), Engine.PANDAS, n_jobs) if part is not None]
+    if not len(parts):
+        return mt_series(Engine.PANDAS)
+
+    # same columns as format_hyperedges(), in events order then new ones, so the output is not re-gathered
+    new_cols = [defs.edge_type, defs.attrib_id] + ([defs.category] if is_using_categories else [])
+    event_cols = [
+        x for x in events.columns
+        if x not in new_cols and (x == defs.event_id if drop_edge_attrs else x != defs.node_type)
+    ]
+
+    cols = np.array([col for col, _, _ in parts], dtype=object)
+    counts = [len(rows) for _, rows, _ in parts]
+    base = events if len(event_cols) == len(events.columns) else events[event_cols]
+    out = base.take(np.concatenate([rows for _, rows, _ in parts]))
+    out.index = pd.RangeIndex(len(out))
+    if is_using_categories:
+        out[defs.edge_type] = np.repeat(np.array([col2cat(cat_lookup, col) for col in cols], dtype=object), counts)
+        out[defs.category] = np.repeat(cols, counts)
+    else:
+        out[defs.edge_type] = np.repeat(cols, counts)
+    out[defs.attrib_id] = np.concatenate([ids for _, _, ids in parts])
+    return out
+
+
 def direct_edgelist_shape(entity_types: List[str], defs: HyperBindings) -> Dict[str, List[str]]:
     """
         Edges take format {src_col: [dest_col1, dest_col2], ....}
@@ -487,8 +562,12 @@ def format_direct_edges(
                 raw[defs.category] = col1 + defs.delim + col2
             else:
                 raw[defs.edge_type] = col1 + defs.delim + col2
-            raw[defs.source] = (col2cat(cat_lookup, col1) + defs.delim) + raw[col1].astype(str).fillna(defs.null_val)
-            raw[defs.destination] = (col2cat(cat_lookup, col2) + defs.delim) + raw[col2].astype(str).fillna(defs.null_val)
+            if engine == Engine.PANDAS:
+                raw[defs.source] = entity_ids(raw[col1], col2cat(cat_lookup, col1) + defs.delim)
+                raw[defs.destination] = entity_ids(raw[col2], col2cat(cat_lookup, col2) + defs.delim)
+            else:
+                raw[defs.source] = (col2cat(cat_lookup, col1) + defs.delim) + raw[col1].astype(str).fillna(defs.null_val)
+                raw[defs.destination] = (col2cat(cat_lookup, col2) + defs.delim) + raw[col2].astype(str).fillna(defs.null_val)
             if drop_edge_attrs:
                 raw = raw.drop(columns=[col1, col2])
             if debug and (engine in [Engine.DASK, Engine.DASK_CUDF]):
@@ -723,12 +802,14 @@ def hypergraph(
     engine: str = 'pandas',  # see Engine for valid values
     npartitions: Optional[int] = None,
     chunksize: Optional[int] = None,
-    debug: bool = False
+    debug: bool = False,
+    n_jobs: int = -1
 ):
     """
     Internal details:
         - IDs currently strings: `${namespace(col)}${delim}${str(val)}`
         - debug: sprinkle persist() to catch bugs earlier
+        - n_jobs: pandas engine threads processing entity columns concurrently, -1 for all cores
     """
     # TODO: String -> categorical
     # TODO: col_name column can be prohibitively wide & sparse: drop / warning?
@@ -744,7 +825,7 @@ def hypergraph(
     if debug and (engine in [ Engine.DASK, Engine.DASK_CUDF ]):
         logger.debug('==== events: %s', events.compute())
     
-    entities = format_entities(events, entity_types, defs, direct, drop_na, engine_resolved, npartitions, chunksize, debug)  # type: ignore
+    entities = format_entities(events, entity_types, defs, direct, drop_na, engine_resolved, npartitions, chunksize, debug, n_jobs)  # type: ignore
 
     event_entities = None
     edges = None
@@ -756,7 +837,7 @@ def hypergraph(
         edges = format_direct_edges(engine_resolved, events, entity_types, defs, edge_shape, drop_na, drop_edge_attrs, debug)
     else:        
         event_entities = format_hypernodes(events, defs, drop_na)
-        edges = format_hyperedges(engine_resolved, events, entity_types, defs, drop_na, drop_edge_attrs, debug)
+        edges = format_hyperedges(engine_resolved, events, entity_types, defs, drop_na, drop_edge_attrs, debug, n_jobs)
 
     if debug:
         logger.debug('==== edges: %s', edges.compute() if engine_resolved in [Engine.DASK, Engine.DASK_CUDF] else edges)
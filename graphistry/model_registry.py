@@ -0,0 +1,145 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from . import constants as config
+from .constants import MODEL_REGISTRY_BYTES
+from .util import memoize_hash, setup_logger
+
+logger = setup_logger(name=__name__, verbose=config.VERBOSE)
+
+
+def model_nbytes(obj: Any, max_depth: int = 8) -> int:
+    """
+    Estimate memory held by a model: torch parameters and buffers, and numpy, pandas,
+    and scipy.sparse data reachable through attributes and containers
+    """
+    seen = set()
+
+    def helper(v: Any, depth: int) -> int:
+        if depth > max_depth or id(v) in seen:
+            return 0
+        seen.add(id(v))
+        if isinstance(v, np.ndarray):
+            return int(v.nbytes)
+        if isinstance(v, pd.DataFrame):
+            return int(v.memory_usage(index=True, deep=False).sum())
+        if isinstance(v, (pd.Series, pd.Index)):
+            return int(v.memory_usage(deep=False))
+        if hasattr(v, "state_dict") and hasattr(v, "parameters"):  # torch.nn.Module
+            try:
+                return sum(int(t.numel() * t.element_size()) for t in v.state_dict().values())
+            except Exception:
+                return 0
+        if hasattr(v, "data") and hasattr(v, "indices") and hasattr(v, "indptr"):  # scipy.sparse
+            return int(v.data.nbytes + v.indices.nbytes + v.indptr.nbytes)
+        if isinstance(v, dict):
+            return sum(helper(x, depth + 1) for x in v.values())
+        if isinstance(v, (list, tuple, set)):
+            return sum(helper(x, depth + 1) for x in v)
+        if hasattr(v, "__dict__") and not isinstance(v, type):
+            return helper(vars(v), depth + 1)
+        return 0
+
+    return helper(obj, 0)
+
+
+def fit_fingerprint(name: str, metadata: Any = None, hashed: Optional[str] = None) -> Optional[str]:
+    """Registry key for a model fit on metadata (data and parameters), or None when metadata cannot be hashed
+
+    Pass hashed, the memoize_hash() of metadata, instead of metadata when the caller already computed it"""
+    if hashed is None:
+        hashed = memoize_hash(metadata)
+    return None if hashed is None else f"{name}:{hashed}"
+
+
+class ModelRegistry:
+    """
+    Process-wide registry of loaded text models and fitted encoders, so a serving process loads or fits each once
+
+    Holds strong references, evicting least-recently-used models once their estimated bytes exceed max_bytes.
+    Call evict() to release models explicitly
+    """
+
+    def __init__(self, max_bytes: int = MODEL_REGISTRY_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        # key -> (model, nbytes)
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.RLock()
+        # key -> lock held while loading that key
+        self._loading: Dict[Hashable, threading.Lock] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def keys(self) -> List[Hashable]:
+        """Keys from least to most recently used"""
+        with self._lock:
+            return list(self._entries.keys())
+
+    def get(self, key: Hashable) -> Any:
+        """Return the registered model, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: Hashable, model: Any, nbytes: Optional[int] = None) -> None:
+        """Register model under key, estimating its size via model_nbytes() when nbytes is None"""
+        if nbytes is None:
+            nbytes = model_nbytes(model)
+        with self._lock:
+            self.evict(key)
+            if nbytes > self.max_bytes:
+                logger.debug(f"Not registering {key}: {nbytes} bytes exceeds max_bytes")
+                return
+            self._entries[key] = (model, nbytes)
+            self.nbytes += nbytes
+            while self.nbytes > self.max_bytes:
+                old_key = next(iter(self._entries))
+                logger.debug(f"Evicting model {old_key}")
+                self.evict(old_key)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the registered model, else register and return loader()
+
+        Concurrent callers for the same missing key wait for one load, without blocking other keys
+        """
+        model = self.get(key)
+        if model is not None:
+            return model
+        with self._lock:
+            key_lock = self._loading.setdefault(key, threading.Lock())
+        try:
+            with key_lock:
+                model = self.get(key)
+                if model is None:
+                    model = loader()
+                    self.put(key, model)
+        finally:
+            with self._lock:
+                self._loading.pop(key, None)
+        return model
+
+    def evict(self, key: Optional[Hashable] = None) -> None:
+        """Release the model registered under key, or all models when key is None"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self.nbytes = 0
+                return
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.nbytes -= entry[1]
+
+
+MODEL_REGISTRY = ModelRegistry()
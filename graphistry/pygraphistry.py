@@ -8,10 +8,11 @@ import calendar, gzip, io, json, os, numpy as np, pandas as pd, requests, sys, t
 
 from datetime import datetime
 
-from .arrow_uploader import ArrowUploader
+from .arrow_uploader import ArrowUploader, UPLOAD_COMPRESSIONS
 from .ArrowFileUploader import ArrowFileUploader
 
 from . import util
+from .constants import EMBEDDING_BATCH_SIZE, EMBEDDING_CACHE_BYTES, MEMOIZE_STORE_BYTES
 from . import bolt_util
 from .plotter import Plotter
 from .util import in_databricks, setup_logger, in_ipython, make_iframe
@@ -45,6 +46,14 @@ EnvVarNames = {
     "client_protocol_hostname": "GRAPHISTRY_CLIENT_PROTOCOL_HOSTNAME",
     "certificate_validation": "GRAPHISTRY_CERTIFICATE_VALIDATION",
     "store_token_creds_in_memory": "GRAPHISTRY_STORE_CREDS_IN_MEMORY",
+    "upload_batch_size": "GRAPHISTRY_UPLOAD_BATCH_SIZE",
+    "upload_compression": "GRAPHISTRY_UPLOAD_COMPRESSION",
+    "embedding_cache_dir": "GRAPHISTRY_EMBEDDING_CACHE_DIR",
+    "embedding_cache_bytes": "GRAPHISTRY_EMBEDDING_CACHE_BYTES",
+    "embedding_batch_size": "GRAPHISTRY_EMBEDDING_BATCH_SIZE",
+    "featurize_n_jobs": "GRAPHISTRY_FEATURIZE_N_JOBS",
+    "memoize_store_dir": "GRAPHISTRY_MEMOIZE_STORE_DIR",
+    "memoize_store_bytes": "GRAPHISTRY_MEMOIZE_STORE_BYTES",
 }
 
 config_paths = [
@@ -66,7 +75,15 @@ default_config = {
     "store_token_creds_in_memory": True,
     # Do not call API when all None
     "privacy": cast(Optional[Privacy], None),
-    "login_type": None
+    "login_type": None,
+    "upload_batch_size": None,
+    "upload_compression": None,
+    "embedding_cache_dir": None,
+    "embedding_cache_bytes": None,
+    "embedding_batch_size": None,
+    "featurize_n_jobs": None,
+    "memoize_store_dir": None,
+    "memoize_store_bytes": None
 }
 
 
@@ -539,6 +556,97 @@ class PyGraphistry(object):
             requests.packages.urllib3.disable_warnings()
         PyGraphistry._config["certificate_validation"] = v
 
+    @staticmethod
+    def upload_batch_size(value=None):
+        """Max rows per streamed record batch when uploading arrow data, None for about 16MB per batch (default).
+        Also set via environment variable GRAPHISTRY_UPLOAD_BATCH_SIZE."""
+        if value is None:
+            v = PyGraphistry._config["upload_batch_size"]
+            return int(v) if v is not None else None
+
+        # setter
+        PyGraphistry._config["upload_batch_size"] = int(value)
+
+    @staticmethod
+    def upload_compression(value=None):
+        """Arrow upload buffer compression: 'none' (default), 'lz4', 'zstd', or 'auto' to pick by sampling each table.
+        Servers that reject compressed uploads are retried uncompressed.
+        Also set via environment variable GRAPHISTRY_UPLOAD_COMPRESSION."""
+        if value is None:
+            return PyGraphistry._config["upload_compression"]
+
+        # setter
+        if value not in UPLOAD_COMPRESSIONS:
+            raise ValueError(f'Unknown upload compression "{value}", expected one of: {UPLOAD_COMPRESSIONS}')
+        PyGraphistry._config["upload_compression"] = value
+
+    @staticmethod
+    def embedding_cache_dir(value=None):
+        """Directory for the on-disk cache of sentence-transformer text embeddings used by featurize() and transform(),
+        None to disable (default). Also set via environment variable GRAPHISTRY_EMBEDDING_CACHE_DIR."""
+        if value is None:
+            return PyGraphistry._config["embedding_cache_dir"]
+
+        # setter
+        PyGraphistry._config["embedding_cache_dir"] = value
+
+    @staticmethod
+    def embedding_cache_bytes(value=None):
+        """Max bytes kept in the text embedding cache before least-recently-used entries are evicted, default 4GB.
+        Also set via environment variable GRAPHISTRY_EMBEDDING_CACHE_BYTES."""
+        if value is None:
+            v = PyGraphistry._config["embedding_cache_bytes"]
+            return int(v) if v is not None else EMBEDDING_CACHE_BYTES
+
+        # setter
+        PyGraphistry._config["embedding_cache_bytes"] = int(value)
+
+    @staticmethod
+    def embedding_batch_size(value=None):
+        """Texts per sentence-transformer encode batch, default 32.
+        Also set via environment variable GRAPHISTRY_EMBEDDING_BATCH_SIZE."""
+        if value is None:
+            v = PyGraphistry._config["embedding_batch_size"]
+            return int(v) if v is not None else EMBEDDING_BATCH_SIZE
+
+        # setter
+        PyGraphistry._config["embedding_batch_size"] = int(value)
+
+    @staticmethod
+    def featurize_n_jobs(value=None):
+        """Worker processes for featurize() column encoders, -1 for all cores, default 1.
+        Above 1, text embedding also runs alongside the other column encoders.
+        Also set via environment variable GRAPHISTRY_FEATURIZE_N_JOBS."""
+        if value is None:
+            v = PyGraphistry._config["featurize_n_jobs"]
+            return int(v) if v is not None else 1
+
+        # setter
+        PyGraphistry._config["featurize_n_jobs"] = int(value)
+
+    @staticmethod
+    def memoize_store_dir(value=None):
+        """Directory for the on-disk store of memoized featurize() encoders and features and umap() models
+        and embeddings, shared across processes and sessions, None to disable (default).
+        Only point it at trusted directories: entries hold pickled models.
+        Also set via environment variable GRAPHISTRY_MEMOIZE_STORE_DIR."""
+        if value is None:
+            return PyGraphistry._config["memoize_store_dir"]
+
+        # setter
+        PyGraphistry._config["memoize_store_dir"] = value
+
+    @staticmethod
+    def memoize_store_bytes(value=None):
+        """Max bytes kept in the memoization store before least-recently-used entries are evicted, default 16GB.
+        Also set via environment variable GRAPHISTRY_MEMOIZE_STORE_BYTES."""
+        if value is None:
+            v = PyGraphistry._config["memoize_store_bytes"]
+            return int(v) if v is not None else MEMOIZE_STORE_BYTES
+
+        # setter
+        PyGraphistry._config["memoize_store_bytes"] = int(value)
+
     @staticmethod
     def set_bolt_driver(driver=None):
         PyGraphistry._config["bolt_driver"] = bolt_util.to_bolt_driver(driver)
@@ -819,6 +927,7 @@ class PyGraphistry(object):
         engine: str = "pandas",
         npartitions: Optional[int] = None,
         chunksize: Optional[int] = None,
+        n_jobs: int = -1,
     ):
         """Transform a dataframe into a hypergraph.
 
@@ -832,6 +941,7 @@ class PyGraphistry(object):
         :param bool engine: String (pandas, cudf, ...) for engine to use
         :param Optional[int] npartitions: For distributed engines, how many coarse-grained pieces to split events into
         :param Optional[int] chunksize: For distributed engines, split events after chunksize rows
+        :param int n_jobs: For the pandas engine, threads processing entity columns concurrently, -1 (default) for all cores
 
         Create a graph out of the dataframe, and return the graph components as dataframes,
         and the renderable result Plotter. Hypergraphs reveal relationships between rows and between column values.
@@ -942,6 +1052,7 @@ class PyGraphistry(object):
             engine=engine,
             npartitions=npartitions,
             chunksize=chunksize,
+            n_jobs=n_jobs,
         )
 
     @staticmethod
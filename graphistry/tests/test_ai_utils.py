@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+import graphistry, numpy as np, os, pandas as pd, tempfile, unittest
+
+from graphistry.ai_utils import (
+    FaissVectorSearch, edges_of_nodes, infer_graph, infer_self_graph, nearest_neighbors_within_eps
+)
+from graphistry.compute import ComputeMixin
+from graphistry.constants import BATCH, DISTANCE, QUERY, WEIGHT
+from graphistry.plotter import PlotterBase
+
+
+class CGFull(ComputeMixin, PlotterBase, object):
+    def __init__(self, *args, **kwargs):
+        super(CGFull, self).__init__(*args, **kwargs)
+        PlotterBase.__init__(self, *args, **kwargs)
+        ComputeMixin.__init__(self, *args, **kwargs)
+
+
+class TestNearestNeighborsWithinEps(unittest.TestCase):
+
+    def test_matches_brute_force(self):
+        rng = np.random.default_rng(0)
+        X_fit = rng.normal(size=(50, 4))
+        X_new = rng.normal(size=(20, 4))
+        # tiny blocks to exercise the blocked path
+        rows, cols, dists, eps, m, std = nearest_neighbors_within_eps(X_fit, X_new, 3, block_size=64)
+
+        full = np.linalg.norm(X_new[:, None, :] - X_fit[None, :, :], axis=2)
+        assert np.isclose(m, full.mean())
+        assert np.isclose(std, full.std())
+        assert np.isclose(eps, min(abs(m - std), m))
+        for i in range(len(X_new)):
+            expected = [j for j in np.argsort(full[i], kind='stable')[:3] if full[i, j] < eps]
+            assert cols[rows == i].tolist() == expected
+            assert np.allclose(dists[rows == i], full[i, expected])
+
+    def test_exclude_self(self):
+        X = pd.DataFrame({'a': [0.0, 1.0, 10.0], 'b': [0.0, 0.0, 0.0]})
+        rows, cols, dists, _, _, _ = nearest_neighbors_within_eps(X, X, 1, eps=2.0, exclude_self=True)
+        assert rows.tolist() == [0, 1]
+        assert cols.tolist() == [1, 0]
+        assert np.allclose(dists, [1.0, 1.0])
+
+
+class TestFaissVectorSearch(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.M = rng.normal(size=(40, 5)).astype(np.float32)
+        self.Q = rng.normal(size=(6, 5)).astype(np.float32)
+
+    def test_batch_matches_single(self):
+        index = FaissVectorSearch(self.M)
+        I, D = index.search(self.Q, k=4)
+        assert I.shape == (6, 4) and D.shape == (6, 4)
+        for q, i_row, d_row in zip(self.Q, I, D):
+            i_one, d_one = index.search(q, k=4)
+            assert i_one.tolist() == i_row.tolist()
+            assert np.allclose(d_one, d_row)
+        full = ((self.Q[:, None, :] - self.M[None, :, :]) ** 2).sum(axis=2)
+        assert I.tolist() == np.argsort(full, axis=1)[:, :4].tolist()
+        assert np.allclose(D, np.sort(full, axis=1)[:, :4], atol=1e-4)
+
+    def test_search_batch_df(self):
+        index = FaissVectorSearch(self.M)
+        df = pd.DataFrame({'v': range(len(self.M))})
+        out = index.search_batch_df(pd.DataFrame(self.Q), df, 3)
+        assert out[QUERY].tolist() == [0, 0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3, 4, 4, 4, 5, 5, 5]
+        I, D = index.search(self.Q, k=3)
+        assert out['v'].tolist() == I.ravel().tolist()
+        assert np.allclose(out[DISTANCE], D.ravel())
+
+    def test_unknown_index_type(self):
+        with self.assertRaises(ValueError):
+            FaissVectorSearch(self.M, index_type='lsh')
+
+    def test_save_load(self):
+        index = FaissVectorSearch(self.M)
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'g.index')
+            index.save(path)
+            for mmap in [True, False]:
+                loaded = FaissVectorSearch.load(path, mmap=mmap)
+                I, D = loaded.search(self.Q, k=4)
+                I2, D2 = index.search(self.Q, k=4)
+                assert I.tolist() == I2.tolist()
+                assert np.allclose(D, D2)
+            del loaded
+
+    def test_save_load_search_instance(self):
+        g = graphistry.nodes(pd.DataFrame({'v': range(len(self.M))}))
+        g._node_features = pd.DataFrame(self.M)
+        g.build_index()
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'g.search')
+            g.save_search_instance(path)
+            assert os.path.exists(f'{path}.index')
+            g2 = type(g).load_search_instance(path)
+            I, _ = g2.search_index.search(self.Q, k=4)
+            assert I.tolist() == g.search_index.search(self.Q, k=4)[0].tolist()
+            del g2
+
+
+class TestEdgesOfNodes(unittest.TestCase):
+
+    def test_samples_incident_edges(self):
+        edges = pd.DataFrame({'s': ['a', 'b', 'c', 'd'], 'd': ['b', 'c', 'c', 'e']})
+        out = edges_of_nodes(edges, 's', 'd', np.array(['c', 'zz', 'e']), 5)
+        assert len(out) == 10
+        c_edges = out.iloc[:5]
+        assert ((c_edges['s'] == 'c') | (c_edges['d'] == 'c')).all()
+        assert (out.iloc[5:].to_numpy() == [['d', 'e']] * 5).all()
+
+
+class TestInferGraph(unittest.TestCase):
+
+    def _graph(self):
+        feats = pd.DataFrame({'f0': [0.0, 1.0, 5.0, 6.0], 'f1': [0.0, 0.0, 0.0, 0.0]})
+        g = (
+            CGFull()
+            .edges(pd.DataFrame({'s': [0, 1, 2], 'd': [1, 2, 3]}), 's', 'd')
+            .nodes(pd.DataFrame({'n': [0, 1, 2, 3]}), 'n')
+        )
+        g._node_features = feats
+        g._node_embedding = feats.rename(columns={'f0': 'x', 'f1': 'y'})
+        return g
+
+    def test_infer_graph(self):
+        g = self._graph()
+        X = pd.DataFrame({'f0': [0.1, 5.9], 'f1': [0.0, 0.0]})
+        df = pd.DataFrame({'v': ['p', 'q']})
+        g2 = infer_graph(g, None, X, None, df, eps=1.5, n_neighbors=1, sample=2)
+        new_edges = g2._edges[g2._edges[BATCH] == 1]
+        assert new_edges[['s', 'd']].to_dict(orient='records') == [{'s': 0, 'd': 4}, {'s': 3, 'd': 5}]
+        assert (new_edges[WEIGHT] <= 1).all()
+        old_edges = g2._edges[g2._edges[BATCH] == 0]
+        assert len(old_edges) > 0
+        assert old_edges.apply(lambda r: r['s'] in [0, 3] or r['d'] in [0, 3], axis=1).all()
+        assert set(g2._nodes['n']) >= {0, 3, 4, 5}
+        assert BATCH not in g._nodes and BATCH not in g._edges
+
+    def test_infer_self_graph(self):
+        g = self._graph()
+        X = pd.DataFrame({'f0': [0.0, 1.0, 10.0], 'f1': [0.0, 0.0, 0.0]})
+        df = pd.DataFrame({'v': ['p', 'q', 'r']})
+        g2 = infer_self_graph(g, None, X, None, df, eps=2.0, n_neighbors=2)
+        assert g2._edges[['s', 'd']].to_dict(orient='records') == [{'s': 1.0, 'd': 0.0}, {'s': 0.0, 'd': 1.0}]
+
+
+if __name__ == "__main__":
+    unittest.main()
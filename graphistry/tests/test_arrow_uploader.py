@@ -1,8 +1,10 @@
 # -*- coding: utf-8 -*-
 
-import graphistry, mock, pandas as pd, pytest, unittest
+import graphistry, json, mock, numpy as np, pandas as pd, pyarrow as pa, pytest, requests, threading, unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 from graphistry import ArrowUploader
+from graphistry.arrow_uploader import choose_compression, pooled_session
 from graphistry.pygraphistry import PyGraphistry
 
 # TODO mock requests for testing actual effectful code
@@ -356,3 +358,170 @@ class TestArrowUploader_Comms(unittest.TestCase):
 
         au.sso_get_token(state='ignored-valid')
         assert au.token == '123'
+
+
+class _ReassemblingHandler(BaseHTTPRequestHandler):
+    """Local stand-in for the upload endpoints: decodes chunked arrow bodies and echoes what it parsed"""
+
+    protocol_version = "HTTP/1.1"
+
+    def _read_body(self):
+        if self.headers.get("Transfer-Encoding") != "chunked":
+            return self.rfile.read(int(self.headers.get("Content-Length", 0))), 0
+        body, chunks = b"", 0
+        while True:
+            size = int(self.rfile.readline().strip(), 16)
+            if size == 0:
+                self.rfile.readline()
+                return body, chunks
+            body += self.rfile.read(size)
+            self.rfile.readline()
+            chunks += 1
+
+    def _reply(self, out):
+        data = json.dumps(out).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        body, chunks = self._read_body()
+        server = self.server
+        with server.lock:  # type: ignore
+            server.clients.add(self.client_address)  # type: ignore
+            server.bodies.append(body)  # type: ignore
+            reject = server.reject_next > 0  # type: ignore
+            server.reject_next -= 1  # type: ignore
+        if reject:
+            data = server.reject_body  # type: ignore
+            self.send_response(server.reject_status)  # type: ignore
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+            return
+        if self.path == "/api/v2/files/":
+            with server.lock:  # type: ignore
+                file_id = f"file{len(server.files)}"  # type: ignore
+                server.files[file_id] = None  # type: ignore
+            self._reply({"file_id": file_id})
+        elif self.path == "/api/v2/upload/datasets/":
+            server.datasets.append(json.loads(body))  # type: ignore
+            self._reply({"success": True, "data": {"dataset_id": "ds"}})
+        else:
+            table = pa.ipc.open_file(pa.py_buffer(body)).read_all()
+            server.received.append(table)  # type: ignore
+            if self.path.startswith("/api/v2/upload/files/"):
+                server.files[self.path.split("/")[-1].split("?")[0]] = table  # type: ignore
+                self._reply({"is_valid": True, "is_uploaded": True})
+            else:
+                self._reply({"success": True, "rows": table.num_rows, "chunks": chunks})
+
+    def log_message(self, *args):
+        pass
+
+
+class TestArrowUploader_Streaming(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _ReassemblingHandler)
+        self.server.lock = threading.Lock()  # type: ignore
+        self.server.clients = set()  # type: ignore
+        self.server.files = {}  # type: ignore
+        self.server.datasets = []  # type: ignore
+        self.server.received = []  # type: ignore
+        self.server.bodies = []  # type: ignore
+        self.server.reject_next = 0  # type: ignore
+        self.server.reject_status = 400  # type: ignore
+        self.server.reject_body = b"unsupported compression"  # type: ignore
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        ArrowUploader._compression_rejected.clear()
+
+    def _au(self, **kwargs):
+        host, port = self.server.server_address
+        return ArrowUploader(server_base_path=f"http://{host}:{port}", token="tok", dataset_id="ds", **kwargs)
+
+    def test_arrow_to_chunks_matches_buffer(self):
+        au = ArrowUploader()
+        table = pa.Table.from_pandas(pd.DataFrame({"s": range(100), "d": [str(i) for i in range(100)]}))
+        chunks = list(au.arrow_to_chunks(table, batch_size=30))
+        assert len(chunks) == 5
+        assert pa.ipc.open_file(pa.py_buffer(b"".join(chunks))).read_all().equals(table)
+
+    def test_post_arrow_streams_batches(self):
+        au = self._au(upload_batch_size=1000)
+        table = pa.Table.from_pandas(pd.DataFrame({"s": range(10000), "d": range(10000)}))
+        out = au.post_arrow(table, "edges")
+        assert out["rows"] == 10000
+        assert out["chunks"] == 11  # 10 batches + footer
+        assert self.server.received[0].equals(table)  # type: ignore
+
+    def test_post_arrow_mt(self):
+        au = self._au()
+        table = pa.Table.from_pandas(pd.DataFrame({"s": pd.Series([], dtype="int64")}))
+        assert au.post_arrow(table, "nodes")["rows"] == 0
+
+    def test_post_files_concurrent_pooled(self):
+        edges = pa.Table.from_pandas(pd.DataFrame({"s": range(5000), "d": range(5000)}))
+        nodes = pa.Table.from_pandas(pd.DataFrame({"n": range(5000)}))
+        session = pooled_session(pool_size=2)
+        for _ in range(3):
+            au = self._au(session=session, upload_batch_size=500)
+            au.edges, au.nodes, au.name = edges, nodes, "g"
+            au.edge_encodings, au.node_encodings, au.metadata, au.description = {}, {}, {}, ""
+            au.post(memoize=False)
+        files = self.server.files  # type: ignore
+        for dataset in self.server.datasets:  # type: ignore
+            assert files[dataset["edge_files"][0]].equals(edges)
+            assert files[dataset["node_files"][0]].equals(nodes)
+        assert len(self.server.datasets) == 3  # type: ignore
+        # 3 uploaders x (2 files x 2 calls + 1 dataset) over at most 2 kept-alive connections
+        assert len(self.server.clients) <= 2  # type: ignore
+
+    def test_post_arrow_compressed(self):
+        table = pa.Table.from_pandas(pd.DataFrame({"s": ["some repeated label"] * 5000, "d": range(5000)}))
+        for compression in ["lz4", "zstd", "auto"]:
+            au = self._au(compression=compression)
+            assert au.post_arrow(table, "edges")["rows"] == 5000
+            assert self.server.received[-1].equals(table)  # type: ignore
+            assert len(self.server.bodies[-1]) < len(au.arrow_to_buffer(table)) / 2  # type: ignore
+
+    def test_post_arrow_compression_fallback(self):
+        table = pa.Table.from_pandas(pd.DataFrame({"s": ["x"] * 1000}))
+        self.server.reject_next = 1  # type: ignore
+        au = self._au(compression="zstd")
+        assert au.post_arrow(table, "edges")["rows"] == 1000
+        assert self.server.bodies[-1] == au.arrow_to_buffer(table)  # type: ignore
+        assert au.resolve_compression(table) is None  # remembered for this server
+
+    def test_post_arrow_compressed_other_errors_raise(self):
+        table = pa.Table.from_pandas(pd.DataFrame({"s": ["x"] * 1000}))
+        for status, body in [(500, b"internal error"), (401, b"unauthorized"), (400, b"bad dataset id")]:
+            self.server.reject_next = 1  # type: ignore
+            self.server.reject_status = status  # type: ignore
+            self.server.reject_body = body  # type: ignore
+            n_bodies = len(self.server.bodies)  # type: ignore
+            au = self._au(compression="zstd")
+            with pytest.raises(requests.exceptions.HTTPError):
+                au.post_arrow(table, "edges")
+            assert len(self.server.bodies) == n_bodies + 1  # type: ignore
+            assert au.resolve_compression(table) == "zstd"
+
+    def test_choose_compression(self):
+        repetitive = pa.Table.from_pandas(pd.DataFrame({"s": ["aaaa", "bbbb"] * 5000}))
+        noise = pa.Table.from_pandas(pd.DataFrame({"x": np.random.default_rng(0).random(10000)}))
+        assert choose_compression(repetitive) in ["lz4", "zstd"]
+        assert choose_compression(noise) is None
+        assert choose_compression(noise.slice(0, 0)) is None
+        with pytest.raises(ValueError):
+            ArrowUploader(compression="gzip").resolve_compression(noise)
+
+    def test_pooled_session_shared(self):
+        assert pooled_session() is pooled_session()
+        assert pooled_session(pool_size=3) is not pooled_session()
+        assert ArrowUploader().session is pooled_session()
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+import numpy as np, os, pandas as pd, scipy.sparse, tempfile, time, unittest
+
+from graphistry.artifact_store import ArtifactStore, get_artifact_store
+
+
+class TestArtifactStore(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def artifacts(self):
+        return {
+            'X': pd.DataFrame({'a': [1.0, 2.0], 'b': ['x', 'y']}, index=[10, 20]),
+            'sparse': pd.DataFrame.sparse.from_spmatrix(scipy.sparse.eye(2), columns=['s0', 's1']),
+            'emb': np.arange(6, dtype=np.float32).reshape(3, 2),
+            'model': {'weights': [1, 2, 3]},
+            'graph': scipy.sparse.csr_matrix(np.eye(3)),
+        }
+
+    def test_roundtrip_across_sessions(self):
+        ArtifactStore(self.dir.name).put('featurize-nodes:abc', self.artifacts())
+        # new store instance over the same directory, like a later session
+        out = ArtifactStore(self.dir.name).get('featurize-nodes:abc')
+        expected = self.artifacts()
+        pd.testing.assert_frame_equal(out['X'], expected['X'])
+        pd.testing.assert_frame_equal(out['sparse'], expected['sparse'])
+        assert isinstance(out['emb'], np.memmap)
+        np.testing.assert_array_equal(out['emb'], expected['emb'])
+        assert out['model'] == expected['model']
+        assert (out['graph'] != expected['graph']).nnz == 0
+        assert ArtifactStore(self.dir.name).get('featurize-nodes:other') is None
+
+    def test_put_is_idempotent(self):
+        store = ArtifactStore(self.dir.name)
+        store.put('k', {'v': np.zeros(2)})
+        store.put('k', {'v': np.ones(2)})
+        np.testing.assert_array_equal(store.get('k')['v'], np.zeros(2))
+        assert len(os.listdir(self.dir.name)) == 1
+
+    def test_corrupt_entry_is_dropped(self):
+        store = ArtifactStore(self.dir.name)
+        store.put('k', {'v': np.arange(4)})
+        entry = os.path.join(self.dir.name, os.listdir(self.dir.name)[0])
+        npy = [f for f in os.listdir(entry) if f.endswith('.npy')][0]
+        with open(os.path.join(entry, npy), 'r+b') as f:
+            f.seek(-1, os.SEEK_END)
+            f.write(b'\xff')
+        assert store.get('k') is None
+        assert 'k' not in store
+        assert os.listdir(self.dir.name) == []
+
+    def test_evicts_least_recently_used(self):
+        store = ArtifactStore(self.dir.name, max_bytes=1 << 30)
+        store.put('a', {'v': np.zeros(1000)})
+        store.put('b', {'v': np.zeros(1000)})
+        store.put('c', {'v': np.zeros(1000)})
+        past = time.time() - 100
+        for i, key in enumerate(['b', 'a', 'c']):  # b oldest, then a, then c
+            os.utime(os.path.join(store._entry_dir(key), 'manifest.json'), (past + i, past + i))
+        store.get('b')  # refreshes b
+        entry = store._entry_dir('a')
+        store.max_bytes = 2 * sum(os.path.getsize(os.path.join(entry, f)) for f in os.listdir(entry))
+        store.evict()
+        assert 'a' not in store
+        assert 'b' in store and 'c' in store
+
+    def test_get_artifact_store(self):
+        assert get_artifact_store(None) is None
+        assert get_artifact_store(self.dir.name) is get_artifact_store(self.dir.name)
@@ -145,6 +145,21 @@ class TestComputeMixin(NoAuthTestCase):
             {"n": "b", "level": 1, "degree": "y"},
         ]
 
+    def test_get_topological_levels_duplicate_node_ids(self):
+        cg = CGFull()
+        g = (
+            cg.edges(pd.DataFrame({"s": ["a", "b"], "d": ["b", "c"]}), "s", "d")
+            .nodes(pd.DataFrame({"n": ["a", "b", "b", "c", "a"], "v": [1, 2, 3, 4, 5]}), "n")
+            .get_topological_levels()
+        )
+        assert g._nodes.to_dict(orient="records") == [
+            {"n": "a", "v": 1, "level": 0},
+            {"n": "b", "v": 2, "level": 1},
+            {"n": "b", "v": 3, "level": 1},
+            {"n": "c", "v": 4, "level": 2},
+            {"n": "a", "v": 5, "level": 0},
+        ]
+
     def test_get_topological_levels_cycle_exn(self):
         cg = CGFull()
         with pytest.raises(ValueError):
@@ -162,6 +177,31 @@ class TestComputeMixin(NoAuthTestCase):
             {"id": "b", "level": 1},
         ]
 
+    def test_get_topological_levels_cycle_tie_break(self):
+        cg = CGFull()
+        g = (
+            cg.edges(pd.DataFrame({"s": ["a", "b", "c", "c"], "d": ["b", "c", "b", "d"]}), "s", "d")
+            .nodes(pd.DataFrame({"n": ["d", "c", "b", "a", "z"]}), "n")
+            .get_topological_levels(warn_cycles=False)
+        )
+        # b and c form a cycle once a is peeled; c has the highest remaining degree
+        assert g._nodes.to_dict(orient="records") == [
+            {"n": "d", "level": 2},
+            {"n": "c", "level": 1},
+            {"n": "b", "level": 2},
+            {"n": "a", "level": 0},
+            {"n": "z", "level": 0},
+        ]
+
+    def test_get_topological_levels_deep(self):
+        cg = CGFull()
+        n = 2000
+        g = cg.edges(
+            pd.DataFrame({"s": list(range(n - 1, 0, -1)), "d": list(range(n - 2, -1, -1))}), "s", "d"
+        ).get_topological_levels()
+        assert g._nodes["id"].to_list() == list(range(n - 1, -1, -1))
+        assert g._nodes["level"].to_list() == list(range(n))
+
     def test_drop_nodes(self):
         cg = CGFull()
         g = cg.edges(
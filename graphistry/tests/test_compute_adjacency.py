@@ -0,0 +1,62 @@
+import numpy as np, pandas as pd
+from common import NoAuthTestCase
+
+from graphistry.compute.adjacency import get_adjacency
+from graphistry.tests.test_compute import CGFull
+
+
+class TestAdjacencyIndex(NoAuthTestCase):
+
+    def test_offsets(self):
+        edges = pd.DataFrame({'s': ['a', 'a', 'b', None], 'd': ['b', 'c', 'c', 'a']})
+        adj = get_adjacency(edges, 's', 'd')
+        assert list(adj.ids) == ['a', 'b', 'c']
+        assert adj.out_degrees().tolist() == [2, 1, 0]
+        assert adj.in_degrees().tolist() == [0, 1, 2]
+        assert sorted(adj.gather(adj.encode(['a']), 'forward').tolist()) == [0, 1]
+        assert sorted(adj.gather(adj.encode(['c']), 'reverse').tolist()) == [1, 2]
+        assert adj.gather(np.array([], dtype=np.int64), 'forward').tolist() == []
+
+    def test_edges_within(self):
+        edges = pd.DataFrame({'s': ['a', 'a', 'b', None], 'd': ['b', 'c', 'c', 'a']})
+        adj = get_adjacency(edges, 's', 'd')
+        assert adj.edges_within(adj.mask(['a', 'b', 'zz'])).tolist() == [True, False, False, False]
+
+    def test_cache_reuse(self):
+        edges = pd.DataFrame({'s': ['a', 'b'], 'd': ['b', 'c']})
+        adj = get_adjacency(edges, 's', 'd')
+        assert get_adjacency(edges, 's', 'd') is adj
+        assert get_adjacency(edges, 'd', 's') is not adj
+        edges['s'] = ['c', 'c']
+        adj2 = get_adjacency(edges, 's', 'd')
+        assert adj2 is not adj
+        assert list(adj2.ids) == ['c', 'b']
+
+    def test_cache_in_place_edits(self):
+        edges = pd.DataFrame({'s': [0, 1], 'd': [1, 2]})
+        g = CGFull().edges(edges, 's', 'd')
+        assert g.get_indegrees()._nodes.to_dict(orient='list') == {'id': [0, 1, 2], 'degree_in': [0, 1, 1]}
+        edges.loc[0, 'd'] = 2
+        assert g.get_indegrees()._nodes.to_dict(orient='list') == {'id': [0, 1, 2], 'degree_in': [0, 0, 2]}
+
+        edges = pd.DataFrame({'s': ['a', 'b'], 'd': ['b', 'c']})
+        g = CGFull().edges(edges, 's', 'd')
+        nodes = pd.DataFrame({'id': ['a']})
+        assert g.hop(nodes, hops=1)._edges.to_dict(orient='records') == [{'s': 'a', 'd': 'b'}]
+        edges.loc[0, 'd'] = 'c'
+        assert g.hop(nodes, hops=1)._edges.to_dict(orient='records') == [{'s': 'a', 'd': 'c'}]
+
+    def test_cache_reuse_extension_dtypes(self):
+        for dtype in ['category', 'Int64', 'string']:
+            values = ['1', '2', '3'] if dtype != 'Int64' else [1, 2, 3]
+            edges = pd.DataFrame({'s': values, 'd': values[1:] + values[:1]}).astype(dtype)
+            adj = get_adjacency(edges, 's', 'd')
+            assert get_adjacency(edges, 's', 'd') is adj, dtype
+            edges['s'] = edges['d'].copy()
+            assert get_adjacency(edges, 's', 'd') is not adj, dtype
+
+    def test_keep_nodes_degrees(self):
+        g = CGFull().edges(pd.DataFrame({'s': ['a', 'b', 'c'], 'd': ['b', 'a', 'd']}), 's', 'd')
+        g2 = g.keep_nodes(['a', 'b'])
+        assert g2._edges.to_dict(orient='records') == [{'s': 'a', 'd': 'b'}, {'s': 'b', 'd': 'a'}]
+        assert g.get_degrees()._nodes['degree'].tolist() == [2, 2, 1, 1]
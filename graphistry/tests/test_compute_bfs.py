@@ -0,0 +1,64 @@
+import numpy as np, pandas as pd
+from common import NoAuthTestCase
+
+from graphistry.tests.test_compute import CGFull
+from graphistry.tests.test_compute_hops import hops_graph
+
+
+class TestComputeBFSMixin(NoAuthTestCase):
+
+    def test_bfs_forward(self):
+        g = hops_graph()
+        g2 = g.bfs(pd.DataFrame({g._node: ['d', 'k']}))
+        dists = dict(zip(g2._nodes[g._node], g2._nodes['hop_distance']))
+        assert dists == {
+            'd': 0, 'k': 0,
+            'a': 1, 'c': 1, 'f': 1, 'h': 1, 'i': 1, 'j': 1,
+            'm': 2, 'n': 2, 'o': 2, 'p': 2,
+            'b': 3
+        }
+        seeds = dict(zip(g2._nodes[g._node], g2._nodes['hop_seed']))
+        assert seeds['a'] == 'k'
+        assert seeds['b'] == 'd'
+        assert g2._edges.shape == (14, 3)
+
+    def test_bfs_hops(self):
+        g = hops_graph()
+        g2 = g.bfs(pd.DataFrame({g._node: ['d']}), hops=1)
+        assert sorted(g2._nodes[g._node].to_list()) == sorted(['d', 'c', 'f', 'h', 'i', 'j'])
+        assert g2._edges.shape == (5, 3)
+
+    def test_bfs_seed_tie_break(self):
+        g = hops_graph()
+        g2 = g.bfs(pd.DataFrame({g._node: ['p', 'o']}))
+        assert g2._nodes[g2._nodes[g._node] == 'b']['hop_seed'].to_list() == ['p']
+        g3 = g.bfs(pd.DataFrame({g._node: ['o', 'p']}))
+        assert g3._nodes[g3._nodes[g._node] == 'b']['hop_seed'].to_list() == ['o']
+
+    def test_bfs_edge_match(self):
+        g = hops_graph()
+        g2 = g.bfs(pd.DataFrame({g._node: ['d']}), edge_match={'s': 'd'})
+        assert g2._nodes['hop_distance'].max() == 1
+        assert g2._edges.shape == (5, 3)
+
+    def test_bfs_isolated_seed(self):
+        g = CGFull().edges(pd.DataFrame({'s': ['a'], 'd': ['b']}), 's', 'd').nodes(pd.DataFrame({'id': ['a', 'b', 'c']}), 'id')
+        g2 = g.bfs(pd.DataFrame({'id': ['c', 'a']}), distance_col='dist', seed_col='src')
+        assert g2._nodes.to_dict(orient='records') == [
+            {'id': 'a', 'dist': 0, 'src': 'a'},
+            {'id': 'b', 'dist': 1, 'src': 'a'},
+            {'id': 'c', 'dist': 0, 'src': 'c'}
+        ]
+
+    def test_bfs_matches_hop(self):
+        rng = np.random.default_rng(1)
+        edges = pd.DataFrame({'s': rng.integers(0, 80, 200), 'd': rng.integers(0, 80, 200)})
+        g = CGFull().edges(edges, 's', 'd').materialize_nodes()
+        seeds = pd.DataFrame({'id': [0, 1, 2]})
+        for direction in ['forward', 'reverse', 'undirected']:
+            g2 = g.bfs(seeds, direction=direction)
+            dists = dict(zip(g2._nodes['id'], g2._nodes['hop_distance']))
+            for k in range(1, 4):
+                hop_ids = set(g.hop(seeds, k, direction=direction)._nodes['id'])
+                assert set([n for n, d in dists.items() if 0 < d <= k]) <= hop_ids
+                assert set([n for n in hop_ids if dists.get(n, 99) > k]) == set()
@@ -3,6 +3,7 @@ from common import NoAuthTestCase
 
 from graphistry.tests.test_compute_hops import hops_graph
 from graphistry.compute.ast import n, e_forward, e_reverse, e_undirected
+from graphistry.compute.chain_plan import ChainPlan
 
 
 class TestComputeChainMixin(NoAuthTestCase):
@@ -100,3 +101,57 @@ class TestComputeChainMixin(NoAuthTestCase):
         assert sorted(g2._edges[ g2._edges.e2 ][g2._source].to_list()) == ["g", "l"]
         assert sorted(g2._edges[ g2._edges.e2 ][g2._destination].to_list()) == ["a", "b"]
         assert sorted(g2._nodes[ g2._nodes.n2 ][g2._node].to_list()) == ["a", "b"]
+
+
+class TestComputeChainPlan(NoAuthTestCase):
+
+    def test_explain_columns(self):
+        g = hops_graph()
+        plan = g.chain([n({g._node: "e"}), e_forward(), n()], explain=True)
+        assert plan['step'].to_list() == [0, 1, 2]
+        assert plan['estimated_rows'].to_list() == [1, len(g._edges), len(g._nodes)]
+        assert plan['output_nodes'].to_list() == [1, 1, 2]
+        assert plan['output_edges'].to_list() == [0, 2, 0]
+
+    def test_explain_mt(self):
+        g = hops_graph()
+        assert len(g.chain([], explain=True)) == 0
+
+    def test_start_from_selective_end(self):
+        g = hops_graph()
+        ops = [n(), e_forward(), n({g._node: "b"}, name="end")]
+        plan = g.chain(ops, explain=True)
+        assert plan['execution_order'].to_list() == [2, 1, 0]
+        g2 = g.chain(ops)
+        assert sorted(g2._nodes[g2._node].to_list()) == ["b", "l", "o", "p"]
+        assert g2._nodes[ g2._nodes.end ][g2._node].to_list() == ["b"]
+        assert g2._edges.shape == (3, 3)
+
+    def test_edge_ends_compare_nodes(self):
+        g = hops_graph()
+        # an edge end is not compared against a node end
+        assert not ChainPlan(g, [e_forward(), n({g._node: "b"})]).reversed
+        assert not ChainPlan(g, [n({g._node: "b"}), e_reverse()]).reversed
+        # chain() pads the edge end with a node step, which keeps every node
+        ops = [e_forward(), n({g._node: "b"}, name="end")]
+        plan = g.chain(ops, explain=True)
+        assert plan['execution_order'].to_list() == [2, 1, 0]
+        g2 = g.chain(ops)
+        assert sorted(g2._nodes[g2._node].to_list()) == ["b", "l", "o", "p"]
+        assert g2._nodes[ g2._nodes.end ][g2._node].to_list() == ["b"]
+
+    def test_pushdown(self):
+        g = hops_graph()
+        ops = [n({g._node: "d"}), e_forward(name="e1"), n({g._node: "j"}), e_forward(), n()]
+        plan = g.chain(ops, explain=True)
+        assert plan['pushed_down'].to_list()[1] == {g._node: "j"}
+        assert plan['forward_nodes'].to_list()[1] == 1
+        g2 = g.chain(ops)
+        assert sorted(g2._nodes[g2._node].to_list()) == ["d", "j", "o", "p"]
+        assert g2._edges[ g2._edges.e1 ][[g._source, g._destination]].values.tolist() == [["d", "j"]]
+
+    def test_undirected_not_rewritten(self):
+        g = hops_graph()
+        plan = g.chain([n(), e_undirected(), n({g._node: "b"})], explain=True)
+        assert plan['execution_order'].to_list() == [0, 1, 2]
+        assert plan['pushed_down'].isna().all()
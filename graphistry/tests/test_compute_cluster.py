@@ -66,8 +66,34 @@ class TestComputeCluster(unittest.TestCase):
                 
         g3 = g2.transform_dbscan(ndf, ndf, verbose=True)
         self._condition(g3, kind)
-        
-            
+
+
+class TestDBSCANPredict(unittest.TestCase):
+
+    def test_matches_nearest_core_sample(self):
+        import numpy as np
+        from sklearn.cluster import DBSCAN as skDBSCAN
+        from graphistry.compute.cluster import dbscan_predict
+
+        rng = np.random.default_rng(0)
+        X = pd.DataFrame(np.r_[rng.normal(0, 0.1, (50, 2)), rng.normal(3, 0.1, (50, 2)), [[10, 10]]])
+        model = skDBSCAN(eps=0.3, min_samples=3).fit(X)
+        X_new = pd.DataFrame(rng.uniform(-1, 4, (200, 2)))
+
+        expected = []
+        for row in X_new.values:
+            dist = np.linalg.norm(model.components_ - row, axis=1)
+            nearest = np.argmin(dist)
+            expected.append(model.labels_[model.core_sample_indices_[nearest]] if dist[nearest] < model.eps else -1)
+
+        labels = dbscan_predict(X_new, model)
+        self.assertEqual(labels.tolist(), expected)
+        self.assertTrue(set(labels) >= {-1, 0, 1})
+        index = model._graphistry_core_index
+        dbscan_predict(X_new, model)
+        self.assertIs(model._graphistry_core_index, index)  # built once per fitted model
+        self.assertEqual(dbscan_predict(X_new.iloc[:0], model).tolist(), [])
+
+
 if __name__ == '__main__':
     unittest.main()
-    
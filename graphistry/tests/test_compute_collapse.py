@@ -1,6 +1,7 @@
-import pandas as pd
+import numpy as np, pandas as pd
 from common import NoAuthTestCase
 
+from graphistry.compute.collapse import collapse_by, union_find
 from graphistry.tests.test_compute import CGFull
 
 
@@ -461,3 +462,28 @@ class TestCollapse(NoAuthTestCase):
         g3 = g2.collapse(node="0", attribute="2", column="level", unwrap=False)
         g4 = g3.collapse(node="0", attribute="0", column="level", unwrap=False)
         self._test_graph_chain_collapse(g, g4)
+
+    def test_collapse_unreachable_untouched(self):
+        g = CGFull().edges(
+            pd.DataFrame({"src": ["a", "b", "x"], "dst": ["b", "c", "y"]}), "src", "dst"
+        ).nodes(
+            pd.DataFrame({"node": ["a", "b", "c", "x", "y"], "level": ["1", "1", "1", "1", "1"]}), "node"
+        )
+        g2 = g.collapse(node="a", attribute="1", column="level", verbose=False)
+        assert g2._nodes["node_collapse"].to_list() == ["~a~ ~b~ ~c~"] * 3 + ["None", "None"]
+        assert g2._nodes["node_final"].to_list() == ["~a~ ~b~ ~c~"] * 3 + ["x", "y"]
+
+    def test_collapse_by_wraps_components(self):
+        g = get_collapse_graph(as_string=True)
+        g2 = collapse_by(g, parent="0", start_node="0", attribute="1", column="level", seen={}, verbose=False)
+        self._test_graph_collapse(g, g2)
+
+
+class TestUnionFind(NoAuthTestCase):
+
+    def test_union_find(self):
+        labels = union_find(6, np.array([4, 1, 2]), np.array([5, 2, 0]))
+        assert labels.tolist() == [0, 0, 0, 3, 4, 4]
+
+    def test_union_find_mt(self):
+        assert union_find(3, np.array([], dtype=int), np.array([], dtype=int)).tolist() == [0, 1, 2]
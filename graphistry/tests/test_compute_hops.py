@@ -138,3 +138,58 @@ class TestComputeHopMixin(NoAuthTestCase):
         assert (g2._nodes[g2._node].sort_values().to_list() ==  # noqa: W504
             sorted(['e', 'l']))
         assert g2._edges.shape == (1, 3)
+
+
+class TestComputeHopEngines(NoAuthTestCase):
+
+    def assert_same(self, g, **kwargs):
+        g_merge = g.hop(engine='merge', **kwargs)
+        g_csr = g.hop(engine='csr', **kwargs)
+        assert g_csr._nodes.equals(g_merge._nodes)
+        assert g_csr._edges.equals(g_merge._edges)
+
+    def test_hop_engines_agree(self):
+        g = hops_graph()
+        for direction in ['forward', 'reverse', 'undirected']:
+            for nodes in [None, pd.DataFrame({g._node: ['d', 'k']}), pd.DataFrame({g._node: ['b']})]:
+                for hops in [0, 1, 2, 3]:
+                    self.assert_same(g, nodes=nodes, hops=hops, direction=direction)
+                    self.assert_same(g, nodes=nodes, hops=hops, direction=direction, return_as_wave_front=True)
+                self.assert_same(g, nodes=nodes, to_fixed_point=True, direction=direction)
+
+    def test_hop_engines_agree_predicates(self):
+        g = hops_graph()
+        self.assert_same(g, hops=2, edge_match={'s': 'd'})
+        self.assert_same(g, destination_node_match={'node': 'b'})
+        self.assert_same(g, source_node_match={'node': 'e'}, destination_node_match={'node': 'l'})
+        self.assert_same(g, to_fixed_point=True, direction='undirected', destination_node_match={'type': 'n'})
+
+    def test_hop_engines_agree_edge_binding(self):
+        g = hops_graph()
+        g = g.edges(g._edges.assign(eid=range(len(g._edges))), edge='eid')
+        self.assert_same(g, nodes=pd.DataFrame({g._node: ['d']}), hops=2)
+        self.assert_same(g, nodes=pd.DataFrame({g._node: ['j']}), to_fixed_point=True, direction='undirected')
+
+    def test_hop_engine_invalid(self):
+        g = hops_graph()
+        with self.assertRaises(ValueError):
+            g.hop(engine='nope')
+
+    def test_hop_engines_agree_fixed_point_random(self):
+        import numpy as np
+        rng = np.random.default_rng(0)
+        edges = pd.DataFrame({'s': rng.integers(0, 60, 150), 'd': rng.integers(0, 60, 150)})
+        g = CGFull().edges(edges, 's', 'd').materialize_nodes()
+        seeds = pd.DataFrame({g._node: [0, 1, 2]})
+        for direction in ['forward', 'reverse', 'undirected']:
+            self.assert_same(g, nodes=seeds, to_fixed_point=True, direction=direction)
+            self.assert_same(g, nodes=seeds, to_fixed_point=True, direction=direction, return_as_wave_front=True)
+            self.assert_same(g, nodes=seeds, hops=4, direction=direction)
+
+    def test_hop_fixed_point_long_cycle(self):
+        n = 500
+        edges = pd.DataFrame({'s': list(range(n)), 'd': list(range(1, n)) + [0]})
+        g = CGFull().edges(edges, 's', 'd')
+        g2 = g.hop(pd.DataFrame({'id': [0]}), to_fixed_point=True, engine='csr')
+        assert len(g2._edges) == n
+        assert len(g2._nodes) == n
@@ -1,10 +1,11 @@
 import unittest
 import pytest
+from collections import Counter
 import graphistry
 import pandas as pd
 from graphistry.util import setup_logger
 
-from graphistry.dgl_utils import lazy_dgl_import_has_dependency
+from graphistry.dgl_utils import lazy_dgl_import_has_dependency, reindex_edgelist
 
 has_dgl, _, dgl = lazy_dgl_import_has_dependency()
 
@@ -71,6 +72,37 @@ X_edges = pd.DataFrame(
 )
 
 
+class TestReindexEdgelist(unittest.TestCase):
+
+    def test_matches_counter_order(self):
+        df = pd.DataFrame({"s": ["c", "a", "b", "a", "d"], "d": ["a", "e", "c", "b", "c"]})
+        cnt = Counter(pd.concat([df.s, df.d], axis=0))
+        expected = {k: i for i, (k, c) in enumerate(cnt.most_common())}
+        out, ordered_nodes_dict = reindex_edgelist(df.copy(), "s", "d")
+        assert ordered_nodes_dict == expected
+        assert list(ordered_nodes_dict) == list(expected)
+        assert out[graphistry.constants.SRC].tolist() == [expected[x] for x in df.s]
+        assert out[graphistry.constants.DST].tolist() == [expected[x] for x in df.d]
+        assert out[graphistry.constants.SRC].dtype == "int64"
+
+    def test_null_endpoints(self):
+        df = pd.DataFrame({"s": ["a", "b", None], "d": ["b", "c", "a"]})
+        cnt = Counter(pd.concat([df.s, df.d], axis=0))
+        expected = {k: i for i, (k, c) in enumerate(cnt.most_common())}
+        out, ordered_nodes_dict = reindex_edgelist(df.copy(), "s", "d")
+        assert ordered_nodes_dict == expected
+        assert list(ordered_nodes_dict) == list(expected)
+        assert out[graphistry.constants.SRC].tolist() == [expected[x] for x in df.s]
+        assert out[graphistry.constants.DST].tolist() == [expected[x] for x in df.d]
+
+    def test_order_by_appearance(self):
+        df = pd.DataFrame({"s": [3, 1, 1], "d": [2, 2, 2]})
+        out, ordered_nodes_dict = reindex_edgelist(df, "s", "d", order_by_count=False)
+        assert ordered_nodes_dict == {3: 0, 1: 1, 2: 2}
+        assert out[graphistry.constants.SRC].tolist() == [0, 1, 1]
+        assert out[graphistry.constants.DST].tolist() == [2, 2, 2]
+
+
 class TestDGL(unittest.TestCase):
     def _test_cases_dgl(self, g):
         # simple test to see if DGL graph was set during different featurization + umap strategies
@@ -5,7 +5,7 @@ import unittest
 import graphistry
 import numpy as np
 
-from graphistry.embed_utils import lazy_embed_import_dep, check_cudf
+from graphistry.embed_utils import lazy_embed_import_dep, check_cudf, link_candidate_blocks, top_k_per_head, SubgraphIterator
 
 import logging
 logger = logging.getLogger(__name__)
@@ -107,6 +107,70 @@ class TestEmbed(unittest.TestCase):
             self.assertNotEqual(np.linalg.norm(g._kg_embeddings - g2._kg_embeddings), 0)
 
 
+class TestSubgraphIterator(unittest.TestCase):
+
+    @pytest.mark.skipif(not dep_flag, reason="requires ai feature dependencies")
+    def test_steps(self):
+        import dgl, torch
+        src, dst = torch.tensor([0, 1, 2, 3, 4, 0]), torch.tensor([1, 2, 3, 4, 0, 2])
+        g = dgl.graph((src, dst), num_nodes=5)
+        g.edata[dgl.ETYPE] = torch.tensor([0, 1, 0, 1, 0, 1])
+        it = SubgraphIterator(g, sample_size=3, num_steps=4, buffer_steps=3)
+        self.assertEqual(len(it), 4)
+
+        seen = []
+        for i in range(len(it)):
+            sub_g, samples, labels = it[i]
+            self.assertEqual(samples.shape, (6, 3))
+            self.assertEqual(labels.tolist(), [1, 1, 1, 0, 0, 0])
+            self.assertTrue(torch.allclose(sub_g.edata["norm"], dgl.norm_by_dst(sub_g).unsqueeze(-1)))
+            positives, negatives = samples[:3], samples[3:]
+            # negatives keep the relation and one endpoint of their positive
+            self.assertTrue((negatives[:, 1] == positives[:, 1]).all())
+            self.assertTrue(((negatives[:, 0] == positives[:, 0]) | (negatives[:, 2] == positives[:, 2])).all())
+            seen += [tuple(t) for t in positives.tolist()]
+        # the first 6 sampled edges are one shuffled pass over all edges
+        self.assertEqual(sorted(seen[:6]), sorted(zip(src.tolist(), [0, 1, 0, 1, 0, 1], dst.tolist())))
+
+
+class TestLinkCandidates(unittest.TestCase):
+
+    def all_candidates(self, triplets, num_nodes):
+        """Candidates as predict_links_all enumerated them before blocking"""
+        h_r = pd.DataFrame(triplets)
+        t_r = h_r.copy()
+        t_r[[0, 1, 2]] = t_r[[2, 1, 0]]
+
+        def fetch(x_r):
+            existing = pd.DataFrame(x_r.groupby(by=[0, 1])[2].apply(set)).reset_index()
+            missing = existing[2].map(lambda x: set(range(num_nodes)).difference(x))
+            return pd.concat([existing[[0, 1]], missing], axis=1).explode(2)
+
+        out = pd.concat([fetch(h_r), fetch(t_r)], axis=0).dropna()
+        out = out[out[0] < out[2]]
+        return set(map(tuple, out.drop_duplicates().to_numpy().astype(np.int64).tolist()))
+
+    def test_blocks_match_all_candidates(self):
+        rng = np.random.default_rng(0)
+        triplets = np.c_[rng.integers(0, 30, 200), rng.integers(0, 4, 200), rng.integers(0, 30, 200)]
+        expected = self.all_candidates(triplets, 30)
+        for block_size in [1, 50, 2 ** 20]:
+            blocks = list(link_candidate_blocks(triplets, 30, block_size))
+            got = [tuple(t) for block in blocks for t in block.tolist()]
+            self.assertEqual(len(got), len(set(got)))
+            self.assertEqual(set(got), expected)
+            self.assertTrue(max(len(b) for b in blocks) <= max(block_size, 30))
+        self.assertEqual(list(link_candidate_blocks(np.zeros((0, 3)), 30)), [])
+
+    def test_top_k_per_head(self):
+        triplets = np.array([[0, 0, 1], [0, 0, 2], [0, 1, 3], [1, 0, 2], [2, 0, 3]])
+        scores = np.array([0.6, 0.9, 0.7, 0.8, 0.1])
+        kept, kept_scores = top_k_per_head(triplets, scores, 2)
+        self.assertEqual(sorted(map(tuple, kept.tolist())), [(0, 0, 2), (0, 1, 3), (1, 0, 2), (2, 0, 3)])
+        kept, kept_scores = top_k_per_head(triplets, scores, 1, lowest=True)
+        self.assertEqual(kept_scores.tolist(), [0.6, 0.8, 0.1])
+
+
 class TestEmbedCUDF(unittest.TestCase):
 
     @pytest.mark.skipif(not dep_flag, reason="requires ai feature dependencies")
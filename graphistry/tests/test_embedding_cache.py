@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+import mock, numpy as np, os, tempfile, unittest
+
+from graphistry.embedding_cache import EmbeddingCache, encode_texts
+
+
+class FakeModel:
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, batch_size=32):
+        self.calls.append((list(texts), batch_size))
+        return np.array([[len(t), ord(t[0]) if t else 0, 1.5] for t in texts], dtype=np.float32)
+
+
+class TestEncodeTexts(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_dedupes_without_cache(self):
+        model = FakeModel()
+        out = encode_texts(model, np.array(['aa', 'b', 'aa', 'b']), batch_size=7)
+        assert model.calls == [(['aa', 'b'], 7)]
+        assert out.tolist() == [[2, 97, 1.5], [1, 98, 1.5], [2, 97, 1.5], [1, 98, 1.5]]
+
+    def test_cache_across_sessions(self):
+        model = FakeModel()
+        first = encode_texts(model, ['x', 'yy', 'x'], 'm', cache=EmbeddingCache(self.dir.name))
+        # new cache instance over the same directory, like a later session
+        second = encode_texts(model, ['yy', 'zzz', 'x'], 'm', cache=EmbeddingCache(self.dir.name))
+        assert [texts for texts, _ in model.calls] == [['x', 'yy'], ['zzz']]
+        assert first.tolist() == [[1, 120, 1.5], [2, 121, 1.5], [1, 120, 1.5]]
+        assert second.tolist() == [[2, 121, 1.5], [3, 122, 1.5], [1, 120, 1.5]]
+
+    def test_cache_keyed_by_model(self):
+        model = FakeModel()
+        cache = EmbeddingCache(self.dir.name)
+        encode_texts(model, ['x'], 'm1', cache=cache)
+        encode_texts(model, ['x'], 'm2', cache=cache)
+        assert len(model.calls) == 2
+
+    def test_indexes_only_new_shards(self):
+        model = FakeModel()
+        reader, writer = EmbeddingCache(self.dir.name), EmbeddingCache(self.dir.name)
+        encode_texts(model, ['a'], 'm', cache=writer)
+        encode_texts(model, ['a'], 'm', cache=reader)
+        encode_texts(model, ['b'], 'm', cache=writer)
+        loaded = []
+        real_load = np.load
+
+        def load(path, *args, **kwargs):
+            loaded.append(os.path.basename(path))
+            return real_load(path, *args, **kwargs)
+
+        with mock.patch('graphistry.embedding_cache.np.load', load):
+            encode_texts(model, ['a', 'b'], 'm', cache=reader)
+        assert len([name for name in loaded if name.endswith('.keys.npy')]) == 1
+        assert [texts for texts, _ in model.calls] == [['a'], ['b']]
+
+    def test_compacts_shards(self):
+        model = FakeModel()
+        cache = EmbeddingCache(self.dir.name, max_shards=4)
+        for text in ['a', 'bb', 'ccc', 'dddd', 'eeeee', 'ffffff']:
+            encode_texts(model, [text], 'm', cache=cache)
+        (model_dir,) = os.listdir(self.dir.name)
+        assert len([f for f in os.listdir(os.path.join(self.dir.name, model_dir)) if f.endswith('.keys.npy')]) <= 4
+        model.calls = []
+        texts = ['a', 'bb', 'ccc', 'dddd', 'eeeee', 'ffffff']
+        for c in [cache, EmbeddingCache(self.dir.name)]:
+            out = encode_texts(model, texts, 'm', cache=c)
+            assert out[:, 0].tolist() == [1, 2, 3, 4, 5, 6]
+        assert model.calls == []
+
+    def test_evicts_least_recently_used(self):
+        model = FakeModel()
+        cache = EmbeddingCache(self.dir.name)
+        encode_texts(model, ['a'], 'm', cache=cache)
+        shard_bytes = sum(
+            os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(self.dir.name) for f in files
+        )
+        cache.max_bytes = 2 * shard_bytes
+        encode_texts(model, ['b'], 'm', cache=cache)
+        old = os.path.getmtime(self.dir.name) - 100
+        for root, _, files in os.walk(self.dir.name):
+            for f in files:
+                os.utime(os.path.join(root, f), (old, old))
+        encode_texts(model, ['a'], 'm', cache=cache)  # hit refreshes 'a'
+        encode_texts(model, ['c'], 'm', cache=cache)  # evicts 'b'
+        model.calls = []
+        encode_texts(model, ['a', 'b', 'c'], 'm', cache=EmbeddingCache(self.dir.name))
+        assert [texts for texts, _ in model.calls] == [['b']]
+
+    def test_evict_keeps_other_indexes(self):
+        model = FakeModel()
+        cache = EmbeddingCache(self.dir.name)
+        encode_texts(model, ['a'], 'm1', cache=cache)
+        shard_bytes = sum(
+            os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(self.dir.name) for f in files
+        )
+        cache.max_bytes = 2 * shard_bytes
+        encode_texts(model, ['b'], 'm2', cache=cache)
+        with mock.patch('graphistry.embedding_cache.os.walk') as walk:
+            encode_texts(model, ['b'], 'm2', cache=cache)
+        assert walk.call_count == 0  # under max_bytes: no directory walk
+
+        old = os.path.getmtime(self.dir.name) - 100
+        for root, _, files in os.walk(self.dir.name):
+            for f in files:
+                os.utime(os.path.join(root, f), (old, old))
+        encode_texts(model, ['b'], 'm2', cache=cache)  # hit refreshes 'b'
+        encode_texts(model, ['c'], 'm2', cache=cache)  # evicts 'a'
+        model.calls = []
+        with mock.patch('graphistry.embedding_cache.np.load', wraps=np.load) as load:
+            encode_texts(model, ['b', 'c'], 'm2', cache=cache)
+        assert not any(str(c.args[0]).endswith('.keys.npy') for c in load.call_args_list)  # no rescan
+        assert model.calls == []
+        encode_texts(model, ['a'], 'm1', cache=cache)
+        assert [texts for texts, _ in model.calls] == [['a']]
+
+
+if __name__ == "__main__":
+    unittest.main()
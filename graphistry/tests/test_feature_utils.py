@@ -1,9 +1,13 @@
 # python -m unittest
 import datetime as dt
+import gc
 import graphistry
 import logging
+import mock
 import numpy as np
+import os
 import pandas as pd
+import tempfile
 from typing import Any
 
 import pytest
@@ -16,8 +20,20 @@ from graphistry.feature_utils import (
     resolve_feature_engine,
     lazy_import_has_min_dependancy,
     lazy_import_has_dependancy_text,
-    FastEncoder
+    FastEncoder,
+    densify,
+    encode_edges,
+    get_edge_encoder,
+    to_model_input,
+    encoder_from_artifacts,
+    encoder_to_artifacts,
+    fit_encoder,
+    fit_transform_chunked,
+    reuse_featurization,
+    smart_scaler,
+    EdgeHashEncoder
 )
+from graphistry.model_registry import ModelRegistry, fit_fingerprint
 
 from graphistry.features import topic_model, ngrams_model
 from graphistry.constants import SCALERS
@@ -311,6 +327,181 @@ class TestFeatureProcessors(unittest.TestCase):
         assert y.shape == (4, 4)
         assert sum(y.sum(1).values - np.array([1., 2., 1., 0.])) == 0
         
+class TestSparseFeatures(unittest.TestCase):
+
+    def test_encode_edges_sparse(self):
+        from sklearn.preprocessing import MultiLabelBinarizer
+        edf = pd.DataFrame({'src': ['a', 'b', 'c'], 'dst': ['b', 'c', 'a'], 'w': [1.0, 2.0, 3.0]})
+        T, mlb = encode_edges(edf, 'src', 'dst', MultiLabelBinarizer(sparse_output=True), fit=True)
+        assert all(isinstance(dtype, pd.SparseDtype) for dtype in T.dtypes)
+        assert list(T.columns) == ['a', 'b', 'c']
+        np.testing.assert_array_equal(
+            densify(T).values, [[1., 1., 0.], [0., 1., 1.], [1., 0., 1.]]
+        )
+        T2, _ = encode_edges(edf.iloc[:1], 'src', 'dst', mlb, fit=False)
+        np.testing.assert_array_equal(densify(T2).values, [[1., 1., 0.]])
+
+    def test_encode_edges_hash(self):
+        edf = pd.DataFrame({'src': ['a', 'b', 'c', 'c'], 'dst': ['b', 'c', 'a', 'c']})
+        T, enc = encode_edges(edf, 'src', 'dst', get_edge_encoder('hash', 16), fit=True)
+        assert isinstance(enc, EdgeHashEncoder)
+        assert T.shape == (4, 16)
+        assert list(T.columns) == [f'edge_hash_{i}' for i in range(16)]
+        X = densify(T).values
+        assert (np.abs(X).sum(axis=1) <= [2, 2, 2, 1]).all()
+        assert np.abs(X[3]).sum() == 1  # self-loop counts its node once
+
+        # same ids hash the same, in either position and whether ints or strings
+        T2, _ = encode_edges(pd.DataFrame({'src': ['b'], 'dst': ['a']}), 'src', 'dst', enc, fit=False)
+        np.testing.assert_array_equal(densify(T2).values[0], X[0])
+        T3, _ = encode_edges(pd.DataFrame({'src': [1], 'dst': ['z']}), 'src', 'dst', enc, fit=False)
+        T4, _ = encode_edges(pd.DataFrame({'src': ['1'], 'dst': ['z']}), 'src', 'dst', enc, fit=False)
+        np.testing.assert_array_equal(densify(T3).values, densify(T4).values)
+        assert np.abs(densify(T3).values).sum() > 0  # unseen nodes still encode
+
+        with self.assertRaises(ValueError):
+            get_edge_encoder('nope')
+
+    def test_to_model_input_keeps_column_order(self):
+        import scipy.sparse
+        sparse = pd.DataFrame.sparse.from_spmatrix(
+            scipy.sparse.csr_matrix(np.array([[0., 1.], [2., 0.], [0., 0.]])), columns=['s1', 's2']
+        )
+        X = pd.concat([
+            pd.DataFrame({'d1': [1., 2., 3.]}), sparse, pd.DataFrame({'d2': [4., 5., 6.]})
+        ], axis=1)
+        M = to_model_input(X)
+        assert scipy.sparse.isspmatrix_csr(M)
+        np.testing.assert_array_equal(M.toarray(), densify(X).values)
+        assert list(densify(X).columns) == ['d1', 's1', 's2', 'd2']
+        assert not any(isinstance(dtype, pd.SparseDtype) for dtype in densify(X).dtypes)
+
+        dense = pd.DataFrame({'d1': [1., 2.]})
+        assert to_model_input(dense) is dense
+        assert densify(dense) is dense
+
+    def test_scaling_keeps_sparse_columns(self):
+        import scipy.sparse
+        sparse = pd.DataFrame.sparse.from_spmatrix(
+            scipy.sparse.csr_matrix(np.array([[0., 2.], [1., 0.], [0., 4.], [0., 0.]])), columns=['s1', 's2']
+        )
+        X = pd.concat([pd.DataFrame({'d1': [1., 2., 3., 30.]}), sparse], axis=1)
+        X_scaled, _, pipeline, _ = smart_scaler(X, pd.DataFrame([]), 'minmax', None)
+        assert list(X_scaled.columns) == ['d1', 's1', 's2']
+        assert [isinstance(dtype, pd.SparseDtype) for dtype in X_scaled.dtypes] == [False, True, True]
+        np.testing.assert_allclose(X_scaled['d1'].values, [0., 1 / 29, 2 / 29, 1.], atol=1e-5)
+        np.testing.assert_array_equal(densify(X_scaled[['s1', 's2']]).values, [[0., .5], [1., 0.], [0., 1.], [0., 0.]])
+
+        encoder = FastEncoder(X, kind='nodes')
+        X2, _ = encoder._scale_transformed(X.iloc[:2], None, pipeline, None)
+        pd.testing.assert_frame_equal(X2, X_scaled.iloc[:2], atol=1e-5)
+
+
+class TestEncoderArtifacts(unittest.TestCase):
+
+    def test_stored_encoder_roundtrip(self):
+        from graphistry.artifact_store import ArtifactStore
+        df = pd.DataFrame({'a': [1.0, 2.0, 3.0]})
+        encoder = FastEncoder(df, kind='nodes')
+        X = pd.DataFrame({'a': [0.0, 0.5, 1.0]})
+        y = pd.DataFrame([], index=df.index)
+        encoder._set_result([df, y, X, y, 'data_encoder', None, 'scaler', None, None, []])
+
+        artifacts = encoder_to_artifacts(encoder)
+        assert artifacts['encoder']._df.empty and artifacts['encoder'].X is None
+        assert encoder.X is X  # fitted encoder left intact
+
+        with tempfile.TemporaryDirectory() as path:
+            ArtifactStore(path).put('k', artifacts)
+            loaded = encoder_from_artifacts(ArtifactStore(path).get('k'))
+        pd.testing.assert_frame_equal(loaded.X, X)
+        pd.testing.assert_frame_equal(loaded.X_orignal, df)
+        assert loaded.res[4:] == ['data_encoder', None, 'scaler', None, None, []]
+        pd.testing.assert_frame_equal(loaded.res[2], X)
+
+
+    def test_registry_keeps_slim_encoder(self):
+        df = pd.DataFrame({'a': [1.0, 2.0, 3.0]})
+        X = pd.DataFrame({'a': [0.0, 0.5, 1.0]})
+        y = pd.DataFrame([], index=df.index)
+
+        def fit(self, src=None, dst=None, **kwargs):
+            self.src, self.dst = src, dst
+            self._set_result([self._df, y, X, y, 'data_encoder', None, None, None, None, []])
+
+        registry = ModelRegistry()
+        with mock.patch.object(FastEncoder, 'fit', fit), mock.patch('graphistry.feature_utils.MODEL_REGISTRY', registry), \
+                mock.patch('graphistry.feature_utils.transform', return_value=(X, pd.DataFrame([]))) as transform:
+            first = fit_encoder(df, y, 'nodes', fit_fingerprint('featurize-nodes', {'df': df}))
+            (slim,) = [registry.get(k) for k in registry.keys()]
+            assert slim._df.empty and slim.X is None and slim.res[:4] == [None] * 4
+            second = fit_encoder(df, y, 'nodes', fit_fingerprint('featurize-nodes', {'df': df}))
+        assert first.X is X
+        assert transform.call_count == 1
+        pd.testing.assert_frame_equal(second.X, X)
+        assert second._df is df and second.res[4] == 'data_encoder'
+
+    def test_reuse_featurization_precomputed_hash(self):
+        df = pd.DataFrame({'a': [1.0, 2.0, 3.0]})
+        g = graphistry.nodes(df)
+        with mock.patch('graphistry.util.hash_memoize') as hash_memoize:
+            assert reuse_featurization(g, True, {'X': df}, 'h') is False
+            assert reuse_featurization(g, True, {'X': df}, 'h') is g
+        assert hash_memoize.call_count == 0
+
+    def test_store_failure_still_fits(self):
+        df = pd.DataFrame({'a': [1.0, 2.0, 3.0]})
+        y = pd.DataFrame([], index=df.index)
+
+        def fit(self, src=None, dst=None, **kwargs):
+            self._set_result([self._df, y, self._df, y, 'data_encoder', None, None, None, None, []])
+
+        store = mock.Mock()
+        store.get.return_value = None
+        store.put.side_effect = OSError('No space left on device')
+        with mock.patch.object(FastEncoder, 'fit', fit), mock.patch('graphistry.feature_utils.MODEL_REGISTRY', ModelRegistry()), \
+                mock.patch('graphistry.artifact_store.configured_artifact_store', return_value=store):
+            with self.assertLogs(level='WARNING'):
+                encoder = fit_encoder(df, y, 'nodes', fit_fingerprint('featurize-nodes', {'df': df}))
+        assert store.put.call_count == 1
+        pd.testing.assert_frame_equal(encoder.X, df)
+
+
+class TestFitTransformChunked(unittest.TestCase):
+
+    def _fit_transform(self, **kwargs):
+        df = pd.DataFrame({'a': [1.0, 2.0, 3.0, 4.0, 5.0]})
+        y = pd.DataFrame([], index=df.index)
+
+        def fit(self, src=None, dst=None, **kwargs):
+            self._set_result([self._df, y, self._df, y, 'data_encoder', None, None, None, None, []])
+
+        def transform_scaled(self, df, ydf=None):
+            return df * 2, ydf
+
+        with mock.patch.object(FastEncoder, 'fit', fit), \
+                mock.patch.object(FastEncoder, 'transform_scaled', transform_scaled):
+            return fit_transform_chunked(df, y, 'nodes', chunk_size=2, **kwargs)
+
+    def test_temp_features_removed_when_collected(self):
+        with tempfile.TemporaryDirectory() as d, mock.patch('tempfile.tempdir', d):
+            _, X_enc, _ = self._fit_transform()
+            np.testing.assert_allclose(X_enc['a'].values, [2.0, 4.0, 6.0, 8.0, 10.0])
+            (name,) = os.listdir(d)
+            assert name.startswith('graphistry_features_')
+            del X_enc
+            gc.collect()
+            assert os.listdir(d) == []
+
+    def test_features_path_kept(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'features.npy')
+            _, X_enc, _ = self._fit_transform(features_path=path)
+            del X_enc
+            gc.collect()
+            assert os.path.exists(path)
+
+
 class TestFeatureMethods(unittest.TestCase):
 
     def _check_attributes(self, g, attributes):
@@ -437,6 +628,32 @@ class TestFeatureMethods(unittest.TestCase):
                                   use_scaler_target=np.random.choice(SCALERS), 
                                   return_scalers=True)
 
+    @pytest.mark.skipif(not has_min_dependancy or not has_min_dependancy_text, reason="requires ai feature dependencies")
+    def test_node_featurization_chunked(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, 'features.npy')
+            g = graphistry.nodes(ndf_reddit)
+            # fit on every row so chunked output matches the one-shot fit
+            g2 = g.featurize(X=['title'], y='label', use_scaler=None, use_scaler_target=None,
+                             chunk_size=7, fit_sample_size=len(ndf_reddit), features_path=path)
+            g3 = g.featurize(X=['title'], y='label', use_scaler=None, use_scaler_target=None, memoize=False)
+            assert os.path.exists(path)
+            assert g2._node_features.shape == g3._node_features.shape
+            assert all(g2._node_features.columns == g3._node_features.columns)
+            assert (g2._node_features.index == ndf_reddit.index).all()
+            np.testing.assert_allclose(g2._node_features.values, g3._node_features.values, atol=1e-5)
+            assert len(g2._node_target) == len(ndf_reddit)
+            del g2
+
+    @pytest.mark.skipif(not has_min_dependancy or not has_min_dependancy_text, reason="requires ai feature dependencies")
+    def test_process_nodes_dataframes_n_jobs(self):
+        kwargs = dict(use_ngrams=True, ngram_range=(1, 1), use_scaler=None, use_scaler_target=None,
+                      cardinality_threshold=1000, feature_engine=resolve_feature_engine('auto'))
+        serial = process_nodes_dataframes(ndf_reddit, double_target_reddit, n_jobs=1, **kwargs)
+        parallel = process_nodes_dataframes(ndf_reddit, double_target_reddit, n_jobs=2, **kwargs)
+        assert serial[9] == parallel[9]  # text_cols
+        assert all(serial[0].columns == parallel[0].columns)
+        np.testing.assert_array_equal(serial[0].values, parallel[0].values)
 
 
 if __name__ == "__main__":
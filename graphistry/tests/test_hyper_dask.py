@@ -5,7 +5,7 @@ from common import NoAuthTestCase
 
 from graphistry.pygraphistry import PyGraphistry
 from graphistry.Engine import Engine, DataframeLike
-from graphistry.hyper_dask import HyperBindings, hypergraph
+from graphistry.hyper_dask import HyperBindings, entity_ids, hypergraph
 from graphistry.tests.test_hypergraph import (
     triangleNodes,
     assertFrameEqual,
@@ -232,6 +232,20 @@ def test_HyperBindings_override():
     assert hb.node_type == "abc"
 
 
+def test_entity_ids():
+    for s in [
+        pd.Series(["a", None, "b", "a", np.nan]),
+        pd.Series([1.5, np.nan, 1.5]),
+        pd.Series([1, "1", 1.0, True, None]),
+        pd.Series(pd.Categorical(["x", None, "x"])),
+        pd.Series(pd.to_datetime([0, None, 0], unit="s")),
+        pd.Series(["a", None], dtype="string"),
+        pd.Series([], dtype="object"),
+    ]:
+        expected = ("c::" + s.astype(str)).tolist()
+        assert entity_ids(s, "c::").tolist() == expected
+
+
 # ###
 
 
@@ -452,6 +466,14 @@ class TestHypergraphPandas(NoAuthTestCase):
     def test_hyper_evil(self):
         hypergraph(PyGraphistry.bind(), squareEvil)
 
+    def test_n_jobs(self):
+        df = hyper_df.assign(n=[1.0, None, 2.0])
+        for kwargs in [{}, {"drop_edge_attrs": True}, {"drop_na": False}, {"opts": {"CATEGORIES": {"x": ["aa", "bb"]}}}]:
+            serial = hypergraph(PyGraphistry.bind(), df, verbose=False, n_jobs=1, **kwargs)
+            threaded = hypergraph(PyGraphistry.bind(), df, verbose=False, n_jobs=4, **kwargs)
+            for a, b in [(serial.entities, threaded.entities), (serial.edges, threaded.edges)]:
+                assertFrameEqual(a, b)
+
     def test_hyper_to_pa_vanilla(self):
 
         df = pd.DataFrame({"x": ["a", "b", "c"], "y": ["d", "e", "f"]})
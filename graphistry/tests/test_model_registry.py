@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+import numpy as np, pandas as pd, threading, unittest
+
+from graphistry.model_registry import ModelRegistry, fit_fingerprint, model_nbytes
+from graphistry.util import memoize_hash
+
+
+class Model:
+    def __init__(self, n):
+        self.weights = np.zeros(n, dtype=np.int8)
+        self.parts = [np.zeros(n, dtype=np.int8), {'w': np.zeros(n, dtype=np.int8)}]
+
+
+class TestModelRegistry(unittest.TestCase):
+
+    def test_model_nbytes(self):
+        assert model_nbytes(Model(10)) == 30
+        shared = np.zeros(10, dtype=np.int8)
+        assert model_nbytes([shared, shared]) == 10
+        assert model_nbytes(pd.DataFrame({'a': np.zeros(4)})) >= 32
+
+    def test_get_or_load_once(self):
+        registry = ModelRegistry()
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return Model(5)
+
+        m1 = registry.get_or_load('m', loader)
+        m2 = registry.get_or_load('m', loader)
+        assert m1 is m2
+        assert len(calls) == 1
+        assert registry.nbytes == 15
+
+    def test_get_or_load_concurrent(self):
+        registry = ModelRegistry()
+        b_loading = threading.Event()
+        calls = []
+
+        def load_a():
+            calls.append('a')
+            # a load of another key proceeds while this one is in progress
+            assert b_loading.wait(timeout=10)
+            return Model(1)
+
+        def load_b():
+            calls.append('b')
+            b_loading.set()
+            return Model(2)
+
+        threads = [threading.Thread(target=registry.get_or_load, args=args) for args in [('a', load_a), ('a', load_a)]]
+        for t in threads:
+            t.start()
+        registry.get_or_load('b', load_b)
+        for t in threads:
+            t.join(timeout=10)
+        assert sorted(calls) == ['a', 'b']
+        assert registry.get('a') is not None and registry.get('b') is not None
+
+    def test_lru_eviction(self):
+        registry = ModelRegistry(max_bytes=60)
+        registry.put('a', Model(10))
+        registry.put('b', Model(10))
+        assert registry.get('a') is not None  # a is now most recent
+        registry.put('c', Model(10))
+        assert registry.keys() == ['a', 'c']
+        assert registry.nbytes == 60
+        registry.put('huge', Model(100))
+        assert 'huge' not in registry
+
+    def test_explicit_evict(self):
+        registry = ModelRegistry()
+        registry.put('a', Model(1))
+        registry.put('b', Model(1))
+        registry.evict('a')
+        assert registry.keys() == ['b'] and registry.nbytes == 3
+        registry.evict()
+        assert len(registry) == 0 and registry.nbytes == 0
+
+    def test_fit_fingerprint(self):
+        df = pd.DataFrame({'a': [1, 2]})
+        k1 = fit_fingerprint('featurize-nodes', {'X': df, 'min_words': 2})
+        assert k1 == fit_fingerprint('featurize-nodes', {'X': df.copy(), 'min_words': 2})
+        assert k1 != fit_fingerprint('featurize-nodes', {'X': df, 'min_words': 3})
+        assert k1 != fit_fingerprint('featurize-edges', {'X': df, 'min_words': 2})
+        assert k1 == fit_fingerprint('featurize-nodes', hashed=memoize_hash({'X': df, 'min_words': 2}))
+        assert fit_fingerprint('featurize-nodes', {'X': lambda: None}) is None  # unhashable
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,6 +5,7 @@ import copy, datetime as dt, graphistry, os, pandas as pd, pyarrow as pa, pytest
 from common import NoAuthTestCase
 from mock import patch
 from graphistry.constants import NODE
+from graphistry.PlotterBase import PlotterBase
 from graphistry.tests.test_hyper_dask import assertFrameEqualDask
 
 maybe_cudf = None
@@ -514,11 +515,52 @@ class TestPlotterArrowConversions(NoAuthTestCase):
         plotter = graphistry.bind()
         df = pd.DataFrame({"x": [0]})
         arr1 = plotter._table_to_arrow(df)
-        for i in range(1, 110):
-            plotter._table_to_arrow(pd.DataFrame({"x": [i]}))
+        with patch.object(PlotterBase._pd_hash_to_arrow, "max_bytes", 50 * arr1.nbytes):
+            for i in range(1, 110):
+                plotter._table_to_arrow(pd.DataFrame({"x": [i]}))
+            assert PlotterBase._pd_hash_to_arrow.nbytes <= 50 * arr1.nbytes
 
         assert not (arr1 is plotter._table_to_arrow(df))
 
+    def test_api3_pdf_to_arrow_memoization_changed_values(self):
+        plotter = graphistry.bind()
+        df = pd.DataFrame({"x": list(range(10000))})
+        arr1 = plotter._table_to_arrow(df)
+        df2 = df.copy()
+        df2.loc[5001, "x"] = -1  # outside the sampled rows, so only the full hash sees it
+        arr2 = plotter._table_to_arrow(df2)
+        assert not (arr1 is arr2)
+        assert arr2.column("x")[5001].as_py() == -1
+
+        df["x"] = df["x"] + 1
+        arr3 = plotter._table_to_arrow(df)
+        assert arr3.column("x")[0].as_py() == 1
+
+    def test_api3_pdf_to_arrow_memoization_in_place_edit(self):
+        plotter = graphistry.bind()
+        df = pd.DataFrame({"x": list(range(10000))})
+        arr1 = plotter._table_to_arrow(df)
+        df.loc[5001, "x"] = -1  # same object, outside the sampled rows
+        arr2 = plotter._table_to_arrow(df)
+        assert not (arr1 is arr2)
+        assert arr2.column("x")[5001].as_py() == -1
+
+    def test_api3_pdf_to_arrow_memoization_version(self):
+        plotter = graphistry.bind()
+        df = pd.DataFrame({"x": [1, 2]})
+        df.attrs["graphistry_memoize_version"] = "v1"
+        arr1 = plotter._table_to_arrow(df)
+
+        df2 = pd.DataFrame({"x": [1, 2]})
+        df2.attrs["graphistry_memoize_version"] = "v1"
+        assert plotter._table_to_arrow(df2) is arr1
+
+        df.loc[0, "x"] = 3
+        df.attrs["graphistry_memoize_version"] = "v2"
+        arr3 = plotter._table_to_arrow(df)
+        assert not (arr1 is arr3)
+        assert arr3.column("x")[0].as_py() == 3
+
     @pytest.mark.skipif(
         not ("TEST_CUDF" in os.environ and os.environ["TEST_CUDF"] == "1"),
         reason="cudf tests need TEST_CUDF=1",
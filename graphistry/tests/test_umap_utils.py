@@ -7,6 +7,7 @@ import graphistry
 
 import os
 import logging
+import mock
 import numpy as np
 import pandas as pd
 from graphistry import Plottable
@@ -29,6 +30,7 @@ from graphistry.umap_utils import (
     lazy_umap_import_has_dependancy,
     lazy_cuml_import_has_dependancy,
     lazy_cudf_import_has_dependancy,
+    sample_positions,
 )
 
 has_dependancy, _ = lazy_import_has_min_dependancy()
@@ -86,6 +88,74 @@ def _eq(df1, df2):
     return df1 == df2
 
 
+class FakeUMAP:
+    """Projects onto the first two features and links consecutive fit rows"""
+
+    def fit(self, X, y=None):
+        import scipy.sparse
+        self.fit_rows = len(X)
+        self.embedding_ = np.asarray(X)[:, :2].astype(np.float32)
+        n = len(X)
+        self.graph_ = scipy.sparse.coo_matrix((np.ones(n - 1), (np.arange(n - 1), np.arange(1, n))), shape=(n, n))
+        return self
+
+    def transform(self, X):
+        return np.asarray(X)[:, :2]
+
+
+class TestSampledUMAP(unittest.TestCase):
+
+    def test_sample_positions(self):
+        pos = sample_positions(100, 10)
+        assert len(pos) == 10 and (np.diff(pos) > 0).all()
+        assert (sample_positions(5, 10) == np.arange(5)).all()
+
+        strata = np.array(['common'] * 95 + ['rare'] * 5)
+        pos = sample_positions(100, 10, strata)
+        assert (strata[pos] == 'rare').sum() == 1
+        assert (strata[pos] == 'common').sum() == 10
+        assert (sample_positions(100, 10, strata) == pos).all()  # fixed seed
+
+    def test_sample_positions_missing_strata(self):
+        strata = np.array(['a'] * 8 + [None] * 2, dtype=object)
+        pos = sample_positions(10, 5, strata)
+        assert sum(strata[p] is None for p in pos) == 1
+
+        # pandas < 1.5 only accepts na_sentinel=None
+        factorize = pd.factorize
+
+        def old_factorize(values, sort=False, na_sentinel=-1, **kwargs):
+            if kwargs:
+                raise TypeError(f"factorize() got an unexpected keyword argument {list(kwargs)[0]!r}")
+            assert na_sentinel is None
+            return factorize(values, sort=sort, use_na_sentinel=False)
+
+        with mock.patch('pandas.factorize', old_factorize):
+            assert (sample_positions(10, 5, strata) == pos).all()
+
+    def test_fit_transform_sampled(self):
+        X = pd.DataFrame({'a': np.arange(20.0), 'b': np.arange(20.0) % 3}, index=np.arange(100, 120))
+        g = graphistry.nodes(X)
+        g._umap = FakeUMAP()
+        g.engine = 'umap_learn'
+        g._n_neighbors = 3
+        g._n_components = 2
+        emb = g._umap_fit_transform_sampled(X, None, sample_size=5, transform_batch_size=4, n_jobs=2)
+        assert g._umap.fit_rows == 5
+        np.testing.assert_array_equal(emb.values, X.values)
+        assert list(emb.index) == list(X.index)
+
+        edges = g._weighted_edges_df
+        fit_pos = sample_positions(20, 5)
+        rest = np.setdiff1d(np.arange(20), fit_pos)
+        # fitted graph remapped to all-row positions, plus n_neighbors sampled rows per projected row
+        assert len(edges) == 4 + 3 * len(rest)
+        attached = edges[edges['_src_implicit'].isin(rest)]
+        assert attached['_dst_implicit'].isin(fit_pos).all()
+        assert (attached.groupby('_src_implicit')['_weight'].max() == 1.0).all()
+        assert g._weighted_adjacency.shape == (20, 20)
+
+
 class TestUMAPFitTransform(unittest.TestCase):
     # check to see that .fit and transform gives similar embeddings on same data
     @pytest.mark.skipif(not has_umap, reason="requires umap feature dependencies")
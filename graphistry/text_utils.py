@@ -1,3 +1,4 @@
+import os
 import pandas as pd
 
 from .feature_utils import FeatureMixin
@@ -6,7 +7,9 @@ from .constants import WEIGHT, DISTANCE
 from logging import getLogger
 
 from typing import (
+    List,
     TYPE_CHECKING,
+    Union,
 )  # noqa
 
 
@@ -38,29 +41,40 @@ class SearchToGraphMixin(MIXIN_BASE):
             f"found nodes: {a}, feats: {b}. Did you mutate nodes between fit?"
         )
 
-    def build_index(self, angular=False, n_trees=None):
-        # builds local index
+    def build_index(self, angular=False, n_trees=None, index_type='flat', **index_kwargs):
+        """Build the vector search index over node features, used by search() and search_graph()
+
+        Args:
+            :index_type (str, optional): 'flat' for exact search (default), 'ivf' or 'hnsw' for approximate search.
+                                        Without faiss, always exact NumPy search.
+            :index_kwargs: tuning for approximate indexes, see FaissVectorSearch: nlist and nprobe for 'ivf',
+                            hnsw_m and ef_search for 'hnsw'
+        """
         self.assert_fitted()
         self.assert_features_line_up_with_nodes()
         X = self._get_feature("nodes")
         self.search_index = FaissVectorSearch(
-            X.values
+            X.values, index_type=index_type, **index_kwargs
         )  # self._build_search_index(X, angular, n_trees, faiss=False)
 
     def _query_from_dataframe(self, qdf: pd.DataFrame, top_n: int, thresh: float):
         # Use the loaded featurizers to transform the dataframe
         vect, _ = self.transform(qdf, None, kind="nodes", return_graph=False)
 
-        results = self.search_index.search_df(vect, self._nodes, top_n)
+        if len(qdf) == 1:
+            results = self.search_index.search_df(vect, self._nodes, top_n)
+        else:
+            results = self.search_index.search_batch_df(vect, self._nodes, top_n)
         results = results.query(f"{DISTANCE} < {thresh}")
 
         return results, vect
 
-    def _query(self, query: str, top_n: int, thresh: float):
-        # build the query dataframe
+    def _query(self, query: Union[str, List[str]], top_n: int, thresh: float):
+        # build the query dataframe, one row per query
         if not hasattr(self, "search_index"):
             self.build_index()
 
+        queries = [query] if isinstance(query, str) else list(query)
         qdf = pd.DataFrame([])
 
         cols_text = self._node_encoder.text_cols  # type: ignore
@@ -71,10 +85,10 @@ class SearchToGraphMixin(MIXIN_BASE):
             )
             return pd.DataFrame([]), None
 
-        qdf[cols_text[0]] = [query]
+        qdf[cols_text[0]] = queries
         if len(cols_text) > 1:
             for col in cols_text[1:]:
-                qdf[col] = [""]
+                qdf[col] = [""] * len(queries)
 
         # this is hookey and needs to be fixed on dirty_cat side (with errors='ignore')
         # if however min_words = 0, all columns will be textual,
@@ -92,7 +106,7 @@ class SearchToGraphMixin(MIXIN_BASE):
                 dt = df[other_cols].dtypes
                 for col, v in zip(other_cols, dt.values):
                     if str(v) in ["string", "object", "category"]:
-                        qdf[col] = df.sample(1)[col].values  # so hookey
+                        qdf[col] = df.sample(1)[col].values[0]  # so hookey
                     elif str(v) in [
                         "int",
                         "float",
@@ -112,7 +126,7 @@ class SearchToGraphMixin(MIXIN_BASE):
 
     def search(
         self,
-        query: str,
+        query: Union[str, List[str]],
         cols=None,
         thresh: float = 5000,
         fuzzy: bool = True,
@@ -138,8 +152,14 @@ class SearchToGraphMixin(MIXIN_BASE):
             If an index is not yet built, it is generated `g2.build_index()` on the fly at search time.
             Otherwise, can set `g2.build_index()` to build it ahead of time.
 
+            Pass a list of queries to transform and search them in one batch:
+            ::
+
+                results, vects = g2.search(['query 1', 'query 2', ..])
+                results.groupby('_query')  # position of the query in the list
+
         Args:
-            :query (str): natural language query.
+            :query (str or list of str): natural language query, or a batch of queries.
             :cols (list or str, optional): if fuzzy=False, select which column to query.
                                             Defaults to None since fuzzy=True by defaul.
             :thresh (float, optional): distance threshold from query vector to returned results.
@@ -152,7 +172,8 @@ class SearchToGraphMixin(MIXIN_BASE):
 
         Returns:
             **pd.DataFrame, vector_encoding_of_query:**
-            rank ordered dataframe of results matching query
+            rank ordered dataframe of results matching query; for a list of queries, ordered by
+            column "_query" and then by distance
 
             vector encoding of query via given transformer/ngrams model if fuzzy=True else None
         """
@@ -271,19 +292,29 @@ class SearchToGraphMixin(MIXIN_BASE):
         return g
 
     def save_search_instance(self, savepath):
+        """Save the featurized instance to savepath and its search index next to it, at savepath + '.index'"""
         from joblib import dump  # type: ignore   # need to make this onnx or similar
 
-        self.build_index()
+        if not hasattr(self, "search_index"):
+            self.build_index()
         search = self.search_index
         del self.search_index  # can't pickle Annoy
         dump(self, savepath)
         self.search_index = search  # add it back
+        search.save(f"{savepath}.index")
         logger.info(f"Saved: {savepath}")
 
     @classmethod
-    def load_search_instance(self, savepath):
+    def load_search_instance(self, savepath, mmap=True):
+        """Load an instance saved by save_search_instance(), memory-mapping its search index when mmap=True
+
+        Instances saved without an index file rebuild the index
+        """
         from joblib import load  # type: ignore   # need to make this onnx or similar
 
         cls = load(savepath)
-        cls.build_index()
+        if os.path.exists(f"{savepath}.index"):
+            cls.search_index = FaissVectorSearch.load(f"{savepath}.index", mmap=mmap)
+        else:
+            cls.build_index()
         return cls
@@ -1,17 +1,22 @@
 import copy
+import os
+from concurrent.futures import ThreadPoolExecutor
 from time import time
 from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple, Union
 from inspect import getmodule
 
+import numpy as np
 import pandas as pd
 
 from . import constants as config
 from .constants import CUML, UMAP_LEARN
 from .feature_utils import (FeatureMixin, Literal, XSymbolic, YSymbolic,
-                            prune_weighted_edges_df_and_relabel_nodes,
-                            resolve_feature_engine)
+                            densify, prune_weighted_edges_df_and_relabel_nodes,
+                            resolve_feature_engine, to_model_input)
+from .artifact_store import configured_artifact_store
+from .model_registry import fit_fingerprint
 from .PlotterBase import Plottable, WeakValueDictionary
-from .util import check_set_memoize
+from .util import check_set_memoize, factorize_keep_na, memoize_hash
 
 import logging
 
@@ -129,7 +134,7 @@ def make_safe_gpu_dataframes(X, y, engine):
             if isinstance(value, cudf.DataFrame) and engine in ["pandas", "umap_learn", "dirty_cat"]:
                 new_kwargs[key] = value.to_pandas()
             elif isinstance(value, pd.DataFrame) and engine in ["cuml", "cu_cat"]:
-                new_kwargs[key] = cudf.from_pandas(value)
+                new_kwargs[key] = cudf.from_pandas(densify(value))
             else:
                 new_kwargs[key] = value
         return new_kwargs['X'], new_kwargs['y']
@@ -149,9 +154,9 @@ def make_safe_gpu_dataframes(X, y, engine):
 # #############################################################################
 
 
-def reuse_umap(g: Plottable, memoize: bool, metadata: Any):  # noqa: C901
+def reuse_umap(g: Plottable, memoize: bool, metadata: Any, hashed: Optional[str] = None):  # noqa: C901
     return check_set_memoize(
-        g, metadata, attribute="_umap_param_to_g", name="umap", memoize=memoize
+        g, metadata, attribute="_umap_param_to_g", name="umap", memoize=memoize, hashed=hashed
     )
 
 
@@ -170,6 +175,26 @@ def umap_graph_to_weighted_edges(umap_graph, engine, is_legacy, cfg=config):
     return _weighted_edges_df
 
 
+def sample_positions(n: int, sample_size: int, strata=None, seed: int = 0) -> np.ndarray:
+    """
+    Sorted positions of about sample_size of n rows, drawn uniformly, or per stratum in proportion to its size
+    when strata (one label per row) is given, keeping at least one row of every stratum
+    """
+    if sample_size >= n:
+        return np.arange(n)
+    rng = np.random.default_rng(seed)
+    if strata is None:
+        return np.sort(rng.choice(n, sample_size, replace=False))
+    codes, _ = factorize_keep_na(np.asarray(strata))
+    counts = np.bincount(codes)
+    quota = np.minimum(np.maximum(np.round(counts * sample_size / n), 1), counts).astype(np.int64)
+    # random rank of each row within its stratum
+    order = np.lexsort((rng.random(n), codes))
+    starts = np.r_[0, np.cumsum(counts)[:-1]]
+    rank = np.arange(n) - starts[codes[order]]
+    return np.sort(order[rank < quota[codes[order]]])
+
+
 class UMAPMixin(MIXIN_BASE):
     """
     UMAP Mixin for automagic UMAPing
@@ -281,11 +306,11 @@ class UMAPMixin(MIXIN_BASE):
             from cuml.neighbors import NearestNeighbors
 
             knn = NearestNeighbors(n_neighbors=self._n_neighbors)  # type: ignore
-            cc = self._umap.fit(X, y, knn_graph=knn)
+            cc = self._umap.fit(to_model_input(X), y, knn_graph=knn)
             knn.fit(cc.embedding_)
             self._umap.graph_ = knn.kneighbors_graph(cc.embedding_)
         else:
-            self._umap.fit(X, y)
+            self._umap.fit(to_model_input(X), y)  # sparse ngram/one-hot features stay sparse
             
         self._weighted_adjacency = self._umap.graph_
         # if changing, also update fresh_res
@@ -303,11 +328,82 @@ class UMAPMixin(MIXIN_BASE):
         if self._umap is None:
             raise ValueError("UMAP is not initialized")
         self.umap_fit(X, y, verbose=verbose)
-        emb = self._umap.transform(X)
+        emb = self._umap.transform(to_model_input(X))
         emb = self._bundle_embedding(emb, index=X.index)
         return emb
 
 
+    def _umap_fit_transform_sampled(
+        self,
+        X: pd.DataFrame,
+        y: Union[pd.DataFrame, None] = None,
+        sample_size: int = config.UMAP_FIT_ROWS,
+        strata=None,
+        transform_batch_size: int = config.UMAP_TRANSFORM_ROWS,
+        n_jobs: int = -1,
+        verbose=False
+    ):
+        """
+        Fit UMAP on a sample of rows, project the rest in parallel batches, and attach each projected row
+        to its n_neighbors nearest sampled rows in the embedding.
+
+        Fit cost depends on sample_size instead of all rows. The layout of the sample is a full UMAP layout,
+        while projected rows keep their neighborhood among sampled rows but do not influence the layout or
+        link to each other, so rare structure missing from the sample is lost; use strata to keep rare groups.
+        """
+        if self._umap is None:
+            raise ValueError("UMAP is not initialized")
+        from sklearn.neighbors import NearestNeighbors
+        timings = {}
+
+        t = time()
+        n = X.shape[0]
+        fit_pos = sample_positions(n, sample_size, strata)
+        rest_pos = np.setdiff1d(np.arange(n), fit_pos, assume_unique=True)
+        timings['sample'] = time() - t
+        logger.info(f"-Fitting UMAP on {len(fit_pos)} of {n} rows ({len(fit_pos) / max(n, 1):.1%})")
+
+        t = time()
+        y_fit = y.iloc[fit_pos] if y is not None and not y.empty else None
+        self.umap_fit(X.iloc[fit_pos], y_fit, verbose=verbose)
+        emb = np.empty((n, self._n_components), dtype=np.float32)  # type: ignore
+        emb[fit_pos] = self._umap.embedding_
+        timings['fit'] = time() - t
+
+        t = time()
+        batches = [rest_pos[i:i + transform_batch_size] for i in range(0, len(rest_pos), transform_batch_size)]
+        workers = (os.cpu_count() or 1) if n_jobs == -1 else n_jobs
+        with ThreadPoolExecutor(max(1, min(workers, len(batches) or 1))) as pool:
+            projected = pool.map(lambda pos: self._umap.transform(to_model_input(X.iloc[pos])), batches)  # type: ignore
+            for pos, batch_emb in zip(batches, projected):
+                emb[pos] = batch_emb
+        timings['transform'] = time() - t
+
+        t = time()
+        fit_edges = self._weighted_edges_df
+        src, dst, weight_col = config.SRC, config.DST, config.WEIGHT
+        sources = [fit_pos[fit_edges[src].to_numpy()]]  # type: ignore
+        targets = [fit_pos[fit_edges[dst].to_numpy()]]  # type: ignore
+        weights = [fit_edges[weight_col].to_numpy()]  # type: ignore
+        if len(rest_pos):
+            k = min(self._n_neighbors, len(fit_pos))  # type: ignore
+            dist, idx = NearestNeighbors(n_neighbors=k).fit(emb[fit_pos]).kneighbors(emb[rest_pos])
+            # fuzzy membership like UMAP's: 1 for the nearest neighbor, decaying by the mean gap to it
+            gaps = dist - dist[:, :1]
+            scale = gaps.mean(axis=1, keepdims=True)
+            sources.append(np.repeat(rest_pos, k))
+            targets.append(fit_pos[idx.ravel()])
+            weights.append(np.exp(-gaps / np.where(scale > 0, scale, 1)).ravel())
+        sources_a, targets_a, weights_a = np.concatenate(sources), np.concatenate(targets), np.concatenate(weights)
+        self._weighted_edges_df = pd.DataFrame({src: sources_a, dst: targets_a, weight_col: weights_a})
+        import scipy.sparse
+        self._weighted_adjacency = scipy.sparse.csr_matrix((weights_a, (sources_a, targets_a)), shape=(n, n))
+        timings['attach'] = time() - t
+
+        logger.info("-Sampled UMAP timings (seconds): " + ", ".join(f"{k} {v:.2f}" for k, v in timings.items()))
+        print(f"Sampled UMAP timings (seconds): {timings}") if verbose else None
+        return self._bundle_embedding(emb, index=X.index)
+
     def transform_umap(self, df: pd.DataFrame, 
                     y: Optional[pd.DataFrame] = None, 
                     kind: str = 'nodes', 
@@ -338,7 +434,7 @@ class UMAPMixin(MIXIN_BASE):
         df, y = make_safe_gpu_dataframes(df, y, 'pandas')
         X, y_ = self.transform(df, y, kind=kind, return_graph=False, verbose=verbose)
         X, y_ = make_safe_gpu_dataframes(X, y_, self.engine)  # type: ignore
-        emb = self._umap.transform(X)  # type: ignore
+        emb = self._umap.transform(to_model_input(X))  # type: ignore
         emb = self._bundle_embedding(emb, index=df.index)
         if return_graph and kind not in ["edges"]:
             emb, _ = make_safe_gpu_dataframes(emb, None, 'pandas')  # for now so we don't have to touch infer_edges, force to pandas
@@ -378,10 +474,13 @@ class UMAPMixin(MIXIN_BASE):
         memoize: bool,
         featurize_kwargs,
         verbose = False,
+        sample_kwargs: Optional[Dict[str, Any]] = None,
         **umap_kwargs,
     ):
         """
         Returns res mutated with new _xy
+
+        With sample_kwargs, fits on a sample of rows via _umap_fit_transform_sampled(**sample_kwargs)
         """
         #from .features import ModelDict
         umap_kwargs_pure = umap_kwargs.copy()
@@ -389,11 +488,17 @@ class UMAPMixin(MIXIN_BASE):
         logger.debug("process_umap before kwargs: %s", umap_kwargs)
         umap_kwargs.update({"kind": kind, "X": X_, "y": y_})
         umap_kwargs_reuse = {**umap_kwargs, "featurize_kwargs": featurize_kwargs or {}}
+        if sample_kwargs is not None:
+            umap_kwargs_reuse["sample_kwargs"] = {
+                k: v for k, v in sample_kwargs.items() if k != "strata"
+            }
+            if sample_kwargs.get("strata") is not None:
+                umap_kwargs_reuse["sample_kwargs"]["strata"] = pd.DataFrame({"strata": sample_kwargs["strata"]})
         logger.debug("process_umap after kwargs: %s", umap_kwargs_reuse)
 
-        old_res = reuse_umap(
-            res, memoize, {**umap_kwargs_reuse, "featurize_kwargs": featurize_kwargs or {}}
-        )
+        # hash the input frames once, for in-memory reuse and the stored model key
+        hashed = memoize_hash(umap_kwargs_reuse) if memoize else None
+        old_res = reuse_umap(res, memoize, umap_kwargs_reuse, hashed)
         if old_res:
             print(" --- [[ RE-USING UMAP ]]") if verbose else None
             logger.info(" --- [[ RE-USING UMAP ]]")
@@ -408,12 +513,37 @@ class UMAPMixin(MIXIN_BASE):
             fresh_res._umap_params = umap_kwargs_pure
             return fresh_res
 
+        store = configured_artifact_store() if memoize else None
+        key = fit_fingerprint("umap", hashed=hashed) if store is not None and hashed is not None else None
+        stored = store.get(key) if key is not None else None  # type: ignore
+        if stored is not None:
+            logger.info(" --- [[ RE-USING STORED UMAP ]]")
+            res = res.umap_lazy_init(res, verbose=verbose, **umap_kwargs_pure)
+            res._umap = stored["umap"]
+            res._xy = stored["xy"]
+            res._weighted_edges_df = stored["weighted_edges_df"]
+            res._weighted_adjacency = stored["weighted_adjacency"]
+            return res
+
         print('-' * 60) if verbose else None
         print('** Fitting UMAP') if verbose else None
         res = res.umap_lazy_init(res, verbose=verbose, **umap_kwargs_pure)
         
-        emb = res._umap_fit_transform(X_, y_, verbose=verbose)
+        if sample_kwargs is not None:
+            emb = res._umap_fit_transform_sampled(X_, y_, verbose=verbose, **sample_kwargs)
+        else:
+            emb = res._umap_fit_transform(X_, y_, verbose=verbose)
         res._xy = emb
+        if key is not None and res.engine == UMAP_LEARN:  # GPU models and frames stay in-process
+            try:
+                store.put(key, {  # type: ignore
+                    "umap": res._umap,
+                    "xy": emb,
+                    "weighted_edges_df": res._weighted_edges_df,
+                    "weighted_adjacency": res._weighted_adjacency,
+                })
+            except Exception as e:  # e.g. disk full or an unpicklable model: memoization is best-effort
+                logger.warning(f"Could not store fitted UMAP: {e}")
         return res
 
     def _set_features(  # noqa: E303
@@ -476,6 +606,10 @@ class UMAPMixin(MIXIN_BASE):
         feature_engine: str = "auto",
         inplace: bool = False,
         memoize: bool = True,
+        sample_size: Optional[int] = None,
+        sample_by: Optional[str] = None,
+        transform_batch_size: int = config.UMAP_TRANSFORM_ROWS,
+        n_jobs: int = -1,
         verbose: bool = False,
         **featurize_kwargs,
     ):
@@ -530,6 +664,15 @@ class UMAPMixin(MIXIN_BASE):
                     when False, returns a new object, useful for chaining in a functional paradigm.
             :memoize: whether to memoize the results of this method,
                     default True.
+            :sample_size: for large node or edge sets, fit UMAP on only this many sampled rows, then project
+                    the rest with UMAP transform and link each to its n_neighbors nearest sampled rows.
+                    Fit time then depends on sample_size instead of all rows, at the cost of projected rows
+                    not shaping the layout or linking to each other. Default None fits on all rows.
+                    Phase timings are logged at info level. Requires the umap_learn engine.
+            :sample_by: with sample_size, column of the nodes or edges whose values are sampled in proportion,
+                    keeping at least one row of each, default None for a uniform sample
+            :transform_batch_size: with sample_size, rows projected per UMAP transform batch
+            :n_jobs: with sample_size, threads projecting batches, -1 (default) for all cores
             :verbose: whether to print out extra information, default False.
 
         :return: self, with attributes set with new data
@@ -586,6 +729,17 @@ class UMAPMixin(MIXIN_BASE):
             res, X, y, kind, feature_engine, {**featurize_kwargs, "memoize": memoize}
         )
 
+        sample_kwargs = None
+        if sample_size is not None and res.engine != UMAP_LEARN:  # type: ignore
+            logger.warning(f"Ignoring sample_size for engine {res.engine}, fitting on all rows")  # type: ignore
+        elif sample_size is not None:
+            strata = None
+            if sample_by is not None:
+                strata = (res._nodes if kind == "nodes" else res._edges)[sample_by].to_numpy()
+            sample_kwargs = dict(
+                sample_size=sample_size, strata=strata, transform_batch_size=transform_batch_size, n_jobs=n_jobs
+            )
+
         if kind == "nodes":
             index = res._nodes.index
             if res._node is None:
@@ -621,7 +775,7 @@ class UMAPMixin(MIXIN_BASE):
             X_, y_ = make_safe_gpu_dataframes(X_, y_, res.engine)  # type: ignore
 
             res = res._process_umap(
-                res, X_, y_, kind, memoize, featurize_kwargs, verbose, **umap_kwargs
+                res, X_, y_, kind, memoize, featurize_kwargs, verbose, sample_kwargs=sample_kwargs, **umap_kwargs
             )
 
             res._weighted_adjacency_nodes = res._weighted_adjacency
@@ -651,7 +805,7 @@ class UMAPMixin(MIXIN_BASE):
             X_, y_ = make_safe_gpu_dataframes(X_, y_, res.engine)  # type: ignore
 
             res = res._process_umap(
-                res, X_, y_, kind, memoize, featurize_kwargs, **umap_kwargs
+                res, X_, y_, kind, memoize, featurize_kwargs, sample_kwargs=sample_kwargs, **umap_kwargs
             )
             res._weighted_adjacency_edges = res._weighted_adjacency
             if res._xy is None:
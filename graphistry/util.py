@@ -1,5 +1,6 @@
 import hashlib
 import logging
+import numpy as np
 import os
 import pandas as pd
 import pandas.util as putil
@@ -9,10 +10,12 @@ import string
 import uuid
 import warnings
 from functools import lru_cache
-from typing import Any
-from collections import UserDict
+from typing import Any, Optional
+from collections import OrderedDict, UserDict
 
-from .constants import VERBOSE, CACHE_COERCION_SIZE, TRACE
+from .constants import (
+    VERBOSE, CACHE_COERCION_SIZE, CACHE_COERCION_BYTES, CACHE_FINGERPRINT_ROWS, MEMOIZE_VERSION_ATTR, TRACE
+)
 
 
 # #####################################
@@ -77,6 +80,97 @@ def hash_pdf(df: pd.DataFrame) -> str:
     )
 
 
+def fingerprint_pdf(df: pd.DataFrame, sample_rows: int = CACHE_FINGERPRINT_ROWS) -> str:
+    """
+    Cheap content fingerprint: shape, column names and dtypes, and a hash of the first, last, and evenly strided rows
+
+    Equal frames always have equal fingerprints, but different frames can collide, so confirm with hash_pdf()
+    """
+    n = len(df)
+    block = min(n, sample_rows)
+    positions = np.unique(np.concatenate([
+        np.arange(block),
+        np.arange(n - block, n),
+        np.linspace(0, n - 1, block, dtype=np.int64) if n > 0 else np.arange(0)
+    ]))
+    sample = putil.hash_pandas_object(df.iloc[positions], index=False).to_numpy()
+    return hashlib.sha256(
+        sample.tobytes()
+        + str((df.shape, list(df.columns), [str(t) for t in df.dtypes])).encode("utf-8")  # noqa: W503
+    ).hexdigest()
+
+
+class TableFingerprint:
+    """
+    Lookup key for TieredTableCache, computed from cheapest to most expensive on demand
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.cheap = fingerprint_pdf(df)
+        self.version = df.attrs.get(MEMOIZE_VERSION_ATTR)
+        self._full: Optional[str] = None
+        self._df = df
+
+    def full(self) -> str:
+        """Version tag when provided, else full content hash"""
+        if self._full is None:
+            self._full = (
+                f"version:{self.version}" if self.version is not None
+                else hash_pdf(self._df)
+            )
+        return self._full
+
+
+class TieredTableCache:
+    """
+    Memoizes a value per dataframe content, checking from cheapest to most expensive:
+
+    1. fingerprint_pdf(): shape, dtypes, and sampled rows, so changed data usually misses without a full hash
+    2. full: the user version tag in df.attrs[MEMOIZE_VERSION_ATTR], else hash_pdf(), confirming every candidate hit
+
+    So hits on dataframes without a version tag still pay a full hash_pdf(); only misses are cheap
+
+    Holds strong references to values, evicting least-recently-used ones beyond max_bytes
+    """
+
+    def __init__(self, max_bytes: int = CACHE_COERCION_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        # cheap fingerprint -> (full hash or version tag, value, nbytes)
+        self._entries: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.nbytes = 0
+
+    def get(self, key: TableFingerprint) -> Any:
+        """Return memoized value, or None on a miss"""
+        entry = self._entries.get(key.cheap)
+        if entry is None:
+            return None
+        full, value, _ = entry
+        if full != key.full():
+            return None
+        self._entries.move_to_end(key.cheap)
+        return value
+
+    def set(self, key: TableFingerprint, value: Any, nbytes: int) -> None:
+        """Memoize value for the dataframe key was computed from, keyed by its content at this point"""
+        prev = self._entries.pop(key.cheap, None)
+        if prev is not None:
+            self.nbytes -= prev[2]
+        if nbytes > self.max_bytes:
+            return
+        self._entries[key.cheap] = (key.full(), value, nbytes)
+        self.nbytes += nbytes
+        while self.nbytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.nbytes -= evicted[2]
+
+
 def hash_memoize_helper(v: Any) -> str:
 
     if isinstance(v, dict):
@@ -121,13 +215,24 @@ def hash_memoize(v: Any) -> str:
     return hashlib.sha256(hash_memoize_helper(v).encode("utf-8")).hexdigest()
 
 
+def memoize_hash(metadata: Any) -> Optional[str]:
+    """hash_memoize() of memoization metadata, or None when it cannot be hashed"""
+    try:
+        return hash_memoize(dict(data=metadata))
+    except TypeError:
+        setup_logger(f"{__name__}.memoization").debug("Failed to hash memoization metadata", exc_info=True)
+        return None
+
+
 def check_set_memoize(
-    g, metadata, attribute, name: str = "", memoize: bool = True
+    g, metadata, attribute, name: str = "", memoize: bool = True, hashed: Optional[str] = None
 ):  # noqa: C901
     """
     Helper Memoize function that checks if metadata args have changed for object g -- which is unconstrained save
     for the fact that it must have `attribute`. If they have not changed, will return memoized version,
     if False, will continue with whatever pipeline it is in front.
+
+    Pass hashed, the memoize_hash() of metadata, when the caller already computed it, to avoid hashing twice.
     """
 
     logger = setup_logger(f"{__name__}.memoization")
@@ -136,14 +241,14 @@ def check_set_memoize(
         logger.debug("Memoization disabled")
         return False
 
-    hashed = None
     weakref = getattr(g, attribute)
-    try:
-        hashed = hash_memoize(dict(data=metadata))
-    except TypeError:
-        logger.warning(
-            f"! Failed {name} speedup attempt. Continuing without memoization speedups."
-        )
+    if hashed is None:
+        try:
+            hashed = hash_memoize(dict(data=metadata))
+        except TypeError:
+            logger.warning(
+                f"! Failed {name} speedup attempt. Continuing without memoization speedups."
+            )
     try:
         if hashed in weakref:
             logger.debug(f"{name} memoization hit: %s", hashed)
@@ -270,6 +375,14 @@ def error(msg):
     raise ValueError(msg)
 
 
+def factorize_keep_na(values, sort: bool = False):
+    """pd.factorize coding missing values as one more value instead of -1, on pandas before and after 1.5"""
+    try:
+        return pd.factorize(values, sort=sort, use_na_sentinel=False)
+    except TypeError:  # pandas < 1.5
+        return pd.factorize(values, sort=sort, na_sentinel=None)  # type: ignore
+
+
 def merge_two_dicts(a, b):
     c = a.copy()
     c.update(b)